@@ -0,0 +1,253 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Benchmarks of the VType checks hot paths, compared with hand-written baselines. Each benchmark group contains a
+`baseline` entry, so that the overhead of vtypes over plain code can be read directly in the 'Mean' ratio column.
+
+Run with `pytest benchmarks/ --benchmark-only` (requires `pytest-benchmark`). Use `--benchmark-autosave` and
+`--benchmark-compare` to detect regressions between two versions.
+"""
+from abc import ABCMeta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from valid8 import ValidationError  # noqa: E402
+
+from vtypes import vtype, ListOf, VType  # noqa: E402
+from vtypes.records import record  # noqa: E402
+from vtypes.validators import gt, lt, length_between, match_regex  # noqa: E402
+
+
+def _is_positive(x):
+    return x >= 0
+
+
+PositiveInt = vtype('PositiveInt', int, {'should be positive': _is_positive})
+
+
+def baseline_positive_int(x):
+    """The hand-written equivalent of `isinstance(x, PositiveInt)`"""
+    return isinstance(x, int) and x >= 0
+
+
+def baseline_validate_positive_int(name, x):
+    """The hand-written equivalent of `PositiveInt.validate(name, x)`"""
+    if not isinstance(x, int):
+        raise TypeError("%s should be an int" % name)
+    if not x >= 0:
+        raise ValueError("%s should be positive" % name)
+
+
+# --- deep composition: 5 levels, each with its own base type and validator
+Level0 = vtype('Level0', int, lambda x: x >= 0)
+Level1 = vtype('Level1', Level0, lambda x: x < 1000)
+Level2 = vtype('Level2', Level1, lambda x: x != 13)
+Level3 = vtype('Level3', Level2, lambda x: x % 2 == 0)
+Level4 = vtype('Level4', Level3, lambda x: x != 42)
+
+
+def baseline_level4(x):
+    return isinstance(x, int) and x >= 0 and x < 1000 and x != 13 and x % 2 == 0 and x != 42
+
+
+# --- many validators on the same VType
+ManyValidators = vtype('ManyValidators', int, [lambda x, i=i: x != i for i in range(-10, 0)])
+
+
+def baseline_many_validators(x):
+    return isinstance(x, int) and all(x != i for i in range(-10, 0))
+
+
+@pytest.mark.parametrize("value", [1, -1, '1'], ids="value={!r}".format)
+@pytest.mark.parametrize("impl", ['vtype', 'baseline'])
+def test_bench_isinstance(benchmark, impl, value):
+    benchmark.group = "isinstance(%r, PositiveInt)" % (value,)
+    if impl == 'vtype':
+        benchmark(isinstance, value, PositiveInt)
+    else:
+        benchmark(baseline_positive_int, value)
+
+
+@pytest.mark.parametrize("value", [1, -1], ids="value={!r}".format)
+@pytest.mark.parametrize("impl", ['vtype', 'baseline'])
+def test_bench_validate(benchmark, impl, value):
+    benchmark.group = "PositiveInt.validate('x', %r)" % (value,)
+    f = PositiveInt.validate if impl == 'vtype' else baseline_validate_positive_int
+
+    def validate():
+        try:
+            f('x', value)
+        except (ValidationError, TypeError, ValueError):
+            pass
+
+    benchmark(validate)
+
+
+@pytest.mark.parametrize("inherited", [True, False], ids="inherited={}".format)
+def test_bench_has_valid_value(benchmark, inherited):
+    benchmark.group = "has_valid_value / has_valid_type"
+    benchmark(Level4.has_valid_value, 2, inherited_validators=inherited)
+
+
+def test_bench_has_valid_type(benchmark):
+    benchmark.group = "has_valid_value / has_valid_type"
+    benchmark(Level4.has_valid_type, 2)
+
+
+@pytest.mark.parametrize("value", [2, 13], ids="value={!r}".format)
+@pytest.mark.parametrize("impl", ['vtype', 'baseline'])
+def test_bench_deep_inheritance(benchmark, impl, value):
+    benchmark.group = "5 levels of inheritance, value=%r" % (value,)
+    if impl == 'vtype':
+        benchmark(isinstance, value, Level4)
+    else:
+        benchmark(baseline_level4, value)
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'baseline'])
+def test_bench_many_validators(benchmark, impl):
+    benchmark.group = "10 validators"
+    if impl == 'vtype':
+        benchmark(isinstance, 1, ManyValidators)
+    else:
+        benchmark(baseline_many_validators, 1)
+
+
+# --- containers
+PositiveInts = ListOf(PositiveInt)
+PositiveIntsSampled = ListOf(PositiveInt, sample=100)
+LIST_1000 = list(range(1000))
+
+
+def baseline_positive_ints(x):
+    return isinstance(x, list) and all(isinstance(i, int) and i >= 0 for i in x)
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'vtype_sampled', 'baseline'])
+def test_bench_list_of(benchmark, impl):
+    benchmark.group = "list of 1000 PositiveInt"
+    if impl == 'vtype':
+        benchmark(isinstance, LIST_1000, PositiveInts)
+    elif impl == 'vtype_sampled':
+        benchmark(isinstance, LIST_1000, PositiveIntsSampled)
+    else:
+        benchmark(baseline_positive_ints, LIST_1000)
+
+
+# --- records
+Person = record('Person', {'name': str, 'age': PositiveInt, 'email': str}, optional=('email',))
+PERSON = {'name': 'alice', 'age': 12}
+
+
+def baseline_person(x):
+    try:
+        return (isinstance(x, dict) and isinstance(x['name'], str) and baseline_positive_int(x['age'])
+                and ('email' not in x or isinstance(x['email'], str)))
+    except KeyError:
+        return False
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'baseline'])
+def test_bench_record(benchmark, impl):
+    benchmark.group = "record with 3 fields"
+    if impl == 'vtype':
+        benchmark(isinstance, PERSON, Person)
+    else:
+        benchmark(baseline_person, PERSON)
+
+
+# --- adaptive reordering
+EMAIL_REGEX = r'^[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}$'
+ShortEmail = vtype('ShortEmail', str, [match_regex(EMAIL_REGEX), length_between(6, 20)])
+ShortEmailAdaptive = vtype('ShortEmailAdaptive', str, [match_regex(EMAIL_REGEX), length_between(6, 20)],
+                           adaptive=True)
+# most values are too long
+EMAILS = ['a.very.long.name.%s@some-company.example.com' % i for i in range(9)] + ['bob@a.io']
+
+
+def check_all(vt):
+    for v in EMAILS:
+        isinstance(v, vt)
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'vtype_adaptive'])
+def test_bench_adaptive(benchmark, impl):
+    benchmark.group = "regex then selective length check, 10 values"
+    if impl == 'vtype':
+        benchmark(check_all, ShortEmail)
+    else:
+        # end of the learning phase
+        for _ in range(200):
+            check_all(ShortEmailAdaptive)
+        assert '_adaptive_order' in ShortEmailAdaptive.__dict__
+        benchmark(check_all, ShortEmailAdaptive)
+
+
+# --- code generation
+Percentage = vtype('Percentage', int, [gt(0), lt(100), _is_positive])
+PercentageCodegen = vtype('PercentageCodegen', int, [gt(0), lt(100), _is_positive], codegen=True)
+
+
+def baseline_percentage(x):
+    return isinstance(x, int) and 0 <= x <= 100 and _is_positive(x)
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'vtype_codegen', 'baseline'])
+def test_bench_codegen(benchmark, impl):
+    benchmark.group = "2 declarative validators and a function"
+    if impl == 'vtype':
+        benchmark(isinstance, 42, Percentage)
+    elif impl == 'vtype_codegen':
+        benchmark(isinstance, 42, PercentageCodegen)
+    else:
+        benchmark(baseline_percentage, 42)
+
+
+# --- issubclass with many VTypes
+@pytest.fixture(scope='module')
+def many_vtypes():
+    """ 2000 VTypes, so that ABC subclass checks on VType have 2000 subclasses to visit """
+    return [vtype('Many%s' % i, int) for i in range(2000)]
+
+
+PLAIN_CLASSES = [type('Plain%s' % i, (object,), {}) for i in range(100)]
+
+
+# an ABC on which classes are registered: each registration invalidates the caches of all ABCs
+_Invalidator = ABCMeta('_Invalidator', (object,), {})
+
+
+def invalidate_abc_caches():
+    _Invalidator.register(type('Registered', (object,), {}))
+
+
+def subclass_checks(check):
+    for c in PLAIN_CLASSES:
+        check(VType, c)
+
+
+def abc_subclasscheck(cls, subclass):
+    return ABCMeta.__subclasscheck__(cls, subclass)
+
+
+def vtype_subclasscheck(cls, subclass):
+    return issubclass(subclass, cls)
+
+
+@pytest.mark.parametrize("impl", ['vtype', 'abc', 'abc_after_register'])
+def test_bench_issubclass(benchmark, many_vtypes, impl):
+    benchmark.group = "issubclass(cls, VType) for 100 classes, 2000 VTypes"
+    if impl == 'vtype':
+        benchmark(subclass_checks, vtype_subclasscheck)
+        return
+
+    # the ABC registry and caches of VType are only created when needed
+    VType._init_abc_data()
+    if impl == 'abc':
+        benchmark(subclass_checks, abc_subclasscheck)
+    else:
+        benchmark.pedantic(subclass_checks, args=(abc_subclasscheck,), setup=invalidate_abc_caches,
+                           rounds=20)
@@ -0,0 +1,65 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Benchmarks of the VType creation throughput, with the `vtype()` factory and with the class style.
+
+Run with `pytest benchmarks/ --benchmark-only` (requires `pytest-benchmark`).
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from vtypes import vtype, VType  # noqa: E402
+from vtypes.validators import gt  # noqa: E402
+
+
+NB_TYPES = 100
+
+
+def _positive(x):
+    return x >= 0
+
+
+def create_with_factory():
+    for i in range(NB_TYPES):
+        vtype('PositiveInt%s' % i, int, {'should be positive': _positive})
+
+
+def create_with_factory_explicit_module():
+    for i in range(NB_TYPES):
+        vtype('PositiveInt%s' % i, int, {'should be positive': _positive}, module=__name__)
+
+
+def create_with_class_style():
+    for _ in range(NB_TYPES):
+        class PositiveInt(VType):
+            __type__ = int
+            __validators__ = {'should be positive': _positive}
+
+
+def create_with_factory_declarative():
+    for i in range(NB_TYPES):
+        vtype('PositiveInt%s' % i, int, {'should be positive': gt(0)}, module=__name__)
+
+
+def create_with_factory_lazy():
+    for i in range(NB_TYPES):
+        vtype('PositiveInt%s' % i, int, {'should be positive': _positive}, module=__name__, lazy=True)
+
+
+def create_plain_class():
+    """Baseline: creation of plain python classes"""
+    for _ in range(NB_TYPES):
+        class PositiveInt(int):
+            pass
+
+
+@pytest.mark.parametrize("create", [create_with_factory, create_with_factory_explicit_module,
+                                    create_with_class_style, create_with_factory_declarative,
+                                    create_with_factory_lazy, create_plain_class],
+                         ids=lambda f: f.__name__)
+def test_bench_creation(benchmark, create):
+    """Creation of `NB_TYPES` VTypes"""
+    benchmark.group = "creation of %s types" % NB_TYPES
+    benchmark(create)
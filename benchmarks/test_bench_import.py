@@ -0,0 +1,41 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Measures the import time of vtypes with `python -X importtime`, and enforces a budget relative to the import time of
+valid8, measured in the same run: absolute timings depend too much on the machine and its load.
+"""
+import subprocess
+import sys
+from os.path import dirname
+
+import pytest
+
+ROOT_DIR = dirname(dirname(__file__))
+
+# the maximum cumulative import time of `vtypes`, as a fraction of the one of `valid8`
+IMPORT_TIME_BUDGET_RATIO = 0.5
+
+
+def get_import_time_us(module_name):
+    """Returns the cumulative import time of `module_name` in a fresh interpreter, in microseconds"""
+    out = subprocess.check_output([sys.executable, '-X', 'importtime', '-c', 'import %s' % module_name],
+                                  cwd=ROOT_DIR, stderr=subprocess.STDOUT)
+    for line in out.decode('utf-8').splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module_name:
+            return int(parts[1])
+    raise ValueError("import time of %r not found in output: %s" % (module_name, out))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="-X importtime requires python 3.7+")
+def test_import_time_budget():
+    # take the best of a few interleaved runs to reduce noise
+    vtypes_times, valid8_times = [], []
+    for _ in range(5):
+        vtypes_times.append(get_import_time_us('vtypes'))
+        valid8_times.append(get_import_time_us('valid8'))
+    import_time, baseline = min(vtypes_times), min(valid8_times)
+    print("import vtypes: %s us, import valid8: %s us (ratio %.2f)" % (import_time, baseline, import_time / baseline))
+    assert import_time < IMPORT_TIME_BUDGET_RATIO * baseline
@@ -0,0 +1,61 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Measures the memory used by each VType created with `vtype()`, with `tracemalloc`, and enforces a budget.
+
+Run with `pytest benchmarks/test_bench_memory.py -s` to see the report.
+"""
+import gc
+import sys
+
+import pytest
+
+from vtypes import vtype
+from vtypes.validators import gt, is_in
+
+NB_TYPES = 2000
+
+# the maximum memory used by a VType with a (shared) declarative validator, in bytes
+BYTES_PER_VTYPE_BUDGET = 4000
+
+
+def _positive(x):
+    return x >= 0
+
+
+DEFINITIONS = {
+    'no validators': lambda i: vtype('Int%s' % i, int, module=__name__),
+    'shared validators': lambda i: vtype('PositiveInt%s' % i, int, gt(0), module=__name__),
+    'shared validators with message': lambda i: vtype('Color%s' % i, str, {'should be a color': is_in({'r', 'g'})},
+                                                      module=__name__),
+    'distinct validators': lambda i: vtype('GreaterInt%s' % i, int, gt(i), module=__name__),
+    'lazy': lambda i: vtype('LazyInt%s' % i, int, gt(0), lazy=True, module=__name__),
+}
+
+
+def get_bytes_per_vtype(create):
+    """Returns the mean memory used by the VTypes created by `create(i)`, in bytes"""
+    import tracemalloc
+
+    # warm up: import valid8, create the shared objects...
+    warm_up = [create(i) for i in range(10)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        vtypes = [create(i) for i in range(NB_TYPES)]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del warm_up, vtypes
+    return (after - before) / float(NB_TYPES)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 4), reason="tracemalloc requires python 3.4+")
+def test_memory_per_vtype():
+    results = dict((name, get_bytes_per_vtype(create)) for name, create in DEFINITIONS.items())
+    for name, size in sorted(results.items(), key=lambda r: r[1]):
+        print("%-32s %6.0f bytes per VType" % (name, size))
+    assert results['shared validators'] < BYTES_PER_VTYPE_BUDGET
@@ -13,11 +13,11 @@ pkg_resources.require("setuptools_scm")
 from setuptools_scm import get_version  # noqa: E402
 
 # *************** Dependencies *********
-INSTALL_REQUIRES = ['six', 'valid8']
+INSTALL_REQUIRES = ['valid8']
 DEPENDENCY_LINKS = []
 SETUP_REQUIRES = ['pytest-runner', 'setuptools_scm']
-TESTS_REQUIRE = ['pytest>=4.4.0', 'pytest-logging']
-EXTRAS_REQUIRE = {}
+TESTS_REQUIRE = ['pytest>=4.4.0', 'pytest-logging', 'six']
+EXTRAS_REQUIRE = {'numpy': ['numpy']}
 
 # ************** ID card *****************
 DISTNAME = 'vtypes'
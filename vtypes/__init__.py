@@ -1,10 +1,51 @@
 #  Authors: Sylvain Marie <sylvain.marie@se.com>
 #
 #  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import sys
 
 from vtypes.core import vtype, is_vtype, VType
 
-__all__ = [
-    'core',
-    'vtype', 'is_vtype', 'VType'
+# the submodules, and the module providing each of the other exported names
+_SUBMODULES = ('core', 'adaptive', 'batch', 'cache', 'codegen', 'containers', 'decorators', 'instrumentation', 'modes',
+               'parallel', 'profiling', 'records', 'registry', 'validators')
+_LAZY_NAMES = {
+    'vectorizable': 'batch',
+    'reorderable': 'adaptive',
+    'LRU': 'cache',
+    'ListOf': 'containers', 'DictOf': 'containers', 'TupleOf': 'containers',
+    'VTypeRegistry': 'registry',
+    'validate_arguments': 'decorators',
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """
+        Imports the submodules and the names they provide on first access, so that `import vtypes` only imports
+        `vtypes.core` (python 3.7+).
+        """
+        if name in _SUBMODULES:
+            module_name, attr = name, None
+        else:
+            try:
+                module_name, attr = _LAZY_NAMES[name], name
+            except KeyError:
+                raise AttributeError("module %r has no attribute %r" % (__name__, name))
+        module = __import__('vtypes.%s' % module_name, fromlist=['_'])
+        value = module if attr is None else getattr(module, attr)
+        globals()[name] = value
+        return value
+else:
+    from vtypes.batch import vectorizable
+    from vtypes.adaptive import reorderable
+    from vtypes.cache import LRU
+    from vtypes.containers import ListOf, DictOf, TupleOf
+    from vtypes.registry import VTypeRegistry
+    from vtypes.decorators import validate_arguments
+
+__all__ = list(_SUBMODULES) + [
+    'vtype', 'is_vtype', 'VType',
+    'vectorizable', 'reorderable', 'LRU',
+    'ListOf', 'DictOf', 'TupleOf',
+    'VTypeRegistry',
+    'validate_arguments'
 ]
@@ -0,0 +1,114 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Asynchronous validation, with async validators (`__async_validators__`). This module requires python 3.5+, it is only
+imported by `VTypeMeta.avalidate` and `VTypeMeta.avalidate_many`.
+
+The synchronous checks are always performed first, with the compiled checker: async validators are only awaited for
+values that are valid according to the synchronous checks.
+"""
+import asyncio
+
+from valid8 import assert_valid
+from valid8.base import NP_TRUE
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Optional, Tuple, Type
+    from vtypes.core import VType
+    AsyncFailure = Tuple[Callable, Optional[str], Any, Optional[Exception]]
+
+
+async def _run_async_validators(vt,    # type: Type[VType]
+                                value  # type: Any
+                                ):
+    # type: (...) -> Optional[AsyncFailure]
+    """
+    Runs the async validators of `vt` on `value`, in order, and stops at the first failure. Returns `None` if they
+    all succeed, or a tuple `(async_callable, help_msg, outcome, exception)` describing the failure. Same conventions
+    as valid8: the outcome should be `None` or `True`, any other outcome or any exception is a failure.
+    """
+    for f, help_msg in vt._flat_async_validators:
+        try:
+            res = await f(value)
+        except Exception as e:
+            return f, help_msg, None, e
+        if not ((res is None) or (res is True) or (res is NP_TRUE)):
+            return f, help_msg, res, None
+    return None
+
+
+def _raise_async_failure(vt,      # type: Type[VType]
+                         name,    # type: str
+                         value,   # type: Any
+                         failure  # type: AsyncFailure
+                         ):
+    """ Raises a `ValidationError` for an async validator failure, created by valid8 from its recorded outcome. """
+    f, help_msg, res, exc = failure
+
+    def replay(x):
+        if exc is not None:
+            raise exc
+        return res
+
+    replay.__name__ = getattr(f, '__name__', 'async_validator')
+    assert_valid(name, value, replay if help_msg is None else (replay, help_msg),
+                 help_msg=vt.__help_msg__, error_type=vt.__error_type__)
+
+
+async def avalidate(vt,     # type: Type[VType]
+                    name,   # type: str
+                    value   # type: Any
+                    ):
+    """
+    Implementation of `VTypeMeta.avalidate`.
+    """
+    vt.validate(name, value)
+    if len(vt._flat_async_validators) > 0:
+        failure = await _run_async_validators(vt, value)
+        if failure is not None:
+            _raise_async_failure(vt, name, value, failure)
+
+
+async def avalidate_many(vt,              # type: Type[VType]
+                         name,            # type: str
+                         values,          # type: Iterable[Any]
+                         concurrency=10   # type: int
+                         ):
+    """
+    Implementation of `VTypeMeta.avalidate_many`. `concurrency` workers pull elements from a shared iterator, so that
+    memory usage does not depend on the number of elements. Once a failure is found no new element is pulled, and
+    since elements are pulled in order, the failure with the lowest index is the first invalid element.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency should be a strictly positive integer, found %r" % (concurrency,))
+
+    # make sure that the compiled checker is available (lazy VTypes)
+    vt._build_vtype()
+    check = vt._instance_checker
+    has_async = len(vt._flat_async_validators) > 0
+    items = enumerate(values)
+    failures = []
+
+    async def worker():
+        while len(failures) == 0:
+            try:
+                i, v = next(items)
+            except StopIteration:
+                return
+            if not check(v):
+                failures.append((i, v, None))
+            elif has_async:
+                failure = await _run_async_validators(vt, v)
+                if failure is not None:
+                    failures.append((i, v, failure))
+
+    await asyncio.gather(*[worker() for _ in range(concurrency if has_async else 1)])
+
+    if len(failures) > 0:
+        i, v, failure = min(failures, key=lambda f: f[0])
+        if failure is None:
+            vt.validate('%s[%s]' % (name, i), v)
+        else:
+            _raise_async_failure(vt, '%s[%s]' % (name, i), v, failure)
@@ -0,0 +1,171 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Adaptive reordering of validators. In VTypes with `__adaptive__ = True` (or created with `vtype(..., adaptive=True)`),
+the compiled boolean checker first runs in a learning mode during `LEARNING_CALLS` checks, measuring the cost and
+rejection rate of each validation function. It is then recompiled with the reorderable validation functions sorted so
+as to minimize the expected cost of a check: cheap and selective validators first.
+
+Only validation functions flagged as reorderable are moved: declarative validators (`vtypes.validators`) and functions
+marked with `reorderable`. Other validation functions stay at their position and are never called more often than in
+declaration order, so validators with side effects or that rely on a previous validator keep working. Since any
+exception in a validation function is a failure, reordering never changes the result of a check.
+
+`validate` always reports errors in declaration order.
+"""
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Sequence, Tuple, Type
+    from vtypes.core import VTypeMeta
+
+# the number of checks (of values with valid types) observed before reordering the validation functions
+LEARNING_CALLS = 1000
+
+
+class _ReorderableFunc(object):
+    """
+    Same as `vtypes.batch._VectorizableFunc`, for the `reorderable` attribute.
+    """
+    __slots__ = 'validation_func',
+
+    reorderable = True
+
+    def __init__(self, validation_func):
+        self.validation_func = validation_func
+
+    def __call__(self, x):
+        return self.validation_func(x)
+
+    def __repr__(self):
+        return repr(self.validation_func)
+
+    @property
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        return getattr(self.validation_func, '__name__', repr(self.validation_func))
+
+
+def reorderable(validation_func  # type: Callable
+                ):
+    # type: (...) -> Callable
+    """
+    Marks a validation function as reorderable: it has no side effects, so adaptive VTypes may call it before the
+    validation functions declared before it, or call it even when they fail.
+
+    ```python
+    Username = vtype('Username', str, [reorderable(is_not_reserved), length_between(3, 20)], adaptive=True)
+    ```
+
+    :param validation_func: the validation function
+    :return: the validation function, or a thin wrapper around it if it does not accept new attributes
+    """
+    try:
+        validation_func.reorderable = True
+    except (AttributeError, TypeError):
+        return _ReorderableFunc(validation_func)
+    else:
+        return validation_func
+
+
+def is_reorderable(f  # type: Callable
+                   ):
+    # type: (...) -> bool
+    """ Returns True if raw validation function `f` was flagged as reorderable """
+    return getattr(f, 'reorderable', False) is True
+
+
+def optimal_order(funcs,       # type: Sequence[Callable]
+                  costs,       # type: Sequence[float]
+                  rejections,  # type: Sequence[int]
+                  calls        # type: Sequence[int]
+                  ):
+    # type: (...) -> Tuple[Callable, ...]
+    """
+    Returns `funcs` reordered to minimize the expected cost of a check. Each run of consecutive reorderable functions
+    is sorted by increasing ratio between mean cost and rejection rate, which is the optimal order for independent
+    checks. Non-reorderable functions stay at their position, and functions that were never observed stay at the end
+    of their run.
+
+    :param funcs: the validation functions, in declaration order
+    :param costs: the cumulative time spent in each function
+    :param rejections: the number of rejections of each function
+    :param calls: the number of calls to each function
+    :return:
+    """
+    def rank(i):
+        if calls[i] == 0:
+            return 2, 0.
+        elif rejections[i] == 0:
+            # never rejects: after all selective validators, the cheapest first
+            return 1, costs[i] / calls[i]
+        return 0, costs[i] / rejections[i]
+
+    res = []
+    run = []
+    for i, f in enumerate(funcs):
+        if is_reorderable(f):
+            run.append(i)
+        else:
+            res.extend(sorted(run, key=rank))
+            run = []
+            res.append(i)
+    res.extend(sorted(run, key=rank))
+    return tuple(funcs[i] for i in res)
+
+
+def make_learning_checker(vt,     # type: VTypeMeta
+                          types,  # type: Tuple[Type, ...]
+                          funcs   # type: Tuple[Callable, ...]
+                          ):
+    # type: (...) -> Callable[[Any], bool]
+    """
+    Returns the instance checker of adaptive VType `vt` during its learning phase. After a failure, the reorderable
+    functions are still called so that their rejection rate is not biased, but the non-reorderable ones are not.
+    After `LEARNING_CALLS` observed checks, the order of the validation functions is stored in `vt._adaptive_order`
+    and the checkers of `vt` are recompiled.
+
+    :param vt:
+    :param types: the base types
+    :param funcs: the raw validation functions, in declaration order
+    :return:
+    """
+    from timeit import default_timer
+    from valid8.base import NP_TRUE
+
+    timer = default_timer
+    n = len(funcs)
+    items = tuple((i, f, is_reorderable(f)) for i, f in enumerate(funcs))
+    costs = [0.] * n
+    rejections = [0] * n
+    calls = [0] * n
+    state = [0, False]  # number of observed checks, done
+
+    def learning_check(obj):
+        for t in types:
+            if not isinstance(obj, t):
+                return False
+
+        ok = True
+        for i, f, can_reorder in items:
+            if not (ok or can_reorder):
+                continue
+            start = timer()
+            try:
+                res = f(obj)
+                valid = (res is None) or (res is True) or (res is NP_TRUE)
+            except Exception:
+                valid = False
+            costs[i] += timer() - start
+            calls[i] += 1
+            if not valid:
+                rejections[i] += 1
+                ok = False
+
+        state[0] += 1
+        if state[0] >= LEARNING_CALLS and not state[1]:
+            state[1] = True
+            vt._adapt(funcs, optimal_order(funcs, costs, rejections, calls))
+        return ok
+
+    return learning_check
@@ -0,0 +1,286 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import sys
+from collections import namedtuple
+
+# Note: numpy is never imported here. If it has not been imported by the application, no numpy array can be received.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator, List, Optional, Type, Union
+    import numpy as np
+
+try:  # python 2
+    text_type = unicode
+except NameError:
+    text_type = str
+
+try:  # python 2
+    from itertools import ifilter as _filter
+except ImportError:
+    _filter = filter
+
+
+class _VectorizableFunc(object):
+    """
+    A wrapper for validation callables on which the `check_array` attribute can not be set (builtins, callable
+    objects with slots...).
+    """
+    __slots__ = 'validation_func', 'check_array'
+
+    def __init__(self, validation_func, check_array):
+        self.validation_func = validation_func
+        self.check_array = check_array
+
+    def __call__(self, x):
+        return self.validation_func(x)
+
+    def __repr__(self):
+        return repr(self.validation_func)
+
+
+def vectorizable(validation_func,  # type: Callable
+                 check_array=None  # type: Callable
+                 ):
+    # type: (...) -> Callable
+    """
+    Marks a validation function as vectorizable, so that batch checks (`is_valid_many`, `validate_many`) on NumPy
+    arrays can evaluate it on the whole array at once.
+
+    `check_array` should be a function receiving a NumPy array and returning a boolean array of the same shape. When
+    it is not provided, `validation_func` is assumed to work element-wise on arrays (for example `lambda x: x >= 0`).
+
+    ```python
+    PositiveInt = vtype('PositiveInt', int, vectorizable(lambda x: x >= 0))
+    ```
+
+    :param validation_func: the validation function, following the valid8 conventions for scalar values.
+    :param check_array: an optional function to use on arrays. By default `validation_func` is used.
+    :return: the validation function, or a thin wrapper around it if it does not accept new attributes
+    """
+    if check_array is None:
+        check_array = validation_func
+    try:
+        validation_func.check_array = check_array
+    except (AttributeError, TypeError):
+        return _VectorizableFunc(validation_func, check_array)
+    else:
+        return validation_func
+
+
+def _get_array_checker(f  # type: Callable
+                       ):
+    # type: (...) -> Optional[Callable]
+    """
+    Returns the function to use to validate a whole array with `f`, or `None` if `f` is not vectorizable.
+    NumPy ufuncs (for example `np.isfinite`) are considered vectorizable.
+    """
+    try:
+        return f.check_array
+    except AttributeError:
+        np = sys.modules.get('numpy')
+        if np is not None and isinstance(f, np.ufunc):
+            return f
+        return None
+
+
+# the python type of the scalars in numpy arrays, by dtype kind
+_PY_TYPES_BY_KIND = {'b': bool, 'i': int, 'u': int, 'f': float, 'c': complex, 'U': text_type}
+
+
+def _array_matches_types(arr,   # type: np.ndarray
+                         types  # type: List[Type]
+                         ):
+    # type: (...) -> bool
+    """ Returns True if all python scalars from `arr` are guaranteed to be instances of all `types`. """
+    try:
+        py_type = _PY_TYPES_BY_KIND[arr.dtype.kind]
+    except KeyError:
+        return False
+    return all(issubclass(py_type, t) for t in types)
+
+
+def _is_valid_array(vt,  # type: Type
+                    arr  # type: np.ndarray
+                    ):
+    # type: (...) -> np.ndarray
+    """
+    Implementation of `is_valid_many` for numpy arrays. If the array dtype matches the VType base types, the
+    vectorizable validation functions are evaluated on the whole array, and the others are only evaluated on the
+    elements that are still valid. Otherwise, or if the VType is not in `'full'` check mode (see `vtypes.modes`), each
+    element is checked separately with the instance checker of the VType.
+    """
+    import numpy as np
+    from valid8.base import NP_TRUE
+
+    vt._build_vtype()
+    types, funcs = vt._flat_types, vt._flat_funcs
+    mode = vt._check_mode
+    if (mode is not None and mode.mode != 'full') or not _array_matches_types(arr, types):
+        check = vt._instance_checker
+        if arr.dtype.kind == 'O':
+            values = arr.ravel()
+        else:
+            # convert to python scalars, since this is what isinstance and the validators expect
+            values = arr.ravel().tolist()
+        return np.fromiter((check(v) for v in values), dtype=bool, count=arr.size).reshape(arr.shape)
+
+    mask = np.ones(arr.shape, dtype=bool)
+    remaining = []
+    for f in funcs:
+        check_array = _get_array_checker(f)
+        if check_array is not None:
+            try:
+                res = np.asarray(check_array(arr))
+            except Exception:
+                res = None
+            if res is not None and res.dtype == bool and res.shape == arr.shape:
+                mask &= res
+                continue
+        remaining.append(f)
+
+    if len(remaining) > 0:
+        # scalar evaluation of the non-vectorizable validation functions, on valid elements only
+        flat_mask = mask.ravel()
+        flat_arr = arr.ravel()
+        for i in np.flatnonzero(flat_mask):
+            x = flat_arr.item(i)
+            try:
+                for f in remaining:
+                    res = f(x)
+                    if not ((res is None) or (res is True) or (res is NP_TRUE)):
+                        flat_mask[i] = False
+                        break
+            except Exception:
+                flat_mask[i] = False
+        mask = flat_mask.reshape(arr.shape)
+
+    return mask
+
+
+def is_valid_many(vt,     # type: Type
+                  values  # type: Union[Iterable[Any], np.ndarray]
+                  ):
+    # type: (...) -> Union[List[bool], np.ndarray]
+    """
+    Implementation of `VTypeMeta.is_valid_many`.
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(values, np.ndarray):
+        return _is_valid_array(vt, values)
+    else:
+        check = vt._instance_checker
+        return [check(v) for v in values]
+
+
+def validate_many(vt,     # type: Type
+                  name,   # type: str
+                  values  # type: Union[Iterable[Any], np.ndarray]
+                  ):
+    """
+    Implementation of `VTypeMeta.validate_many`.
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(values, np.ndarray):
+        mask = _is_valid_array(vt, values).ravel()
+        if not mask.all():
+            # the vectorized checks may reject elements that the scalar path accepts: try all rejected elements
+            flat_values = values.ravel()
+            invalid = np.flatnonzero(~mask)
+            for i in invalid:
+                vt.validate('%s[%s]' % (name, i), flat_values.item(i))
+            raise ValueError("%s: the vectorized checks of %s rejected the elements at indices %s of the flattened "
+                             "array, but they are valid when checked one by one. Please check the `check_array` "
+                             "functions of its vectorizable validators." % (name, vt.__name__, invalid.tolist()))
+    else:
+        check = vt._instance_checker
+        for i, v in enumerate(values):
+            if not check(v):
+                vt.validate('%s[%s]' % (name, i), v)
+
+
+InvalidItem = namedtuple('InvalidItem', ('index', 'value_repr', 'validator'))
+InvalidItem.__doc__ = """
+A compact record of an invalid item in a stream: its index, a (truncated) repr of its value, and a description of the
+first failing check (`'isinstance(x, <type>)'` or the name of the failing validation function).
+"""
+
+# the maximum length of `InvalidItem.value_repr`
+MAX_VALUE_REPR = 100
+
+
+def _describe_invalid(vt,    # type: Type
+                      index,  # type: int
+                      value   # type: Any
+                      ):
+    # type: (...) -> InvalidItem
+    """ Returns an `InvalidItem` for `value`, by looking for the first failing check. No exception is created. """
+    value_repr = repr(value)
+    if len(value_repr) > MAX_VALUE_REPR:
+        value_repr = value_repr[:MAX_VALUE_REPR - 3] + '...'
+
+    for t in vt._flat_types:
+        if not isinstance(value, t):
+            return InvalidItem(index, value_repr, 'isinstance(x, %s)' % t.__name__)
+
+    from valid8.base import NP_TRUE
+    for f in vt._flat_funcs:
+        try:
+            res = f(value)
+        except Exception:
+            pass
+        else:
+            if (res is None) or (res is True) or (res is NP_TRUE):
+                continue
+        return InvalidItem(index, value_repr, getattr(f, '__name__', repr(f)))
+
+    # this should not happen, except with validation functions having side effects
+    return InvalidItem(index, value_repr, None)
+
+
+_ON_ERROR_OPTIONS = ('raise', 'skip', 'collect')
+
+
+def iter_validated(vt,               # type: Type
+                   values,           # type: Iterable[Any]
+                   on_error='raise',  # type: str
+                   errors=None,      # type: Any
+                   name='values'     # type: str
+                   ):
+    # type: (...) -> Iterator[Any]
+    """
+    Implementation of `VTypeMeta.iter_validated`.
+    """
+    if on_error not in _ON_ERROR_OPTIONS:
+        raise ValueError("on_error should be one of %s, found %r" % (_ON_ERROR_OPTIONS, on_error))
+    if on_error == 'collect' and errors is None:
+        raise ValueError("an `errors` list (or a `collections.deque(maxlen=...)`) should be provided when "
+                         "on_error='collect'")
+
+    # make sure that the compiled checker is available (lazy VTypes)
+    vt._build_vtype()
+    check = vt._instance_checker
+
+    if on_error == 'skip':
+        return _filter(check, values)
+    elif on_error == 'raise':
+        return _iter_validated_raise(vt, check, values, name)
+    else:
+        return _iter_validated_collect(vt, check, values, errors)
+
+
+def _iter_validated_raise(vt, check, values, name):
+    for i, v in enumerate(values):
+        if check(v):
+            yield v
+        else:
+            vt.validate('%s[%s]' % (name, i), v)
+
+
+def _iter_validated_collect(vt, check, values, errors):
+    append = errors.append
+    for i, v in enumerate(values):
+        if check(v):
+            yield v
+        else:
+            append(_describe_invalid(vt, i, v))
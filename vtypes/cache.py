@@ -0,0 +1,114 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+from collections import OrderedDict, namedtuple
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+class LRU(object):
+    """
+    A bounded memoizing cache for VType checks, with least-recently-used eviction. It can be set on a VType using
+    `vtype(..., cache=LRU())` or the `__cache__` class attribute:
+
+    ```python
+    CountryCode = vtype('CountryCode', str, is_in(COUNTRY_CODES), cache=LRU(maxsize=1024))
+    ```
+
+    Check results are stored for hashable values only, with keys `(type(value), value)` so that for example `1` and
+    `True` are not mixed up. Unhashable values are always checked.
+
+    The cache is automatically cleared when `init_vtype()` is called on the VType. It can be shared between several
+    VTypes: entries are separated per VType.
+    """
+    __slots__ = 'maxsize', 'hits', 'misses', '_store'
+
+    def __init__(self,
+                 maxsize=128  # type: Optional[int]
+                 ):
+        """
+        :param maxsize: the maximum number of entries in the cache. `None` means no limit.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._store = OrderedDict()
+
+    def __repr__(self):
+        return 'LRU(maxsize=%r)' % (self.maxsize,)
+
+    def __reduce__(self):
+        # the entries and counters are not pickled
+        return LRU, (self.maxsize,)
+
+    def __len__(self):
+        return len(self._store)
+
+    def cache_info(self):
+        # type: (...) -> CacheInfo
+        """ Returns the hits and misses counters, the maximum and the current size of the cache. """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._store))
+
+    def clear(self):
+        """ Removes all entries from the cache and resets the counters. """
+        self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(self,
+             check  # type: Callable[[Any], bool]
+             ):
+        # type: (...) -> Callable[[Any], bool]
+        """
+        Returns a memoized version of boolean checker `check`.
+
+        :param check: a function `f(obj) -> bool`, that should not raise any exception.
+        :return:
+        """
+        store = self._store
+        maxsize = self.maxsize
+
+        if maxsize is None:
+            def cached_check(obj):
+                try:
+                    res = store[(check, type(obj), obj)]
+                except KeyError:
+                    self.misses += 1
+                    res = store[(check, type(obj), obj)] = check(obj)
+                    return res
+                except TypeError:
+                    # unhashable
+                    return check(obj)
+                else:
+                    self.hits += 1
+                    return res
+        else:
+            def cached_check(obj):
+                key = (check, type(obj), obj)
+                try:
+                    res = store.pop(key)
+                except KeyError:
+                    self.misses += 1
+                    res = store[key] = check(obj)
+                    while len(store) > maxsize:
+                        try:
+                            store.popitem(last=False)
+                        except KeyError:
+                            # emptied concurrently
+                            break
+                    return res
+                except TypeError:
+                    # unhashable
+                    return check(obj)
+                else:
+                    # move to the most recently used position
+                    self.hits += 1
+                    store[key] = res
+                    return res
+
+        return cached_check
@@ -0,0 +1,144 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Code generation backend. In VTypes with `__codegen__ = True` (or created with `vtype(..., codegen=True)`), the boolean
+checkers are straight-line python functions generated from the definition, instead of generic closures: the
+`isinstance` tests against the base types are inlined, as well as the comparisons of declarative validators
+(`vtypes.validators`). Other validation callables are called directly.
+
+The generated source can be inspected with `get_source(MyVType)`, and is registered in `linecache` so that tracebacks
+and `inspect.getsource` show it.
+
+The compiled code objects are cached in memory, keyed by a hash of the generated source, so that VTypes with the same
+definition (for example in a `VTypeRegistry`) are only compiled once per process.
+"""
+import linecache
+import re
+from hashlib import sha1
+from math import isinf
+
+from vtypes.validators import DeclarativeValidator
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+    from vtypes.core import VType
+
+# the code objects compiled in this process, by key
+_code_cache = dict()  # type: Dict[str, Any]
+
+# the types of constants that are inlined as literals. Note: bool is a subclass of int but has its own repr.
+try:  # python 2
+    _LITERAL_TYPES = (bool, int, long, str, unicode, type(None))  # noqa
+except NameError:
+    _LITERAL_TYPES = (bool, int, str, type(None))
+
+
+def get_source(vt  # type: Type[VType]
+               ):
+    # type: (...) -> Optional[str]
+    """
+    Returns the generated source of the instance checker of VType `vt`, or `None` if `vt` does not use code generation.
+
+    :param vt:
+    :return:
+    """
+    vt._build_vtype()
+    return vt.__dict__.get('_codegen_source', None)
+
+
+def generate_source(name,   # type: str
+                    types,  # type: Tuple[Type, ...]
+                    funcs   # type: Tuple[Callable, ...]
+                    ):
+    # type: (...) -> Tuple[str, List[Any]]
+    """
+    Generates the source of a factory function `_make(...)` returning the boolean checker for `types` and `funcs`.
+    The objects that are not inlined as literals are the arguments of the factory, so that the checker accesses
+    them as fast closure variables.
+
+    :param name: the name of the VType, used to name the generated function
+    :param types: the base types
+    :param funcs: the raw validation functions
+    :return: a tuple (source, factory arguments). The first factory argument is always NP_TRUE.
+    """
+    from valid8.base import NP_TRUE
+
+    arg_names = ['_NP_TRUE']
+    args = [NP_TRUE]
+
+    def const(obj, prefix='_c'):
+        """ Returns the source for constant `obj`: a literal if possible, otherwise a new factory argument """
+        if type(obj) in _LITERAL_TYPES or (type(obj) is float and not (isinf(obj) or obj != obj)):
+            return repr(obj)
+        for arg_name, arg in zip(arg_names, args):
+            if arg is obj:
+                return arg_name
+        arg_name = '%s%d' % (prefix, len(args))
+        arg_names.append(arg_name)
+        args.append(obj)
+        return arg_name
+
+    body = []
+    for t in types:
+        body += ['if not isinstance(obj, %s):' % const(t, '_t'),
+                 '    return False']
+    if len(funcs) > 0:
+        body.append('try:')
+        for f in funcs:
+            expr = f._source('obj', const) if isinstance(f, DeclarativeValidator) else None
+            if expr is None:
+                expr = '%s(obj)' % const(f, '_f')
+            body += ['    _r = %s' % expr,
+                     '    if not (_r is True or _r is None or _r is _NP_TRUE):',
+                     '        return False']
+        body += ['except Exception:',
+                 '    return False']
+    body.append('return True')
+
+    func_name = 'check_%s' % re.sub(r'\W', '_', name)
+    lines = ['def _make(%s):' % ', '.join(arg_names),
+             '    def %s(obj):' % func_name]
+    lines += ['        ' + l for l in body]
+    lines += ['    return %s' % func_name, '']
+    return '\n'.join(lines), args
+
+
+def _get_code(key,       # type: str
+              source,    # type: str
+              filename   # type: str
+              ):
+    """ Returns the code object for `source`, from the memory cache or by compiling it """
+    try:
+        return _code_cache[key]
+    except KeyError:
+        code = _code_cache[key] = compile(source, filename, 'exec')
+        return code
+
+
+def compile_checker(name,   # type: str
+                    types,  # type: Tuple[Type, ...]
+                    funcs   # type: Tuple[Callable, ...]
+                    ):
+    # type: (...) -> Tuple[Callable[[Any], bool], str]
+    """
+    Generates and compiles the boolean checker for `types` and `funcs`. It has the same behaviour as
+    `vtypes.vtype_validator.make_instance_checker`.
+
+    :param name: the name of the VType
+    :param types: the base types
+    :param funcs: the raw validation functions
+    :return: a tuple (checker, source)
+    """
+    source, args = generate_source(name, types, funcs)
+    key = sha1(source.encode('utf-8')).hexdigest()
+    filename = '<vtypes-codegen-%s>' % key[:12]
+    code = _get_code(key, source, filename)
+
+    # make the source available to tracebacks and inspect.getsource
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    namespace = dict()
+    exec(code, namespace)
+    return namespace['_make'](*args), source
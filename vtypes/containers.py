@@ -0,0 +1,267 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Parametric container VTypes. `ListOf(PositiveInt)`, `DictOf(str, PositiveInt)` and `TupleOf(str, PositiveInt)` are
+VTypes that validate all their elements in a single loop, reusing the compiled checkers of the element VTypes, and
+stopping at the first invalid element.
+
+```python
+PositiveInts = ListOf(PositiveInt)
+assert isinstance([1, 2], PositiveInts)
+assert not isinstance([1, -2], PositiveInts)
+```
+"""
+from abc import ABCMeta, abstractproperty
+from itertools import islice, repeat
+
+from vtypes.core import VTypeMeta, vtype, _with_metaclass
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Optional, Tuple, Type, Union
+    from vtypes.core import VType
+
+
+def _type_name(t):
+    return t.__name__ if isinstance(t, type) else repr(t)
+
+
+def _make_item_check(item_type  # type: Type
+                     ):
+    # type: (...) -> Callable[[Any], bool]
+    """ Returns a boolean checker for a single item. """
+    if isinstance(item_type, VTypeMeta):
+        def item_check(x):
+            # looked up at each call, see `VTypeMeta.init_vtype`
+            return item_type._instance_checker(x)
+    elif item_type is object:
+        def item_check(x):
+            return True
+    else:
+        def item_check(x):
+            return isinstance(x, item_type)
+    return item_check
+
+
+def _make_items_check(item_type  # type: Type
+                      ):
+    # type: (...) -> Callable[[Iterable], bool]
+    """ Returns a boolean checker for all items of an iterable, stopping at the first invalid one. """
+    if isinstance(item_type, VTypeMeta):
+        def items_check(items):
+            # looked up at each call, see `VTypeMeta.init_vtype`
+            return all(map(item_type._instance_checker, items))
+    elif item_type is object:
+        def items_check(items):
+            return True
+    else:
+        def items_check(items):
+            return all(map(isinstance, items, repeat(item_type)))
+    return items_check
+
+
+def _sampled(seq,    # type: Union[list, tuple]
+             sample  # type: int
+             ):
+    # type: (...) -> Union[list, tuple]
+    """ Returns at most `sample` elements of sequence `seq`, evenly spread. """
+    n = len(seq)
+    if n <= sample:
+        return seq
+    # ceil(n / sample)
+    return seq[::-(-n // sample)]
+
+
+def _check_sample(sample  # type: Optional[int]
+                  ):
+    if sample is not None and sample < 1:
+        raise ValueError("sample should be a strictly positive integer or None, found %r" % (sample,))
+
+
+class ContainerValidator(_with_metaclass(ABCMeta, object)):
+    """
+    Base class of the validation callables of container VTypes. Their boolean check is compiled once, and used
+    directly by the compiled checkers of the VType (see `vtypes.vtype_validator`). They are entirely defined by their
+    `args`, so they can be pickled, and container VTypes can be pickled by definition (and sent to worker processes).
+    """
+    __slots__ = '__vtypes_raw_check__',
+
+    @abstractproperty
+    def args(self):
+        """ The arguments defining this validator """
+
+    def __call__(self, x):
+        return self.__vtypes_raw_check__(x)
+
+    def __reduce__(self):
+        # the compiled check is not picklable, it is recreated
+        return type(self), self.args
+
+    def __repr__(self):
+        return '%s%r' % (type(self).__name__, self.args)
+
+
+class ItemsValidator(ContainerValidator):
+    """ Checks that all items of a list or tuple are instances of `item_type`. See `ListOf` and `TupleOf`. """
+    __slots__ = 'item_type', 'sample'
+
+    def __init__(self,
+                 item_type,   # type: Type
+                 sample=None  # type: Optional[int]
+                 ):
+        self.item_type = item_type
+        self.sample = sample
+
+        items_check = _make_items_check(item_type)
+        if sample is None:
+            self.__vtypes_raw_check__ = items_check
+        else:
+            def all_items_valid(x):
+                return items_check(_sampled(x, sample))
+            self.__vtypes_raw_check__ = all_items_valid
+
+    @property
+    def args(self):
+        return self.item_type, self.sample
+
+    @property
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        return 'all_items_are_%s' % _type_name(self.item_type)
+
+
+class EntriesValidator(ContainerValidator):
+    """ Checks that all keys and values of a dict are instances of `key_type` and `value_type`. See `DictOf`. """
+    __slots__ = 'key_type', 'value_type', 'sample'
+
+    def __init__(self,
+                 key_type,    # type: Type
+                 value_type,  # type: Type
+                 sample=None  # type: Optional[int]
+                 ):
+        self.key_type = key_type
+        self.value_type = value_type
+        self.sample = sample
+
+        keys_check = _make_items_check(key_type)
+        values_check = _make_items_check(value_type)
+        if sample is None:
+            def all_entries_valid(x):
+                return keys_check(x.keys()) and values_check(x.values())
+        else:
+            def all_entries_valid(x):
+                return keys_check(islice(x.keys(), sample)) and values_check(islice(x.values(), sample))
+        self.__vtypes_raw_check__ = all_entries_valid
+
+    @property
+    def args(self):
+        return self.key_type, self.value_type, self.sample
+
+    @property
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        return 'all_entries_are_%s_%s' % (_type_name(self.key_type), _type_name(self.value_type))
+
+
+class FixedItemsValidator(ContainerValidator):
+    """ Checks that a tuple has one item per type in `item_types`, instance of that type. See `TupleOf`. """
+    __slots__ = 'item_types',
+
+    def __init__(self,
+                 item_types  # type: Tuple[Type, ...]
+                 ):
+        self.item_types = item_types = tuple(item_types)
+
+        nb_items = len(item_types)
+        item_checks = tuple(_make_item_check(t) for t in item_types)
+
+        def all_items_valid(x):
+            if len(x) != nb_items:
+                return False
+            for check, item in zip(item_checks, x):
+                if not check(item):
+                    return False
+            return True
+        self.__vtypes_raw_check__ = all_items_valid
+
+    @property
+    def args(self):
+        return self.item_types,
+
+    @property
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        return 'items_are_%s' % '_'.join(_type_name(t) for t in self.item_types)
+
+
+def ListOf(item_type,   # type: Type
+           sample=None  # type: Optional[int]
+           ):
+    # type: (...) -> Type[VType]
+    """
+    Creates a VType for lists whose items are all instances of `item_type` (a VType or a plain type).
+
+    :param item_type: the type of the list items. It can be a VType, a standard type or `object` (any item).
+    :param sample: an optional maximum number of items to check, for very large lists. The checked items are evenly
+        spread over the list. Note that in that case some invalid items may not be detected.
+    :return:
+    """
+    _check_sample(sample)
+    return vtype('ListOf[%s]' % _type_name(item_type), list, ItemsValidator(item_type, sample), module=__name__)
+
+
+def DictOf(key_type,    # type: Type
+           value_type,  # type: Type
+           sample=None  # type: Optional[int]
+           ):
+    # type: (...) -> Type[VType]
+    """
+    Creates a VType for dicts whose keys are all instances of `key_type` and values all instances of `value_type`.
+
+    :param key_type: the type of the keys. It can be a VType, a standard type or `object` (any key).
+    :param value_type: the type of the values. It can be a VType, a standard type or `object` (any value).
+    :param sample: an optional maximum number of entries to check, for very large dicts. The first entries (in
+        iteration order) are checked. Note that in that case some invalid entries may not be detected.
+    :return:
+    """
+    _check_sample(sample)
+    name = '%s, %s' % (_type_name(key_type), _type_name(value_type))
+    return vtype('DictOf[%s]' % name, dict, EntriesValidator(key_type, value_type, sample), module=__name__)
+
+
+def TupleOf(*item_types,  # type: Type
+            **kwargs
+            ):
+    # type: (...) -> Type[VType]
+    """
+    Creates a VType for tuples. Similar to `typing.Tuple`:
+
+     - `TupleOf(str, PositiveInt)` is the VType of tuples of length 2, with a string first and a `PositiveInt` second.
+     - `TupleOf(PositiveInt, ...)` is the VType of tuples of any length containing only `PositiveInt` items.
+
+    :param item_types: the types of the tuple items, or a single type followed by `...` (Ellipsis).
+    :param sample: an optional maximum number of items to check, for very large variable-length tuples. The checked
+        items are evenly spread over the tuple. Note that in that case some invalid items may not be detected.
+    :return:
+    """
+    sample = kwargs.pop('sample', None)
+    if len(kwargs) > 0:
+        raise TypeError("TupleOf() got unexpected keyword arguments: %s" % list(kwargs))
+    _check_sample(sample)
+
+    if len(item_types) == 2 and item_types[1] is Ellipsis:
+        # variable-length, homogeneous
+        name = '%s, ...' % _type_name(item_types[0])
+        validator = ItemsValidator(item_types[0], sample)
+    else:
+        # fixed-length
+        if Ellipsis in item_types:
+            raise TypeError("`...` can only be used as the second and last argument of TupleOf")
+        if sample is not None:
+            raise ValueError("sample can only be used with variable-length tuples such as TupleOf(int, ...)")
+
+        name = ', '.join(_type_name(t) for t in item_types)
+        validator = FixedItemsValidator(item_types)
+
+    return vtype('TupleOf[%s]' % name, tuple, validator, module=__name__)
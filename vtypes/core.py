@@ -1,20 +1,69 @@
 #  Authors: Sylvain Marie <sylvain.marie@se.com>
 #
 #  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import sys
 from abc import ABCMeta
-from inspect import currentframe, getmodule
 
-from six import with_metaclass
+# Note: `typing` and `valid8` are not imported here so that `import vtypes` stays fast. valid8 is only imported when the
+# first `VTypeValidator` is built (see `vtypes.vtype_validator`) or when an error is raised.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Type, Union, Tuple, Iterable, Mapping, Optional, Any, Callable, List, Iterator, Awaitable, Dict
+    from concurrent.futures import Executor
+    from valid8 import ValidationError
+    from valid8.common_syntax import ValidationFuncs, ValidationFuncDefinition, VFDefinitionElement
+    from vtypes.cache import LRU
+    from vtypes.modes import CheckMode
+    from vtypes.vtype_validator import VTypeValidator
+
 
 try:
-    from typing import Type, Union, Tuple, Iterable, Mapping, Optional, Any
-    from valid8.common_syntax import ValidationFuncs, ValidationFuncDefinition, VFDefinitionElement
-except ImportError:
-    pass
+    from _thread import RLock
+except ImportError:  # python 2
+    from threading import RLock
+
+try:
+    import copyreg
+except ImportError:  # python 2
+    import copy_reg as copyreg
+
+# the lock used when building lazy VTypes. It is reentrant since building a VType builds its VType ancestors
+_lazy_build_lock = RLock()
+
+try:
+    # python 3.7+: the ABC registry and caches of a class are stored in a single `_abc_impl` attribute
+    from abc import _abc_init
+except ImportError:  # python 2, or pure-python ABC implementation
+    _abc_init = None
+    _ABC_ATTRS = ('_abc_registry', '_abc_cache', '_abc_negative_cache', '_abc_negative_cache_version')
+else:
+    _ABC_ATTRS = ('_abc_impl',)
+
+if sys.version_info < (3,):
+    # functions stored on a class are turned into unbound methods when accessed on the class
+    _checker_attr = staticmethod
+else:
+    def _checker_attr(checker):
+        """
+        Functions stored on a class are returned as is when accessed on the class, so the compiled checkers do not need
+        to be wrapped in `staticmethod` objects, that are much bigger (they have their own `__dict__` since 3.10).
+        """
+        return checker
+
 
-from valid8 import validate
-from valid8.common_syntax import FunctionDefinitionError
-from valid8.entry_points import Validator, ValidationError
+class _NoFunctionDefinitionError(Exception):
+    """ Replaces `mini_lambda.FunctionDefinitionError` when mini_lambda is not in use """
+
+
+def _get_function_definition_error():
+    """
+    Returns `mini_lambda.FunctionDefinitionError` if mini_lambda has been imported, or a dummy exception type
+    otherwise. Indeed if mini_lambda has not been imported, no mini_lambda expression can be received.
+    """
+    try:
+        return sys.modules['mini_lambda'].FunctionDefinitionError
+    except (KeyError, AttributeError):
+        return _NoFunctionDefinitionError
 
 
 def _process_validators(validators  # type: ValidationFuncs
@@ -25,6 +74,7 @@ def _process_validators(validators  # type: ValidationFuncs
     :param validators:
     :return:
     """
+    FunctionDefinitionError = _get_function_definition_error()
     try:  # dict ?
         validators.keys()
     except (AttributeError, FunctionDefinitionError):  # FunctionDefinitionError when mini_lambda
@@ -52,21 +102,85 @@ def _process_validators(validators  # type: ValidationFuncs
     return validators
 
 
-class VTypeValidator(Validator):
+def _process_async_validators(async_validators  # type: Any
+                              ):
+    # type: (...) -> Tuple[Tuple[Callable, Optional[str]], ...]
     """
-    Represents a `Validator` responsible to validate a `vtype`
+    Transforms async validators into a tuple of `(async_callable, help_msg)` pairs. Accepted syntax: an async
+    callable, a `(async_callable, help_msg)` tuple, a dict `{help_msg: async_callable}`, or a list of those.
+
+    :param async_validators:
+    :return:
     """
-    __slots__ = '__weakref__', 'vtype'
+    if async_validators is None:
+        return ()
+    elif callable(async_validators):
+        return (async_validators, None),
+    elif isinstance(async_validators, dict):
+        return tuple((f, help_msg) for help_msg, f in async_validators.items())
+    elif isinstance(async_validators, tuple) and len(async_validators) == 2 and callable(async_validators[0]) \
+            and not callable(async_validators[1]):
+        return (async_validators[0], async_validators[1]),
+    else:
+        res = []
+        for av in async_validators:
+            if callable(av):
+                res.append((av, None))
+            elif isinstance(av, dict):
+                res.extend((f, help_msg) for help_msg, f in av.items())
+            elif isinstance(av, tuple) and len(av) == 2 and callable(av[0]):
+                res.append(tuple(av))
+            else:
+                raise TypeError("Invalid async validator: %r. It should be an async callable, a tuple "
+                                "(async_callable, help_msg) or a dict {help_msg: async_callable}" % (av,))
+        return tuple(res)
 
-    def __init__(self,
-                 vtype,       # type: VTypeMeta
-                 validators,  # type: ValidationFuncs
-                 **kwargs
-                 ):
-        # store this additional info about the function been validated
-        self.vtype = vtype
 
-        super(VTypeValidator, self).__init__(*validators, **kwargs)
+def _make_type_checker(types  # type: Tuple[Type, ...]
+                       ):
+    # type: (...) -> Callable[[Any], bool]
+    """
+    Compiles the boolean function used by `VTypeMeta.__instancecheck__` when there are no validation functions at all
+    in the VType hierarchy: `obj` should only be an instance of all `types`. See
+    `vtypes.vtype_validator.make_instance_checker` for the general case.
+
+    :param types:
+    :return:
+    """
+    if len(types) == 0:
+        def check_instance(obj):
+            return True
+
+    elif len(types) == 1:
+        typ = types[0]
+
+        def check_instance(obj):
+            return isinstance(obj, typ)
+    else:
+        def check_instance(obj):
+            for t in types:
+                if not isinstance(obj, t):
+                    return False
+            return True
+
+    return check_instance
+
+
+def _with_metaclass(meta, *bases):
+    """
+    Create a base class with a metaclass, compliant with python 2 and 3. This is `six.with_metaclass`, copied here so
+    that `six` does not need to be imported.
+    """
+    class metaclass(type):
+
+        def __new__(cls, name, this_bases, d):
+            return meta(name, bases, d)
+
+        @classmethod
+        def __prepare__(cls, name, this_bases):
+            return meta.__prepare__(name, bases)
+
+    return type.__new__(metaclass, 'temporary_class', (), {})
 
 
 # class _TypesGetter(object):
@@ -94,7 +208,8 @@ class VTypeMeta(ABCMeta):
     When a class using this metaclass is created, various checks are made to ensure that users will not create VTypes
     with other contents than base types and validators.
     """
-    ATTRS = ('__type__', '__validators__', '__help_msg__', '__error_type__', '__module__', '__qualname__', '__doc__')
+    ATTRS = ('__type__', '__validators__', '__async_validators__', '__help_msg__', '__error_type__', '__cache__',
+             '__lazy__', '__adaptive__', '__codegen__', '__module__', '__qualname__', '__doc__')
 
     def __new__(mcls, name, bases, attrs):
         """
@@ -109,7 +224,7 @@ class VTypeMeta(ABCMeta):
             VType
         except NameError:
             # yes: shortcut just create it
-            return super(VTypeMeta, mcls).__new__(mcls, name, bases, attrs)
+            return type.__new__(mcls, name, bases, attrs)
         else:
             # this is a new VType
             if not any(issubclass(b, VType) for b in bases):
@@ -151,7 +266,9 @@ class VTypeMeta(ABCMeta):
             # behaviour for is_subclass.
 
             # new: we put everything in the bases
-            return super(VTypeMeta, mcls).__new__(mcls, name, bases, attrs)
+            # note: `ABCMeta.__new__` is bypassed so that the ABC registry and caches are not allocated. They are only
+            # created if the VType uses the ABC machinery (see `_init_abc_data`), which is rare.
+            return type.__new__(mcls, name, bases, attrs)
 
     def __init__(cls,    # type: VTypeMeta
                  name,   # type: str
@@ -178,6 +295,13 @@ class VTypeMeta(ABCMeta):
         Used by the metaclass to create the validator when the class is instantiated.
         This method ensures that a created class has explicit `__type__`, `__validators__` and
         `_validator` fields so that inheritance from bases is bypassed.
+
+        If `__lazy__` is `True`, the validator and the compiled checkers are only built on first use (see
+        `_build_vtype`).
+
+        Note: the compiled checkers (`_instance_checker`...) are replaced when the VType is built, initialized again or
+        when its check mode changes, so code calling them on behalf of a VType (containers, records, decorators)
+        should look them up at each call instead of capturing them.
         :return:
         """
         # assign a class property that will return the tuple of base types checked against
@@ -190,6 +314,75 @@ class VTypeMeta(ABCMeta):
         else:
             cls.__type__ = tuple(t for t in cls.__bases__ if t is not VType)
 
+        # linearize the base types of the VType hierarchy (in MRO order) so that type checks are a single flat loop,
+        # even with deep or diamond-shaped compositions. This does not require the validators to be built.
+        flat_types = []
+        for v in cls.__mro__:
+            if isinstance(v, VTypeMeta):
+                for t in v.__type__:
+                    if not isinstance(t, VTypeMeta) and t not in flat_types:
+                        flat_types.append(t)
+        flat_types = tuple(flat_types)
+        cls._flat_types = cls.__type__ if flat_types == cls.__type__ else flat_types
+        type_checker = _make_type_checker(cls._flat_types)
+        cls._type_checker = _checker_attr(type_checker)
+        cls._compiled_checkers = dict(_type_checker=type_checker)
+
+        cls._vtype_pending = True
+        if cls.__lazy__:
+            # install checkers that will build the actual ones on first use
+            cls._install_lazy_checkers()
+        else:
+            cls._build_vtype()
+
+        # VTypes inheriting from this one should be updated too, since their flat checks embed ours
+        for sub in type.__subclasses__(cls):
+            if isinstance(sub, VTypeMeta):
+                sub.init_vtype()
+
+    def _install_lazy_checkers(cls):
+        """
+        Installs placeholder checkers that build the VType (thread-safely) and then delegate to the actual checkers.
+        """
+        def lazy_value_checker(obj):
+            cls._build_vtype()
+            return cls._value_checker is None or cls._value_checker(obj)
+
+        def lazy_flat_value_checker(obj):
+            cls._build_vtype()
+            return cls._flat_value_checker is None or cls._flat_value_checker(obj)
+
+        def lazy_validate_checker(obj):
+            cls._build_vtype()
+            return cls._validate_checker(obj)
+
+        def lazy_instance_checker(obj):
+            cls._build_vtype()
+            return cls._instance_checker(obj)
+
+        cls._value_checker = _checker_attr(lazy_value_checker)
+        cls._flat_value_checker = _checker_attr(lazy_flat_value_checker)
+        cls._validate_checker = _checker_attr(lazy_validate_checker)
+        cls._instance_checker = _checker_attr(lazy_instance_checker)
+
+    def _build_vtype(cls):
+        """
+        Creates the validator and compiles the boolean checkers, if this was not done already. This is called by
+        `init_vtype`, or on first use for lazy VTypes. In the latter case a lock ensures that it happens only once.
+        """
+        if not cls._vtype_pending:
+            return
+
+        if cls.__lazy__:
+            with _lazy_build_lock:
+                if cls._vtype_pending:
+                    cls._do_build_vtype()
+        else:
+            cls._do_build_vtype()
+
+    def _do_build_vtype(cls):
+        """ Implementation of `_build_vtype` """
+
         # make sure the validators become an iterable
         try:
             # are there specific validators on this class ?
@@ -199,15 +392,166 @@ class VTypeMeta(ABCMeta):
             cls.__validators__ = ()
             cls._validator = None
         else:
-            # yes: make them a nice tuple and create the validator
-            _vs = _process_validators(_vs)
-            cls.__validators__ = _vs
-
-            # create the associated validator
-            if len(_vs) > 0:
-                cls._validator = VTypeValidator(cls, _vs, help_msg=cls.__help_msg__, error_type=cls.__error_type__)
+            _validator = cls.__dict__.get('_validator', None)
+            if _validator is not None and _vs is _validator.validators:
+                # init_vtype is called again but validators have not changed: they are already processed
+                pass
+            else:
+                # yes: make them a nice tuple and create the validator
+                _vs = _process_validators(_vs)
+
+                # create the associated validator, or reuse the one of a VType with the same definition
+                if len(_vs) > 0:
+                    from vtypes.vtype_validator import get_shared_validator
+                    cls._validator = get_shared_validator(_vs, help_msg=cls.__help_msg__, error_type=cls.__error_type__)
+                    _vs = cls._validator.validators
+                else:
+                    cls._validator = None
+                cls.__validators__ = _vs
+
+        # async validators are only used by avalidate and avalidate_many
+        if '__async_validators__' in cls.__dict__:
+            cls.__async_validators__ = _process_async_validators(cls.__dict__['__async_validators__'])
+
+        # linearize the validation functions of the VType hierarchy: each ancestor VType contributes its validation
+        # functions only once, even in diamond-shaped hierarchies.
+        flat_funcs = []
+        flat_async_validators = []
+        for v in cls.__mro__:
+            if isinstance(v, VTypeMeta):
+                if v is not cls:
+                    v._build_vtype()
+                if v._validator is not None:
+                    flat_funcs.extend(v._validator.raw_functions)
+                for av in v.__dict__.get('__async_validators__', ()):
+                    if av not in flat_async_validators:
+                        flat_async_validators.append(av)
+        flat_funcs = tuple(flat_funcs)
+        if cls._validator is not None and flat_funcs == cls._validator.raw_functions:
+            # share the tuple with the validator
+            flat_funcs = cls._validator.raw_functions
+        cls._flat_funcs = flat_funcs
+        flat_async_validators = tuple(flat_async_validators)
+        if flat_async_validators != cls._flat_async_validators:
+            # note: most VTypes have no async validators and inherit the empty tuple, this keeps their dict small
+            cls._flat_async_validators = flat_async_validators
+
+        # finally compile the boolean checkers used by isinstance, is_valid and has_valid_value.
+        value_checker = cls._validator.value_checker if cls._validator is not None else None
+        if len(flat_funcs) > 0:
+            # there are validators in the hierarchy, so valid8 is already loaded
+            from vtypes.vtype_validator import make_value_checker, make_instance_checker
+            checked_funcs = flat_funcs
+            instance_checker = None
+            if cls.__adaptive__ and len(flat_funcs) > 1:
+                # adaptive mode: the order learned for these functions, or a learning checker (see `vtypes.adaptive`)
+                learned = cls.__dict__.get('_adaptive_order', None)
+                if learned is not None and learned[0] == flat_funcs:
+                    checked_funcs = learned[1]
+                else:
+                    from vtypes.adaptive import make_learning_checker
+                    instance_checker = make_learning_checker(cls, cls._flat_types, flat_funcs)
+            if cls.__codegen__:
+                # generated straight-line checkers (see `vtypes.codegen`)
+                from vtypes.codegen import compile_checker
+                flat_value_checker, _ = compile_checker(cls.__name__, (), checked_funcs)
+                if instance_checker is None:
+                    instance_checker, cls._codegen_source = compile_checker(cls.__name__, cls._flat_types,
+                                                                            checked_funcs)
             else:
-                cls._validator = None
+                if value_checker is not None and checked_funcs == cls._validator.raw_functions:
+                    # no validators in the VType ancestors: the value checker of the validator can be reused
+                    flat_value_checker = value_checker
+                else:
+                    flat_value_checker = make_value_checker(checked_funcs)
+                if instance_checker is None:
+                    instance_checker = make_instance_checker(cls._flat_types, checked_funcs)
+        else:
+            flat_value_checker = None
+            instance_checker = cls._compiled_checkers['_type_checker']
+
+        # optional memoization of the results. The cache is not inherited, and previous results are invalidated
+        cache = cls.__dict__.get('__cache__', None)
+        if cache is not None:
+            cache.clear()
+            if value_checker is not None:
+                value_checker = cache.wrap(value_checker)
+            if flat_value_checker is not None:
+                flat_value_checker = cache.wrap(flat_value_checker)
+            instance_checker = cache.wrap(instance_checker)
+
+        cls._compiled_checkers.update(_value_checker=value_checker, _flat_value_checker=flat_value_checker,
+                                      _validate_checker=instance_checker, _instance_checker=instance_checker)
+        cls._install_checkers()
+        cls._vtype_pending = False
+
+    def _install_checkers(cls):
+        """
+        Installs the compiled checkers of this (built) VType, and then the optional layers that replace them with
+        wrappers: instrumentation (see `vtypes.instrumentation`) and check mode (see `vtypes.modes`). This is called
+        again whenever one of these layers changes, so that they are always stacked in the same order.
+        """
+        # Note: in python 2 they are stored as staticmethods so that they are not bound when accessed on the class.
+        for attr, checker in cls._compiled_checkers.items():
+            setattr(cls, attr, _checker_attr(checker))
+
+        stats = cls.__dict__.get('_vtype_stats', None)
+        if stats is not None:
+            stats.install()
+
+        mode = cls._check_mode
+        if mode is not None:
+            mode.install(cls)
+
+    def _adapt(cls,
+               funcs,   # type: Tuple[Callable, ...]
+               ordered  # type: Tuple[Callable, ...]
+               ):
+        """
+        Called at the end of the learning phase of adaptive VTypes: stores the optimal order `ordered` of the flat
+        validation functions `funcs`, and recompiles the checkers accordingly.
+        """
+        cls._adaptive_order = (funcs, ordered)
+        with _lazy_build_lock:
+            cls._vtype_pending = True
+            cls._do_build_vtype()
+
+    def __reduce__(cls):
+        """
+        Pickling protocol for VTypes (registered with `copyreg`, since pickle does not call it on classes otherwise).
+
+        VTypes that can be found at the location described by their `__module__` and `__qualname__` (typically,
+        VTypes defined at the top level of a module) are pickled by reference, as any class. Other VTypes, for example
+        VTypes created dynamically with `vtype()`, are pickled by definition: bases, validators, help message, etc.
+        This requires their validators to be picklable, which is the case of declarative validators
+        (`vtypes.validators`) and module-level functions, but not of lambdas.
+
+        A VType pickled by definition is only rebuilt once per process: unpickling it again returns the same class.
+        Caches are not pickled, an empty `LRU` with the same `maxsize` is created instead.
+        """
+        if _is_importable(cls):
+            # by reference
+            return getattr(cls, '__qualname__', cls.__name__)
+
+        # by definition
+        try:
+            pickle_id = cls.__dict__['_pickle_id']
+        except KeyError:
+            from uuid import uuid4
+            pickle_id = cls._pickle_id = uuid4().hex
+            _get_vtypes_by_pickle_id()[pickle_id] = cls
+
+        # the validators of lazy VTypes are only processed when they are built
+        cls._build_vtype()
+
+        attrs = dict()
+        for k in VTypeMeta.ATTRS:
+            if k in cls.__dict__ and k not in ('__type__', '__validators__'):
+                attrs[k] = cls.__dict__[k]
+        attrs['__validators__'] = list(cls.__validators__)
+        if attrs.get('__doc__', None) is None:
+            attrs.pop('__doc__', None)
+        return _rebuild_vtype, (pickle_id, cls.__name__, cls.__bases__, attrs)
 
     def __call__(cls, *args, **kwargs):
         """
@@ -229,12 +573,9 @@ class VTypeMeta(ABCMeta):
         :param obj:
         :return:
         """
-        # first make sure that `obj` is an instance of all the base types
-        if not all(isinstance(obj, t) for t in cls.__type__):
-            return False
-
-        # then validate the value with validators on this class
-        return cls.has_valid_value(obj, inherited_validators=False)
+        # the compiled checker first makes sure that `obj` is an instance of all the base types, and then validates the
+        # value with the raw validation functions on this class (see `init_vtype`)
+        return cls._instance_checker(obj)
 
     # def __subclasscheck__(cls,  # type:  VTypeMeta
     #                       subclass):
@@ -252,6 +593,61 @@ class VTypeMeta(ABCMeta):
     #     else:
     #         return True
 
+    def __subclasscheck__(cls,  # type:  VTypeMeta
+                          subclass):
+        """
+        Subclass checks bypass the ABC machinery: unless `register` was called on this VType or on one of its VType
+        subclasses, the result is entirely determined by the `__mro__` of `subclass`. This avoids filling the `ABCMeta`
+        positive and negative caches of all VTypes (ABC checks recurse into all subclasses), and their global
+        invalidation by any `register()` call.
+
+        :param subclass:
+        :return:
+        """
+        if cls._abc_subclasscheck is cls:
+            cls._init_abc_data()
+            return super(VTypeMeta, cls).__subclasscheck__(subclass)
+        try:
+            return cls in subclass.__mro__
+        except AttributeError:
+            # not a class: let type raise the appropriate error
+            return type.__subclasscheck__(cls, subclass)
+
+    def register(cls, subclass):
+        """
+        Registers a virtual subclass, as `ABCMeta.register`. The VType and its VType ancestors (except `VType` itself)
+        then use the ABC machinery for subclass checks. Therefore `issubclass(subclass, VType)` stays `False`.
+        """
+        cls._use_abc_subclasscheck()
+        return super(VTypeMeta, cls).register(subclass)
+
+    def _use_abc_subclasscheck(cls):
+        """
+        Makes this VType and its ancestors use the ABC machinery in `__subclasscheck__` (see `register`). `VType` itself
+        is excluded, otherwise a single `register` would make `issubclass(x, VType)` visit all VTypes.
+        """
+        for v in cls.__mro__:
+            if isinstance(v, VTypeMeta) and v is not VType:
+                v._init_abc_data()
+                # note: the flag is the class itself so that it is not inherited by subclasses
+                v._abc_subclasscheck = v
+
+    def _init_abc_data(cls):
+        """
+        Creates the ABC registry and caches of this VType if needed. They are not created with the VType (see
+        `__new__`), since they are only used once `register` has been called in the VType hierarchy.
+        """
+        # note: the attributes may be inherited from a non-VType ABC base, that is why __dict__ is checked
+        if _ABC_ATTRS[0] not in cls.__dict__:
+            if _abc_init is not None:
+                _abc_init(cls)
+            else:
+                from weakref import WeakSet
+                cls._abc_registry = WeakSet()
+                cls._abc_cache = WeakSet()
+                cls._abc_negative_cache = WeakSet()
+                cls._abc_negative_cache_version = ABCMeta._abc_invalidation_counter
+
     def validate(cls,
                  name,  # type: str
                  val
@@ -260,11 +656,19 @@ class VTypeMeta(ABCMeta):
         Class method that can be used to check if some value is valid. A name should be provided so that the
         error messages are human-friendly.
 
+        The compiled boolean checker is used first, so that the (slower) valid8 machinery is only involved when a
+        `ValidationError` actually needs to be raised.
+
         :param name:
         :param val:
         :return:
         """
+        # fast path: nothing to report
+        if cls._validate_checker(val):
+            return
+
         # validate type
+        from valid8 import validate
         for typ in cls.__type__:
             validate(name, val, instance_of=typ, help_msg=cls.__help_msg__, error_type=cls.__error_type__)
 
@@ -272,8 +676,163 @@ class VTypeMeta(ABCMeta):
         if cls._validator is not None:
             cls._validator.assert_valid(name, val, help_msg=cls.__help_msg__, error_type=cls.__error_type__)
 
+    def avalidate(cls,
+                  name,  # type: str
+                  val
+                  ):
+        # type: (...) -> Awaitable[None]
+        """
+        Asynchronous version of `validate`, that also runs the async validators (`__async_validators__`) after the
+        synchronous checks. Usage: `await MyVType.avalidate('x', x)`. Requires python 3.5+.
+
+        :param name:
+        :param val:
+        :return:
+        """
+        from vtypes._aio import avalidate
+        return avalidate(cls, name, val)
+
+    def avalidate_many(cls,
+                       name,           # type: str
+                       values,         # type: Iterable[Any]
+                       concurrency=10  # type: int
+                       ):
+        # type: (...) -> Awaitable[None]
+        """
+        Asynchronous version of `validate_many`, that also runs the async validators. The elements are checked
+        concurrently, with at most `concurrency` elements being checked at a time. The first invalid element (in input
+        order) is reported with a `ValidationError`, using name `<name>[<i>]`. Requires python 3.5+.
+
+        :param name:
+        :param values: an iterable of values
+        :param concurrency: the maximum number of elements checked concurrently. Default is 10.
+        :return:
+        """
+        from vtypes._aio import avalidate_many
+        return avalidate_many(cls, name, values, concurrency=concurrency)
+
+    def validate_many(cls,
+                      name,   # type: str
+                      values  # type: Iterable[Any]
+                      ):
+        """
+        Class method that can be used to check that all values in `values` are valid. The first invalid element is
+        reported with a `ValidationError`, using name `<name>[<i>]` where `<i>` is the index of the element.
+
+        The same fast path than in `is_valid_many` is used, so that the valid8 machinery is only involved when an error
+        actually needs to be raised.
+
+        :param name:
+        :param values: an iterable of values, or a NumPy array
+        :return:
+        """
+        from vtypes.batch import validate_many
+        validate_many(cls, name, values)
+
+    # --- streaming ---
+
+    def iter_validated(cls,
+                       values,           # type: Iterable[Any]
+                       on_error='raise',  # type: str
+                       errors=None,      # type: Any
+                       name='values'     # type: str
+                       ):
+        # type: (...) -> Iterator[Any]
+        """
+        Lazily iterates over the valid elements of `values`, that may be a generator. Memory usage does not depend on
+        the length of the stream. `on_error` defines what happens with invalid elements:
+
+         - `'raise'` (default): a `ValidationError` is raised for the first invalid element, using name `<name>[<i>]`
+           where `<i>` is the index of the element.
+         - `'skip'`: invalid elements are silently skipped. This is equivalent to `filter`.
+         - `'collect'`: invalid elements are skipped, and a compact `vtypes.batch.InvalidItem(index, value_repr,
+           validator)` record is appended to `errors` for each of them. No valid8 error is created. `errors` can be
+           a list, or a `collections.deque(maxlen=...)` to bound memory usage.
+
+        :param values: an iterable of values
+        :param on_error: one of `'raise'` (default), `'skip'` or `'collect'`
+        :param errors: the object that will receive the `InvalidItem` records when `on_error='collect'`. It should
+            have an `append` method.
+        :param name: the name to use in errors when `on_error='raise'`. Default is `'values'`.
+        :return: an iterator over the valid elements
+        """
+        from vtypes.batch import iter_validated
+        return iter_validated(cls, values, on_error=on_error, errors=errors, name=name)
+
+    def filter(cls,
+               values  # type: Iterable[Any]
+               ):
+        # type: (...) -> Iterator[Any]
+        """
+        Lazily iterates over the valid elements of `values`, that may be a generator. Invalid elements are skipped.
+        This is equivalent to `iter_validated(values, on_error='skip')`.
+
+        :param values: an iterable of values
+        :return: an iterator over the valid elements
+        """
+        from vtypes.batch import iter_validated
+        return iter_validated(cls, values, on_error='skip')
+
     # --- boolean checks (no exception) ---
 
+    def is_valid_many(cls,
+                      values  # type: Iterable[Any]
+                      ):
+        # type: (...) -> Union[List[bool], Iterable[bool]]
+        """
+        Returns a boolean mask indicating, for each element in `values`, if it is valid according to this VType (see
+        `is_valid`). Indices of the failures can be obtained with for example `numpy.flatnonzero(~mask)`.
+
+        If `values` is a NumPy array, a boolean array with the same shape is returned. Elements are considered as
+        python scalars (as obtained with `values.tolist()`). If the array dtype is compliant with all base types, the
+        validation functions marked with `vectorizable` (as well as numpy ufuncs such as `numpy.isfinite`) are
+        evaluated on the whole array at once.
+
+        :param values: an iterable of values, or a NumPy array
+        :return: a list of booleans, or a boolean NumPy array if `values` is a NumPy array
+        """
+        from vtypes.batch import is_valid_many
+        return is_valid_many(cls, values)
+
+    def is_valid_parallel(cls,
+                          values,              # type: Iterable[Any]
+                          executor='process',  # type: Union[str, Executor]
+                          max_workers=None,    # type: int
+                          chunksize=None       # type: int
+                          ):
+        # type: (...) -> BulkResult
+        """
+        Parallel version of `is_valid_many`, for very large datasets: `values` is split in chunks that are checked
+        in a process pool (default) or in a thread pool. Threads are only useful when the validators release the GIL,
+        for example NumPy vectorized validators on arrays.
+
+        With a process pool, this VType is pickled to be sent to the workers (see `__reduce__`).
+
+        :param values: an iterable of values, or a NumPy array
+        :param executor: `'process'` (default) or `'thread'` to use a new `concurrent.futures` pool for this call, or
+            an existing `concurrent.futures.Executor` to reuse.
+        :param max_workers: the number of workers of the pool. Default is the number of cpus. When an existing
+            `executor` is provided, it is only used to size the chunks and the number of pending chunks, so it
+            should be set to the number of workers of that executor.
+        :param chunksize: the number of elements in each chunk. By default about 4 chunks are created per worker when
+            the length of `values` is known, and chunks of 10000 elements otherwise.
+        :return: a `vtypes.parallel.BulkResult(mask, invalid_indices)`, in input order
+        """
+        from vtypes.parallel import is_valid_parallel
+        return is_valid_parallel(cls, values, executor=executor, max_workers=max_workers, chunksize=chunksize)
+
+    def is_valid(cls, obj):
+        # type: (...) -> bool
+        """
+        Returns `True` if `obj` is valid according to this `VType`: it should have a valid type and a valid value
+        (including inherited validators). This is equivalent to `isinstance(obj, cls)` and to `validate` not raising
+        any error, except that no error is ever created: checks stop at the first failure and `False` is returned.
+
+        :param obj:
+        :return:
+        """
+        return cls._instance_checker(obj)
+
     # not very interesting now that in the type bases there can be value checkers
 
     def has_valid_type(cls, obj):
@@ -288,19 +847,9 @@ class VTypeMeta(ABCMeta):
         :param obj:
         :return:
         """
-        # should be an instance of all base types
-        # for VTypes, we rely on has_valid_type instead of isinstance to avoid value check
-        for t in cls.__type__:
-            # if t is VType:
-            #     continue
-            if isinstance(t, VTypeMeta):
-                if not t.has_valid_type(obj):
-                    return False
-            elif not isinstance(obj, t):
-                return False
-            else:
-                continue
-        return True
+        # should be an instance of all base types. VType ancestors have been flattened in init_vtype so that
+        # `_flat_types` only contains the non-VType types
+        return cls._type_checker(obj)
 
     def has_valid_value(cls,
                         obj,
@@ -312,30 +861,17 @@ class VTypeMeta(ABCMeta):
         `__types__` (ancestor classes). You may turn `inherited_validators=False` to only check local validators.
 
         :param obj: the object to validate
-        :param inherited_validators: an optional boolean. If this is `True` (default), `has_valid_value` will also be
-            called on all ancestor VType classes and `True` will be returned only if all return `True`. Setting `False`
-            will only use the local `__validators__` on this class.
+        :param inherited_validators: an optional boolean. If this is `True` (default), the validators of all ancestor
+            VType classes will also be used (each ancestor only once, even in diamond-shaped hierarchies). Setting
+            `False` will only use the local `__validators__` on this class.
         :return:
         """
-        if cls._validator is not None:
-            try:
-                cls._validator.assert_valid('unnamed', obj)
-            except ValidationError:
-                return False
-
-        if inherited_validators:
-            for t in cls.__type__:
-                # if t is VType:
-                #     continue
-                if isinstance(t, VTypeMeta) and not t.has_valid_value(obj, inherited_validators=True):
-                    return False
-                else:
-                    continue
+        # the validation functions of all ancestor VTypes have been flattened in init_vtype
+        checker = cls._flat_value_checker if inherited_validators else cls._value_checker
+        return checker is None or checker(obj)
 
-        return True
 
-
-class VType(with_metaclass(VTypeMeta, object)):
+class VType(_with_metaclass(VTypeMeta, object)):
     """
     The super class of all `VType`s.
 
@@ -345,13 +881,39 @@ class VType(with_metaclass(VTypeMeta, object)):
     Also at class creation time a `VTypeValidator` instance is created, that will be used in all subsequent checks.
     Therefore if you dynamically update `__validators__`, you should explicitly call `cls.init_vtype()` to refresh
     the validator associated with the class.
+
+    An optional `__cache__` (for example `LRU(maxsize=1024)`) can be set to memoize check results on hashable values.
+    It is cleared whenever `init_vtype()` is called.
+
+    If `__lazy__` is set to `True` (it is inherited), the `VTypeValidator` and the compiled checkers are only built on
+    first use. This makes the creation of VTypes that are never used almost free.
+
+    If `__adaptive__` is set to `True` (it is inherited), the cost and rejection rate of the validation functions are
+    measured during the first checks, and the reorderable ones are then reordered to make checks cheaper (see
+    `vtypes.adaptive`). `validate` still reports errors in declaration order.
+
+    If `__codegen__` is set to `True` (it is inherited), the boolean checkers are python functions generated from the
+    definition, with inlined type checks and declarative validators (see `vtypes.codegen`).
+
+    Async validators (for example validators performing I/O) can be declared in `__async_validators__`. They are only
+    run by `avalidate` and `avalidate_many`: `isinstance`, `is_valid` and `validate` ignore them.
     """
     __type__ = ()          # type: Union[Type, Tuple[Type]]
     __validators__ = ()    # type: ValidationFuncs
     __error_type__ = None  # type: Type[ValidationError]
     __help_msg__ = None    # type: str
+    __cache__ = None       # type: LRU
+    __lazy__ = False       # type: bool
+    __adaptive__ = False   # type: bool
+    __codegen__ = False    # type: bool
+    __async_validators__ = ()  # type: Tuple[Tuple[Callable, Optional[str]], ...]
 
     _validator = None      # type: Validator
+    _value_checker = None  # type: Callable[[Any], bool]
+    _flat_types = ()       # type: Tuple[Type, ...]
+    _flat_async_validators = ()  # type: Tuple[Tuple[Callable, Optional[str]], ...]
+    _check_mode = None     # type: CheckMode
+    _abc_subclasscheck = None   # type: Optional[VTypeMeta]
 
     # @classmethod
     # def init_vtype(cls):
@@ -380,7 +942,13 @@ def vtype(name,             # type: str
           validators=(),    # type: ValidationFuncs
           help_msg=None,    # type: str
           error_type=None,  # type: Type[ValidationError]
-          doc=None          # type: str
+          doc=None,         # type: str
+          cache=None,       # type: LRU
+          module=None,      # type: str
+          lazy=False,       # type: bool
+          async_validators=None,  # type: Any
+          adaptive=False,   # type: bool
+          codegen=False     # type: bool
           ):
     # type: (...) -> Union[Type[VType], VTypeMeta]
     """
@@ -393,30 +961,67 @@ def vtype(name,             # type: str
     :param help_msg: an optional help message (a string) for the validation errors
     :param error_type: an optional error type (a subtype of `ValidationError`) for the validation errors
     :param doc: an optional docstring
+    :param cache: an optional cache (for example `LRU(maxsize=1024)`) to memoize check results on hashable values.
+        See `vtypes.cache.LRU`.
+    :param module: an optional module name to use as the `__module__` of the created VType. By default the name of
+        the caller's module is used. Providing it explicitly is slightly faster when many VTypes are created.
+    :param lazy: if `True`, the validator and compiled checkers of the VType will be built on first use instead of now
+        (thread-safe). This is useful when many VTypes are created but only a few are actually used.
+    :param async_validators: an optional async validator or group of async validators, that will only be run by
+        `avalidate` and `avalidate_many`. Either an async callable, a tuple `(async_callable, help_msg)`, a dict
+        `{help_msg: async_callable}`, or a list of those.
+    :param adaptive: if `True`, the reorderable validation functions will be reordered by cost and rejection rate after
+        a learning phase, to make checks cheaper. See `vtypes.adaptive`.
+    :param codegen: if `True`, the boolean checkers of the VType are generated python functions with inlined checks,
+        instead of generic closures. See `vtypes.codegen`.
     :return:
     """
-    new_type = VTypeMeta(name, (VType,), dict(__type__=base, __validators__=validators,
-                                              __help_msg__=help_msg, __error_type__=error_type))
-    new_type.__module__ = get_caller_module().__name__
+    if module is None:
+        module = get_caller_module_name()
+    attrs = dict(__type__=base, __validators__=validators, __module__=module)
+    if cache is not None:
+        attrs['__cache__'] = cache
+    if async_validators is not None:
+        attrs['__async_validators__'] = async_validators
+
+    # the inherited attributes are only set when needed, to keep the dict of the class small
+    bases = (base,) if isinstance(base, type) else tuple(base)
+    for k, v, default in (('__help_msg__', help_msg, None), ('__error_type__', error_type, None),
+                          ('__lazy__', lazy, False), ('__adaptive__', adaptive, False),
+                          ('__codegen__', codegen, False)):
+        if v is not default or any(getattr(b, k, default) is not default for b in bases):
+            attrs[k] = v
     if doc is not None:
-        new_type.__doc__ = doc
-    return new_type
+        attrs['__doc__'] = doc
+    return VTypeMeta(name, (VType,), attrs)
 
 
 def get_caller_module(frame_offset=1):
+    from inspect import getmodule
     # grab context from the caller frame
     frame = _get_callerframe(offset=frame_offset)
     return getmodule(frame)
 
 
+def get_caller_module_name(frame_offset=1):
+    # type: (...) -> str
+    """
+    Returns the name of the caller's module. This is much faster than `get_caller_module().__name__`, since
+    `inspect.getmodule` may scan all of `sys.modules`, and it also works when there is no module object (doctests,
+    exec...).
+
+    :param frame_offset:
+    :return:
+    """
+    frame = _get_callerframe(offset=frame_offset)
+    return frame.f_globals.get('__name__')
+
+
 def _get_callerframe(offset=0):
     # inspect.stack is extremely slow, the fastest is sys._getframe or inspect.currentframe().
     # See https://gist.github.com/JettJones/c236494013f22723c1822126df944b12
-    # frame = sys._getframe(2 + offset)
-    frame = currentframe()
-    for _ in range(2 + offset):
-        frame = frame.f_back
-    return frame
+    # note: inspect is not imported since it is slow to import
+    return sys._getframe(2 + offset)
 
 
 def is_vtype(t  # type: Any
@@ -434,3 +1039,67 @@ def is_vtype(t  # type: Any
         return isinstance(t, VTypeMeta)
     except Exception:
         return False
+
+
+def _is_importable(cls  # type: Type
+                   ):
+    # type: (...) -> bool
+    """
+    Returns True if class `cls` can be found at the location described by its `__module__` and `__qualname__`, that is
+    if it can be pickled by reference.
+    """
+    obj = sys.modules.get(cls.__module__)
+    for name in getattr(cls, '__qualname__', cls.__name__).split('.'):
+        obj = getattr(obj, name, None)
+    return obj is cls
+
+
+# VTypes pickled by definition or unpickled in this process, by pickle id
+_vtypes_by_pickle_id = None
+
+# VTypes unpickled in this process are kept alive, so that a registry of VTypes can be sent once to a worker process
+# (for example in the `initializer` of a process pool) and then be referenced by later tasks without being rebuilt
+_unpickled_vtypes = []
+
+
+def _get_vtypes_by_pickle_id():
+    global _vtypes_by_pickle_id
+    if _vtypes_by_pickle_id is None:
+        from weakref import WeakValueDictionary
+        _vtypes_by_pickle_id = WeakValueDictionary()
+    return _vtypes_by_pickle_id
+
+
+def _rebuild_vtype(pickle_id,  # type: str
+                   name,       # type: str
+                   bases,      # type: Tuple[Type, ...]
+                   attrs       # type: Dict[str, Any]
+                   ):
+    # type: (...) -> VTypeMeta
+    """ Unpickles a VType pickled by definition (see `VTypeMeta.__reduce__`). It is only rebuilt once per process. """
+    vtypes_by_pickle_id = _get_vtypes_by_pickle_id()
+    with _lazy_build_lock:
+        try:
+            return vtypes_by_pickle_id[pickle_id]
+        except KeyError:
+            vt = VTypeMeta(name, bases, attrs)
+            vt._pickle_id = pickle_id
+            vtypes_by_pickle_id[pickle_id] = vt
+            _unpickled_vtypes.append(vt)
+            return vt
+
+
+# pickle does not call __reduce__ on classes, unless their metaclass is registered
+copyreg.pickle(VTypeMeta, VTypeMeta.__reduce__)
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """ Lazily provides `VTypeValidator`, for compatibility with code importing it from `vtypes.core` """
+        if name == 'VTypeValidator':
+            from vtypes.vtype_validator import VTypeValidator
+            return VTypeValidator
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+else:
+    # module-level __getattr__ is not supported: import it (and therefore valid8) eagerly
+    from vtypes.vtype_validator import VTypeValidator  # noqa: E402
@@ -0,0 +1,199 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+A decorator validating the arguments of a function against their VType annotations:
+
+```python
+from vtypes import validate_arguments
+
+@validate_arguments
+def create_user(name: NonEmptyStr, age: PositiveInt, tags: list = ()):
+    ...
+
+create_user('', 12)  # raises a ValidationError for argument 'name'
+```
+
+Annotations are read once, when the function is decorated: the wrapper only checks the VType parameters, with the
+compiled checkers of the VTypes, and only calls `validate` to raise an error. Parameters that are not annotated with a
+VType are not checked at all, and functions without any VType parameter are returned unchanged.
+
+String annotations (forward references, or all annotations with `from __future__ import annotations`) are evaluated in
+the globals of the function and the locals of the scope where it is decorated. The ones that can not be evaluated yet
+are evaluated again on the first call, and a warning is emitted for those that still can not: they are not checked.
+
+In performance-critical deployments, the checks can be compiled out: if the `VTYPES_ARGUMENT_CHECKS` environment
+variable is set to `0` or if `enable_argument_checks(False)` was called, functions decorated afterwards are returned
+unchanged, so they run without any overhead.
+"""
+import os
+import sys
+import warnings
+from functools import wraps
+
+from vtypes.core import is_vtype
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar
+    from vtypes.core import VType
+    F = TypeVar('F', bound=Callable)
+
+
+# the global switch, read when functions are decorated
+_enabled = os.environ.get('VTYPES_ARGUMENT_CHECKS', '1') != '0'
+
+
+def enable_argument_checks(enabled=True  # type: bool
+                           ):
+    """
+    Enables or disables argument checks globally, for the functions decorated with `validate_arguments` afterwards.
+    Functions decorated while checks are disabled are returned unchanged. By default checks are enabled, unless the
+    `VTYPES_ARGUMENT_CHECKS` environment variable is set to `0`.
+
+    :param enabled:
+    :return:
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def _get_vtype_annotations(f,             # type: Callable
+                           localns=None   # type: Optional[Mapping[str, Any]]
+                           ):
+    # type: (...) -> Tuple[Dict[str, Type[VType]], Dict[str, str]]
+    """
+    Returns the VType annotations of the parameters of `f`, and the string annotations that could not be evaluated.
+    String annotations are evaluated in the globals of `f` and in `localns`.
+    """
+    vtypes = dict()
+    unresolved = dict()
+    for name, annotation in getattr(f, '__annotations__', {}).items():
+        if name == 'return':
+            continue
+        if isinstance(annotation, str):
+            try:
+                annotation = eval(annotation, getattr(f, '__globals__', {}), localns)
+            except Exception:
+                unresolved[name] = annotation
+                continue
+        if is_vtype(annotation):
+            vtypes[name] = annotation
+    return vtypes, unresolved
+
+
+def validate_arguments(f  # type: F
+                       ):
+    # type: (...) -> F
+    """
+    A decorator validating the arguments of `f` annotated with VTypes, each time `f` is called. A `ValidationError`
+    is raised by `MyVType.validate` with the name of the parameter when an argument is invalid. Default values are not
+    checked. Elements of `*args` and values of `**kwargs` are checked if the corresponding parameter is annotated.
+
+    String annotations that can not be evaluated when `f` is decorated (for example forward references) are evaluated
+    again on the first call. A warning is emitted for the ones that still can not be evaluated: they are not checked.
+
+    :param f: the function to decorate
+    :return: a wrapper of `f`, or `f` itself if it has no VType parameter or if argument checks are disabled (see
+        `enable_argument_checks`)
+    """
+    if not _enabled:
+        return f
+
+    # string annotations may refer to VTypes defined locally where f is decorated
+    vtypes, unresolved = _get_vtype_annotations(f, localns=sys._getframe(1).f_locals)
+    if len(unresolved) == 0:
+        return _make_validating_wrapper(f, vtypes) if len(vtypes) > 0 else f
+
+    # some annotations may be forward references: the wrapper is created on first call
+    validated = []
+
+    @wraps(f)
+    def resolving_wrapper(*args, **kwargs):
+        if len(validated) == 0:
+            # concurrent first calls are harmless, as in `VTypeValidator.__getattr__`
+            resolved, still_unresolved = _get_vtype_annotations(f)
+            for name, annotation in unresolved.items():
+                if name in resolved:
+                    vtypes[name] = resolved[name]
+                elif name in still_unresolved:
+                    warnings.warn("validate_arguments: the annotation %r of parameter %r of %s can not be evaluated, "
+                                  "this parameter is not checked" % (annotation, name, f.__name__), stacklevel=2)
+            validated.append(_make_validating_wrapper(f, vtypes) if len(vtypes) > 0 else f)
+        return validated[0](*args, **kwargs)
+
+    return resolving_wrapper
+
+
+def _make_validating_wrapper(f,      # type: F
+                             vtypes  # type: Dict[str, Type[VType]]
+                             ):
+    # type: (...) -> F
+    """ Returns the wrapper of `f` validating its parameters annotated with `vtypes`. See `validate_arguments`. """
+    from inspect import signature, Parameter
+
+    # (position or None, keyword or None, name, vtype) for each parameter received as a positional or keyword argument
+    arg_checks = []
+    var_args = var_kwargs = None
+    keywords = set()
+    for i, p in enumerate(signature(f).parameters.values()):
+        if p.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY):
+            keywords.add(p.name)
+        vt = vtypes.get(p.name, None)
+        if vt is None:
+            continue
+        if p.kind is Parameter.VAR_POSITIONAL:
+            var_args = (i, p.name, vt)
+        elif p.kind is Parameter.VAR_KEYWORD:
+            var_kwargs = (p.name, vt)
+        elif p.kind is Parameter.POSITIONAL_ONLY:
+            arg_checks.append((i, None, p.name, vt))
+        elif p.kind is Parameter.KEYWORD_ONLY:
+            arg_checks.append((None, p.name, p.name, vt))
+        else:
+            arg_checks.append((i, p.name, p.name, vt))
+    arg_checks = tuple(arg_checks)
+    keywords = frozenset(keywords)
+
+    # the compiled checkers of VTypes are looked up at each call, see `VTypeMeta.init_vtype`
+    if var_args is None and var_kwargs is None:
+        @wraps(f)
+        def validating_wrapper(*args, **kwargs):
+            n = len(args)
+            for i, key, name, vt in arg_checks:
+                if i is not None and i < n:
+                    v = args[i]
+                elif key in kwargs:
+                    v = kwargs[key]
+                else:
+                    continue
+                if not vt._instance_checker(v):
+                    vt.validate(name, v)
+            return f(*args, **kwargs)
+    else:
+        @wraps(f)
+        def validating_wrapper(*args, **kwargs):
+            n = len(args)
+            for i, key, name, vt in arg_checks:
+                if i is not None and i < n:
+                    v = args[i]
+                elif key in kwargs:
+                    v = kwargs[key]
+                else:
+                    continue
+                if not vt._instance_checker(v):
+                    vt.validate(name, v)
+            if var_args is not None:
+                start, name, vt = var_args
+                for j in range(start, n):
+                    v = args[j]
+                    if not vt._instance_checker(v):
+                        vt.validate('%s[%s]' % (name, j - start), v)
+            if var_kwargs is not None:
+                name, vt = var_kwargs
+                for k, v in kwargs.items():
+                    if k not in keywords and not vt._instance_checker(v):
+                        vt.validate('%s[%r]' % (name, k), v)
+            return f(*args, **kwargs)
+
+    return validating_wrapper
@@ -0,0 +1,212 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Opt-in instrumentation of VType checks: per-VType call counts and cumulative time for `isinstance`, `validate`,
+`has_valid_type` and `has_valid_value`, as well as failure counts per failing check.
+
+```python
+from vtypes.instrumentation import instrument, snapshot
+
+instrument(PositiveInt, callback=lambda vt, kind, duration, ok: metrics.observe(vt.__name__, kind, duration))
+...
+print(snapshot())
+```
+
+Instrumentation works by swapping the compiled checkers of the VType with instrumented wrappers: there is no overhead
+at all for VTypes that are not instrumented. Note that counters are not protected by a lock: with several threads,
+some increments may be lost.
+"""
+from timeit import default_timer
+from weakref import WeakSet
+
+from vtypes.core import _checker_attr
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Optional, Tuple, Type
+    from vtypes.core import VType
+    InstrumentationCallback = Callable[[Type[VType], str, float, bool], Any]
+
+
+# the compiled checkers that are instrumented, and the corresponding kind of check.
+# note: `_instance_checker` is also used by `is_valid` and by the batch and streaming checks.
+CHECKERS = (('_instance_checker', 'isinstance'),
+            ('_validate_checker', 'validate'),
+            ('_type_checker', 'has_valid_type'),
+            ('_flat_value_checker', 'has_valid_value'),
+            ('_value_checker', 'has_valid_value'))
+
+KINDS = ('isinstance', 'validate', 'has_valid_type', 'has_valid_value')
+
+# all instrumented VTypes
+_instrumented = WeakSet()
+
+
+def _always_true(obj):
+    return True
+
+
+def _find_failing_check(types,  # type: Tuple[Type, ...]
+                        funcs,  # type: Tuple[Callable, ...]
+                        obj     # type: Any
+                        ):
+    # type: (...) -> Optional[str]
+    """ Returns a description of the first failing check on `obj`: `'isinstance(x, <type>)'` or a function name. """
+    for t in types:
+        if not isinstance(obj, t):
+            return 'isinstance(x, %s)' % t.__name__
+
+    from valid8.base import NP_TRUE
+    for f in funcs:
+        try:
+            res = f(obj)
+        except Exception:
+            pass
+        else:
+            if (res is None) or (res is True) or (res is NP_TRUE):
+                continue
+        return getattr(f, '__name__', repr(f))
+    return None
+
+
+class VTypeStats(object):
+    """
+    The statistics of an instrumented VType. `calls` and `time` are dictionaries of call counts and cumulative time (in
+    seconds) per kind of check (`'isinstance'`, `'validate'`, `'has_valid_type'`, `'has_valid_value'`). `failures` is
+    a dictionary of failure counts per failing check (`'isinstance(x, <type>)'` or the name of a validation function).
+    """
+    __slots__ = 'vtype', 'callback', 'calls', 'time', 'failures'
+
+    def __init__(self,
+                 vt,            # type: Type[VType]
+                 callback=None  # type: InstrumentationCallback
+                 ):
+        self.vtype = vt
+        self.callback = callback
+        self.calls = dict((k, 0) for k in KINDS)      # type: Dict[str, int]
+        self.time = dict((k, 0.) for k in KINDS)      # type: Dict[str, float]
+        self.failures = dict()                        # type: Dict[str, int]
+
+    def __repr__(self):
+        return 'VTypeStats(%s, calls=%r)' % (self.vtype.__name__, self.calls)
+
+    def snapshot(self):
+        # type: (...) -> Dict[str, Dict[str, Any]]
+        """ Returns a copy of the current statistics, as a dictionary with keys 'calls', 'time' and 'failures' """
+        return dict(calls=dict(self.calls), time=dict(self.time), failures=dict(self.failures))
+
+    def reset(self):
+        """ Resets all counters """
+        for k in KINDS:
+            self.calls[k] = 0
+            self.time[k] = 0.
+        self.failures.clear()
+
+    def install(self):
+        """
+        Replaces the compiled checkers of the VType with instrumented versions. This is automatically called by
+        `VTypeMeta._install_checkers` when the VType is instrumented, each time its checkers are installed.
+        """
+        vt = self.vtype
+        for attr, kind in CHECKERS:
+            check = getattr(vt, attr)
+            if attr == '_value_checker':
+                funcs = vt._validator.raw_functions if vt._validator is not None else ()
+                types = ()
+            elif attr == '_flat_value_checker':
+                funcs, types = vt._flat_funcs, ()
+            elif attr == '_type_checker':
+                funcs, types = (), vt._flat_types
+            else:
+                funcs, types = vt._flat_funcs, vt._flat_types
+            setattr(vt, attr, _checker_attr(self._instrument(kind, check, types, funcs)))
+
+    def _instrument(self,
+                    kind,   # type: str
+                    check,  # type: Optional[Callable[[Any], bool]]
+                    types,  # type: Tuple[Type, ...]
+                    funcs   # type: Tuple[Callable, ...]
+                    ):
+        # type: (...) -> Callable[[Any], bool]
+        """ Returns an instrumented version of checker `check` """
+        if check is None:
+            check = _always_true
+        vt = self.vtype
+        calls, time, failures, callback = self.calls, self.time, self.failures, self.callback
+        timer = default_timer
+
+        def instrumented_check(obj):
+            start = timer()
+            res = check(obj)
+            duration = timer() - start
+            calls[kind] += 1
+            time[kind] += duration
+            if not res:
+                failed = _find_failing_check(types, funcs, obj)
+                failures[failed] = failures.get(failed, 0) + 1
+            if callback is not None:
+                callback(vt, kind, duration, res)
+            return res
+
+        return instrumented_check
+
+
+def instrument(vt,            # type: Type[VType]
+               callback=None  # type: InstrumentationCallback
+               ):
+    # type: (...) -> VTypeStats
+    """
+    Instruments VType `vt`: from now on, the calls to its checks are counted and timed. If `vt` is already
+    instrumented, only its callback is updated.
+
+    :param vt: the VType to instrument
+    :param callback: an optional function `callback(vt, kind, duration, ok)` called after each check, for example to
+        feed a metrics system. `kind` is one of `'isinstance'`, `'validate'`, `'has_valid_type'` or
+        `'has_valid_value'`, `duration` is in seconds and `ok` is the boolean result of the check.
+    :return: the statistics object of `vt`, that is updated with each check.
+    """
+    stats = vt.__dict__.get('_vtype_stats', None)
+    if stats is not None:
+        stats.callback = callback
+    else:
+        stats = VTypeStats(vt, callback=callback)
+        vt._vtype_stats = stats
+        _instrumented.add(vt)
+
+    # make sure that the checkers are compiled (lazy VTypes), and install the instrumentation
+    vt._build_vtype()
+    vt._install_checkers()
+    return stats
+
+
+def uninstrument(vt  # type: Type[VType]
+                 ):
+    """
+    Removes the instrumentation of VType `vt`, if any.
+
+    :param vt:
+    :return:
+    """
+    stats = vt.__dict__.get('_vtype_stats', None)
+    if stats is not None:
+        del vt._vtype_stats
+        _instrumented.discard(vt)
+        vt._install_checkers()
+
+
+def get_stats(vt  # type: Type[VType]
+              ):
+    # type: (...) -> Optional[VTypeStats]
+    """ Returns the statistics of VType `vt`, or `None` if it is not instrumented. """
+    return vt.__dict__.get('_vtype_stats', None)
+
+
+def snapshot():
+    # type: (...) -> Dict[str, Dict[str, Dict[str, Any]]]
+    """
+    Returns a snapshot of the statistics of all instrumented VTypes, by qualified name (`<module>.<qualname>`).
+    See `VTypeStats.snapshot`.
+    """
+    return dict(('%s.%s' % (vt.__module__, getattr(vt, '__qualname__', vt.__name__)), vt._vtype_stats.snapshot())
+                for vt in list(_instrumented))
@@ -0,0 +1,231 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Runtime-configurable check modes, globally or per VType:
+
+ - `'full'` (default): all checks are performed.
+ - `'sampled'`: the validators only run once every `every` checks. The other checks only verify the base types.
+ - `'off'`: the validators never run, only the base types are verified.
+
+```python
+from vtypes.modes import set_check_mode, check_mode, skipped_checks
+
+set_check_mode('sampled', every=1000)        # all VTypes
+set_check_mode('full', vtypes=PaymentAmount)  # except this one (and its subclasses)
+
+with check_mode('off', vtypes=BigPayload):   # scoped override
+    ...
+
+print(skipped_checks())
+```
+
+Modes apply to `isinstance`, `is_valid`, `validate`, and all the checks built on them (containers, records, batch
+checks including on NumPy arrays, streaming checks...), but not to the explicit partial checks `has_valid_type` and
+`has_valid_value`. Since the base types are always verified, `isinstance` can still be used to dispatch on VTypes with
+different base types.
+
+A mode is implemented by replacing the compiled checkers of the VTypes: VTypes in `'full'` mode have no overhead at
+all. Modes are inherited by VType subclasses, and are global to the process (not thread-local): the worker processes
+of `is_valid_parallel` use their own modes.
+"""
+from contextlib import contextmanager
+from weakref import WeakKeyDictionary
+
+from vtypes.core import VType, VTypeMeta, _checker_attr
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Iterator, Optional, Type, Union
+
+
+MODES = ('off', 'full', 'sampled')
+
+# the number of skipped checks (values with valid types, on which the validators did not run) per VType
+_skipped = WeakKeyDictionary()
+
+
+class CheckMode(object):
+    """
+    A check mode: `'off'`, `'full'` or `'sampled'` (the validators run once every `every` checks).
+    """
+    __slots__ = 'mode', 'every'
+
+    def __init__(self,
+                 mode,        # type: str
+                 every=1000   # type: int
+                 ):
+        if mode not in MODES:
+            raise ValueError("mode should be one of %s, found %r" % (MODES, mode))
+        if mode == 'sampled' and every < 1:
+            raise ValueError("every should be a strictly positive integer, found %r" % (every,))
+        self.mode = mode
+        self.every = every
+
+    def __repr__(self):
+        if self.mode == 'sampled':
+            return "CheckMode('sampled', every=%s)" % self.every
+        return 'CheckMode(%r)' % self.mode
+
+    def __eq__(self, other):
+        return isinstance(other, CheckMode) and (self.mode, self.every) == (other.mode, other.every)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.mode, self.every))
+
+    def install(self,
+                vt  # type: Type[VType]
+                ):
+        """
+        Replaces the instance and validate checkers of VType `vt` according to this mode. This is automatically called
+        by `VTypeMeta._install_checkers`.
+        """
+        if self.mode == 'full':
+            return
+
+        try:
+            skipped = _skipped[vt]
+        except KeyError:
+            skipped = _skipped[vt] = [0]
+
+        # note: the compiled type checker is used, so that instrumentation does not count it as a has_valid_type call
+        check_type = vt._compiled_checkers['_type_checker']
+        for attr in ('_instance_checker', '_validate_checker'):
+            check = getattr(vt, attr)
+            if self.mode == 'off':
+                def mode_check(obj, check_type=check_type):
+                    if check_type(obj):
+                        skipped[0] += 1
+                        return True
+                    return False
+            else:
+                # note: the counter and the checkers are bound as default arguments so that each checker has its own
+                def mode_check(obj, check=check, check_type=check_type, count=[0], every=self.every):
+                    count[0] += 1
+                    if count[0] >= every:
+                        count[0] = 0
+                        return check(obj)
+                    elif check_type(obj):
+                        skipped[0] += 1
+                        return True
+                    return False
+
+            setattr(vt, attr, _checker_attr(mode_check))
+
+
+def _iter_with_subclasses(vtypes  # type: Iterable[Type[VType]]
+                          ):
+    # type: (...) -> Iterator[Type[VType]]
+    """ Yields `vtypes` and all their VType subclasses, once """
+    seen = set()
+    todo = list(vtypes)
+    while len(todo) > 0:
+        vt = todo.pop()
+        if vt not in seen:
+            seen.add(vt)
+            yield vt
+            todo.extend(sub for sub in type.__subclasses__(vt) if isinstance(sub, VTypeMeta))
+
+
+def _as_vtypes(vtypes  # type: Union[None, Type[VType], Iterable[Type[VType]]]
+               ):
+    """ Returns a tuple of VTypes from `vtypes` (a VType, an iterable of VTypes, or None meaning all VTypes) """
+    if vtypes is None:
+        return VType,
+    elif isinstance(vtypes, VTypeMeta):
+        return vtypes,
+    vtypes = tuple(vtypes)
+    for vt in vtypes:
+        if not isinstance(vt, VTypeMeta):
+            raise TypeError("vtypes should only contain VTypes, found %r" % (vt,))
+    return vtypes
+
+
+def _apply(modes  # type: Dict[Type[VType], Optional[CheckMode]]
+           ):
+    """ Sets the modes of several VTypes (None removes the mode of a VType), then refreshes their checkers """
+    for vt, mode in modes.items():
+        if mode is None and vt is not VType:
+            if '_check_mode' in vt.__dict__:
+                del vt._check_mode
+        else:
+            vt._check_mode = mode
+
+    for vt in _iter_with_subclasses(modes):
+        if not vt._vtype_pending:
+            vt._install_checkers()
+
+
+def set_check_mode(mode,         # type: str
+                   vtypes=None,  # type: Union[Type[VType], Iterable[Type[VType]]]
+                   every=1000    # type: int
+                   ):
+    """
+    Sets the check mode of `vtypes` (a VType or an iterable of VTypes) and of their subclasses, or the global mode if
+    `vtypes` is None. In the latter case the modes previously set on specific VTypes are kept, use `reset_check_modes`
+    to remove them.
+
+    :param mode: `'off'`, `'full'` or `'sampled'`
+    :param vtypes: a VType or an iterable of VTypes. By default the global mode is set.
+    :param every: in `'sampled'` mode, the validators run once every `every` checks
+    :return:
+    """
+    check_mode = CheckMode(mode, every=every)
+    _apply(dict((vt, check_mode) for vt in _as_vtypes(vtypes)))
+
+
+def get_check_mode(vt=VType  # type: Type[VType]
+                   ):
+    # type: (...) -> CheckMode
+    """ Returns the check mode of VType `vt` (inherited or set on it). By default the global mode is returned. """
+    return vt._check_mode or CheckMode('full')
+
+
+def reset_check_modes():
+    """ Removes all check modes: all VTypes are back to `'full'` mode. """
+    _apply(dict((vt, None) for vt in _iter_with_subclasses((VType,)) if '_check_mode' in vt.__dict__))
+
+
+@contextmanager
+def check_mode(mode,         # type: str
+               vtypes=None,  # type: Union[Type[VType], Iterable[Type[VType]]]
+               every=1000    # type: int
+               ):
+    """
+    A context manager setting the check mode of `vtypes` (or the global mode) inside the block, and restoring the
+    previous modes on exit. See `set_check_mode`.
+
+    :param mode: `'off'`, `'full'` or `'sampled'`
+    :param vtypes: a VType or an iterable of VTypes. By default the global mode is set.
+    :param every: in `'sampled'` mode, the validators run once every `every` checks
+    :return:
+    """
+    vtypes = _as_vtypes(vtypes)
+    previous = dict((vt, vt.__dict__.get('_check_mode', None)) for vt in vtypes)
+    set_check_mode(mode, vtypes, every=every)
+    try:
+        yield
+    finally:
+        _apply(previous)
+
+
+def skipped_checks(vt=None  # type: Type[VType]
+                   ):
+    # type: (...) -> Union[int, Dict[Type[VType], int]]
+    """
+    Returns the number of checks of VType `vt` for which validators were skipped because of its check mode, or a
+    dictionary of these numbers for all VTypes if `vt` is None.
+    """
+    if vt is None:
+        return dict((v, skipped[0]) for v, skipped in _skipped.items())
+    skipped = _skipped.get(vt, None)
+    return skipped[0] if skipped is not None else 0
+
+
+def reset_skipped_checks():
+    """ Resets the counters of skipped checks """
+    for skipped in _skipped.values():
+        skipped[0] = 0
@@ -0,0 +1,126 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Parallel bulk validation. The input is split in chunks, that are checked with `is_valid_many` in a
+`concurrent.futures` process or thread pool. Results are merged in input order.
+
+With a process pool, the VType is sent to the workers by reference (module and name) if it is defined at the top level
+of a module, and by definition otherwise (see `VTypeMeta.__reduce__`). In that case its validators should be picklable
+(declarative validators or module-level functions, not lambdas).
+
+Note: on python 2, the `futures` backport is required.
+"""
+import os
+import sys
+from collections import deque, namedtuple
+from itertools import chain, islice
+
+from vtypes.batch import is_valid_many
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Type, Union
+    from concurrent.futures import Executor
+    import numpy as np
+
+
+BulkResult = namedtuple('BulkResult', ('mask', 'invalid_indices'))
+BulkResult.__doc__ = """
+The result of `is_valid_parallel`: the boolean mask of valid elements, and the indices of the invalid elements, both in
+input order. If the input is a NumPy array, both are NumPy arrays (the mask has the same shape as the input, and the
+indices are indices in the flattened input). Otherwise they are lists.
+"""
+
+# default chunk size when the input length is unknown
+DEFAULT_CHUNKSIZE = 10000
+
+
+def _check_picklable(vt  # type: Type
+                     ):
+    """ Raises a `ValueError` if `vt` can not be sent to worker processes """
+    from pickle import dumps
+    try:
+        dumps(vt)
+    except Exception as e:
+        raise ValueError("VType %r can not be sent to worker processes since it can not be pickled: %r. Please define "
+                         "it at the top level of a module, use picklable validators, or use executor='thread'"
+                         % (vt, e))
+
+
+def _iter_chunks(values,    # type: Iterable[Any]
+                 chunksize  # type: int
+                 ):
+    """ Splits `values` in chunks. Sequences and NumPy arrays are sliced, other iterables are consumed lazily. """
+    try:
+        n = len(values)
+        values[0:0]
+    except (TypeError, KeyError):
+        # not sliceable (sets, dict views...), or a mapping (slicing raises a KeyError on python 3.12+)
+        it = iter(values)
+        while True:
+            chunk = list(islice(it, chunksize))
+            if len(chunk) == 0:
+                return
+            yield chunk
+    else:
+        for start in range(0, n, chunksize):
+            yield values[start:start + chunksize]
+
+
+def is_valid_parallel(vt,                  # type: Type
+                      values,              # type: Union[Iterable[Any], np.ndarray]
+                      executor='process',  # type: Union[str, Executor]
+                      max_workers=None,    # type: int
+                      chunksize=None       # type: int
+                      ):
+    # type: (...) -> BulkResult
+    """
+    Implementation of `VTypeMeta.is_valid_parallel`.
+    """
+    if max_workers is None:
+        # the number of workers of an existing executor is not public: the number of cpus is used for chunking
+        max_workers = os.cpu_count() if hasattr(os, 'cpu_count') else None
+        max_workers = max_workers or 1
+
+    if executor in ('process', 'thread'):
+        if executor == 'process':
+            _check_picklable(vt)
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        executor_type = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        with executor_type(max_workers=max_workers) as pool:
+            return is_valid_parallel(vt, values, executor=pool, max_workers=max_workers, chunksize=chunksize)
+
+    np = sys.modules.get('numpy')
+    is_array = np is not None and isinstance(values, np.ndarray)
+    if is_array:
+        shape = values.shape
+        values = values.ravel()
+
+    if chunksize is None:
+        try:
+            # about 4 chunks per worker, for load balancing
+            chunksize = max(1, -(-len(values) // (4 * max_workers)))
+        except TypeError:
+            chunksize = DEFAULT_CHUNKSIZE
+    elif chunksize < 1:
+        raise ValueError("chunksize should be a strictly positive integer, found %r" % (chunksize,))
+
+    # submit the chunks, with a bounded number of pending ones so that memory usage stays bounded with generators
+    max_pending = 2 * max_workers
+    pending = deque()
+    masks = []
+    for chunk in _iter_chunks(values, chunksize):
+        pending.append(executor.submit(is_valid_many, vt, chunk))
+        if len(pending) >= max_pending:
+            masks.append(pending.popleft().result())
+    while len(pending) > 0:
+        masks.append(pending.popleft().result())
+
+    # merge in input order
+    if is_array:
+        mask = np.concatenate(masks) if len(masks) > 0 else np.ones((0,), dtype=bool)
+        return BulkResult(mask.reshape(shape), np.flatnonzero(~mask))
+    else:
+        mask = list(chain.from_iterable(masks))
+        return BulkResult(mask, [i for i, b in enumerate(mask) if not b])
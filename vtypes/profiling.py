@@ -0,0 +1,248 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Profiling of individual validators. Inside a `profile_validators()` block, each validation function of the selected
+VTypes (all VTypes by default) records its number of calls, cumulative time and number of rejections:
+
+```python
+from vtypes.profiling import profile_validators
+
+with profile_validators(PositiveInt, NonEmptyStr) as profiler:
+    run_workload()
+
+print(profiler.report())
+```
+
+The raw validation functions of the `VTypeValidator`s are temporarily replaced with profiled wrappers, and the compiled
+checkers of the VTypes (and of their VType subclasses) are rebuilt. Calls made from a subclass are attributed to the
+VType declaring the validator. Only the boolean checks are profiled (`isinstance`, `is_valid`, `has_valid_value`, batch
+and streaming checks...), not the error-reporting path of `validate`, nor the evaluation of vectorizable validators on
+whole NumPy arrays. VTypes created inside the block are not profiled.
+"""
+from collections import deque
+from timeit import default_timer
+
+from valid8.base import NP_TRUE
+from valid8.common_syntax import make_validation_func_callables
+
+from vtypes.core import VType, VTypeMeta
+from vtypes.vtype_validator import VTypeValidator, make_value_checker
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, List, Tuple, Type
+
+
+class ValidatorProfile(object):
+    """
+    The profiling results of a validation function of a VType: number of `calls`, number of `rejections` (the
+    validator returned a falsy value or raised an exception) and cumulative `total_time` (in seconds).
+    """
+    __slots__ = 'vtype', 'name', 'calls', 'rejections', 'total_time'
+
+    def __init__(self,
+                 vt,    # type: Type[VType]
+                 name   # type: str
+                 ):
+        self.vtype = vt
+        self.name = name
+        self.calls = 0
+        self.rejections = 0
+        self.total_time = 0.
+
+    def __repr__(self):
+        return 'ValidatorProfile(%s.%s, calls=%s, rejections=%s, total_time=%s)' \
+               % (self.vtype.__name__, self.name, self.calls, self.rejections, self.total_time)
+
+    @property
+    def mean_time(self):
+        # type: (...) -> float
+        """ The mean time per call in seconds, or 0. if the validator was never called """
+        return self.total_time / self.calls if self.calls > 0 else 0.
+
+    @property
+    def rejection_rate(self):
+        # type: (...) -> float
+        """ The ratio of calls that rejected the value, or 0. if the validator was never called """
+        return self.rejections / float(self.calls) if self.calls > 0 else 0.
+
+
+def _identity_creator(validation_callable, help_msg=None, failure_type=None):
+    """ A `callable_creator` for `make_validation_func_callables` returning the validation callables unchanged """
+    return validation_callable
+
+
+def _validator_name(f  # type: Callable
+                    ):
+    # type: (...) -> str
+    """ Returns a human-readable name for validation callable `f` """
+    name = getattr(f, '__name__', None)
+    return name if isinstance(name, str) else str(f)
+
+
+def _make_profiled(f,       # type: Callable
+                   profile  # type: ValidatorProfile
+                   ):
+    # type: (...) -> Callable
+    """ Returns a wrapper of raw validation function `f` recording its calls in `profile` """
+    timer = default_timer
+
+    def profiled(obj):
+        start = timer()
+        try:
+            res = f(obj)
+        except Exception:
+            profile.total_time += timer() - start
+            profile.calls += 1
+            profile.rejections += 1
+            raise
+        profile.total_time += timer() - start
+        profile.calls += 1
+        if not ((res is None) or (res is True) or (res is NP_TRUE)):
+            profile.rejections += 1
+        return res
+
+    # keep the vectorized version if any, so that batch checks on arrays are not slowed down (see `vtypes.batch`)
+    check_array = getattr(f, 'check_array', None)
+    if check_array is not None:
+        profiled.check_array = check_array
+    return profiled
+
+
+def _all_vtypes():
+    # type: (...) -> List[Type[VType]]
+    """ Returns all VTypes currently defined, in creation order of the hierarchy (parents first) """
+    res = []
+    seen = set()
+    todo = deque((VType,))
+    while len(todo) > 0:
+        vt = todo.popleft()
+        if vt not in seen:
+            seen.add(vt)
+            res.append(vt)
+            todo.extend(sub for sub in type.__subclasses__(vt) if isinstance(sub, VTypeMeta))
+    return res
+
+
+def format_report(profiles,      # type: Iterable[ValidatorProfile]
+                  sort='total'   # type: str
+                  ):
+    # type: (...) -> str
+    """
+    Formats profiling results as a text table, one line per validator.
+
+    :param profiles: the profiles to report, for example `profiler.results()`
+    :param sort: the sort order, one of 'total' (total time, descending, the default), 'mean' (mean time,
+        descending), 'calls' (descending), 'rejections' (rejection rate, descending) or 'name'.
+    :return:
+    """
+    keys = {'total': lambda p: -p.total_time,
+            'mean': lambda p: -p.mean_time,
+            'calls': lambda p: -p.calls,
+            'rejections': lambda p: -p.rejection_rate,
+            'name': lambda p: (p.vtype.__name__, p.name)}
+    try:
+        key = keys[sort]
+    except KeyError:
+        raise ValueError("sort should be one of %s, found %r" % (sorted(keys), sort))
+
+    rows = [('validator', 'calls', 'total (ms)', 'mean (us)', 'rejected')]
+    for p in sorted(profiles, key=key):
+        rows.append(('%s.%s' % (p.vtype.__name__, p.name), '%d' % p.calls, '%.3f' % (p.total_time * 1e3),
+                     '%.3f' % (p.mean_time * 1e6), '%.1f%%' % (p.rejection_rate * 100)))
+
+    widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+    lines = ['  '.join([r[0].ljust(widths[0])] + [c.rjust(w) for c, w in zip(r[1:], widths[1:])]) for r in rows]
+    lines.insert(1, '-' * len(lines[0]))
+    return '\n'.join(lines)
+
+
+class ValidatorsProfiler(object):
+    """
+    The context manager returned by `profile_validators`. The profiles are available during and after the block with
+    `results()`, and can be formatted with `report()`.
+    """
+    __slots__ = '_vtypes', '_profiles', '_originals'
+
+    def __init__(self,
+                 vtypes  # type: Tuple[Type[VType], ...]
+                 ):
+        self._vtypes = vtypes
+        self._profiles = []    # type: List[ValidatorProfile]
+        self._originals = []
+
+    def __enter__(self):
+        if len(self._originals) > 0:
+            raise ValueError("This profiler is already active")
+
+        vtypes = self._vtypes if len(self._vtypes) > 0 else _all_vtypes()
+        for vt in vtypes:
+            vt._build_vtype()
+            validator = vt._validator
+            if validator is None:
+                continue
+
+            # the raw functions are in the same order than the validation callables in the definition
+            originals = make_validation_func_callables(*vt.__validators__, callable_creator=_identity_creator)
+            wrappers = []
+            for f, raw_f in zip(originals, validator.raw_functions):
+                profile = ValidatorProfile(vt, _validator_name(f))
+                self._profiles.append(profile)
+                wrappers.append(_make_profiled(raw_f, profile))
+
+            # the validator may be shared with other VTypes: a private copy is profiled instead
+            profiled = VTypeValidator(validator.validators, help_msg=vt.__help_msg__, error_type=vt.__error_type__)
+            profiled.raw_functions = tuple(wrappers)
+            profiled.value_checker = make_value_checker(profiled.raw_functions)
+            self._originals.append((vt, validator))
+            vt._validator = profiled
+
+        self._refresh()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for vt, validator in self._originals:
+            vt._validator = validator
+        self._refresh()
+        del self._originals[:]
+
+    def _refresh(self):
+        """ Recompiles the checkers of the profiled VTypes. `init_vtype` also refreshes subclasses, so only the
+        VTypes without any profiled ancestor are initialized. """
+        profiled = set(vt for vt, _ in self._originals)
+        for vt in profiled:
+            if not any(v in profiled for v in vt.__mro__[1:]):
+                vt.init_vtype()
+
+    def results(self):
+        # type: (...) -> List[ValidatorProfile]
+        """ Returns the profiles of all validators of the profiled VTypes """
+        return list(self._profiles)
+
+    def report(self,
+               sort='total'  # type: str
+               ):
+        # type: (...) -> str
+        """ Returns a text report of the results. See `format_report`. """
+        return format_report(self._profiles, sort=sort)
+
+
+def profile_validators(*vtypes  # type: Type[VType]
+                       ):
+    # type: (...) -> ValidatorsProfiler
+    """
+    Returns a context manager profiling the validation functions of `vtypes` (all VTypes currently defined if none is
+    provided) while the block is executed. Per-validator call counts, total and mean time and rejection rates are
+    available with `profiler.results()` and `profiler.report()`.
+
+    The profiling wrappers are installed on the VTypes themselves, so checks performed concurrently in other
+    threads are profiled too. Counters are not protected by a lock.
+
+    :param vtypes: the VTypes to profile. By default all VTypes are profiled.
+    :return:
+    """
+    for vt in vtypes:
+        if not isinstance(vt, VTypeMeta):
+            raise TypeError("profile_validators only accepts VTypes, found %r" % (vt,))
+    return ValidatorsProfiler(vtypes)
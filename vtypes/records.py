@@ -0,0 +1,174 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Record VTypes, to validate dict payloads field by field with a single precompiled checker:
+
+```python
+from vtypes.records import record
+
+Person = record('Person', {'name': NonEmptyStr, 'age': PositiveInt, 'email': str}, optional=('email',))
+assert isinstance({'name': 'alice', 'age': 12}, Person)
+Person.validate('person', {'name': '', 'age': -1})  # a single error listing both invalid fields
+```
+
+Importing this module imports valid8.
+"""
+from valid8 import ValidationError, ValidationFailure
+
+from vtypes.core import VTypeMeta, vtype, get_caller_module_name
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, Type
+    from vtypes.core import VType
+
+
+class InvalidFields(ValidationFailure):
+    """
+    Raised by the validator of `record` VTypes when one or several fields are missing, invalid, or unexpected. The
+    `errors` attribute is a dictionary containing an error message for each failing field.
+    """
+    help_msg = "Invalid fields: {details}"
+
+    # the details list all failing fields, they should not be replaced with '(too big for display)'
+    __max_str_length_displayed__ = 2000
+
+    def __init__(self,
+                 wrong_value,  # type: Any
+                 errors,       # type: Dict[str, str]
+                 **kwargs):
+        details = '; '.join('[%s] %s' % (k, e) for k, e in errors.items())
+        super(InvalidFields, self).__init__(wrong_value=wrong_value, errors=errors, details=details,
+                                            append_details=False, **kwargs)
+
+
+class FieldsValidator(object):
+    """
+    The validation callable of `record` VTypes. Calling it raises an `InvalidFields` failure listing all failing
+    fields, while its `is_valid` method (used by the compiled checkers of the VType, as `__vtypes_raw_check__`) is a
+    boolean check stopping at the first failing field, without creating any failure.
+    """
+    __slots__ = 'fields', 'optional', 'allow_extra', 'is_valid'
+
+    def __init__(self,
+                 fields,           # type: Dict[str, Type]
+                 optional=(),      # type: Iterable[str]
+                 allow_extra=True  # type: bool
+                 ):
+        optional = frozenset(optional)
+        unknown = optional.difference(fields)
+        if len(unknown) > 0:
+            raise ValueError("Optional fields %s are not in the fields definition" % sorted(unknown))
+
+        self.fields = dict(fields)
+        self.optional = optional
+        self.allow_extra = allow_extra
+        self.is_valid = self._compile()
+
+    @property
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        return 'fields_are_valid'
+
+    @property
+    def __vtypes_raw_check__(self):
+        """ The boolean check used by the compiled checkers of the VType (see `vtypes.vtype_validator`) """
+        return self.is_valid
+
+    def __reduce__(self):
+        # the compiled checker is not picklable, it is recreated
+        return FieldsValidator, (self.fields, self.optional, self.allow_extra)
+
+    def __repr__(self):
+        return '%s(%r, optional=%r, allow_extra=%r)' % (type(self).__name__, self.fields, sorted(self.optional),
+                                                        self.allow_extra)
+
+    def _compile(self):
+        """ Creates the boolean checker for records """
+        fields, opt = self.fields, self.optional
+        # standard types are checked first, with a plain isinstance: this is the cheapest check
+        required = tuple((k, t) for k, t in fields.items() if k not in opt and not isinstance(t, VTypeMeta))
+        required_vt = tuple((k, t) for k, t in fields.items() if k not in opt and isinstance(t, VTypeMeta))
+        optional = tuple((k, t, isinstance(t, VTypeMeta)) for k, t in fields.items() if k in opt)
+        field_names = frozenset(fields)
+        allow_extra = self.allow_extra
+
+        def is_valid(x):
+            try:
+                for k, t in required:
+                    if not isinstance(x[k], t):
+                        return False
+                # looked up at each call, see `VTypeMeta.init_vtype`
+                for k, t in required_vt:
+                    if not t._instance_checker(x[k]):
+                        return False
+            except KeyError:
+                return False
+            if optional:
+                for k, t, is_vt in optional:
+                    if k in x:
+                        v = x[k]
+                        if not (t._instance_checker(v) if is_vt else isinstance(v, t)):
+                            return False
+            return allow_extra or field_names.issuperset(x)
+
+        return is_valid
+
+    def __call__(self, x):
+        if self.is_valid(x):
+            return True
+
+        # collect all errors
+        errors = dict()
+        for k, t in self.fields.items():
+            try:
+                v = x[k]
+            except KeyError:
+                if k not in self.optional:
+                    errors[k] = "missing required field"
+                continue
+            if isinstance(t, VTypeMeta):
+                try:
+                    t.validate(k, v)
+                except ValidationError as e:
+                    errors[k] = str(e)
+            elif not isinstance(v, t):
+                errors[k] = "should be an instance of %r, found %r" % (t, v)
+
+        if not self.allow_extra:
+            for k in x:
+                if k not in self.fields:
+                    errors[k] = "unexpected field"
+
+        raise InvalidFields(x, errors)
+
+
+def record(name,              # type: str
+           fields,            # type: Dict[str, Type]
+           optional=(),       # type: Iterable[str]
+           allow_extra=True,  # type: bool
+           help_msg=None,     # type: str
+           error_type=None,   # type: Type[ValidationError]
+           doc=None,          # type: str
+           module=None        # type: str
+           ):
+    # type: (...) -> Type[VType]
+    """
+    Creates a VType for dict records, mapping each field name to its type (a VType or a standard type). All fields
+    are checked by a single precompiled checker, and `validate` raises a single error listing all failing fields.
+
+    :param name: the name of the VType to create
+    :param fields: a dictionary of field names to VTypes or standard types
+    :param optional: the names of the optional fields. Optional fields are checked only when they are present.
+    :param allow_extra: a boolean indicating if records may contain fields that are not in `fields` (default True).
+    :param help_msg: an optional help message for the errors raised by `validate`
+    :param error_type: an optional error type for the errors raised by `validate`
+    :param doc: an optional docstring for the created VType
+    :param module: the name of the module where the VType is created. If `None` (default), the caller's module is used.
+    :return:
+    """
+    if module is None:
+        module = get_caller_module_name()
+    return vtype(name, dict, FieldsValidator(fields, optional=optional, allow_extra=allow_extra),
+                 help_msg=help_msg, error_type=error_type, doc=doc, module=module)
@@ -0,0 +1,141 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+Registries interning VTypes: creating a VType through a registry with the same definition (base types, validators,
+help message, error type and async validators) than an already registered one returns the existing class, instead
+of creating a new class and a new validator. This saves memory and makes `isinstance` caches more effective when
+schemas with many identical fields are loaded.
+
+```python
+from vtypes import VTypeRegistry
+
+registry = VTypeRegistry()
+Age = registry.vtype('Age', int, gt(0))
+assert registry.vtype('Age', int, gt(0)) is Age
+assert registry.get('Age') is Age
+```
+"""
+from vtypes.core import RLock, vtype, get_caller_module_name
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Hashable, Tuple, Type, Union
+    from valid8 import ValidationError
+    from valid8.common_syntax import ValidationFuncs
+    from vtypes.cache import LRU
+    from vtypes.core import VType
+
+
+def _freeze(obj  # type: Any
+            ):
+    # type: (...) -> Hashable
+    """
+    Returns a canonical hashable representation of `obj`, a definition element in valid8 syntax. Lists and dicts
+    are converted to tagged tuples, preserving their order since the order of validators matters.
+    """
+    if isinstance(obj, dict):
+        return '__dict__', tuple((_freeze(k), _freeze(v)) for k, v in obj.items())
+    elif isinstance(obj, list):
+        return '__list__', tuple(_freeze(o) for o in obj)
+    elif isinstance(obj, tuple):
+        return tuple(_freeze(o) for o in obj)
+    elif isinstance(obj, set):
+        return frozenset(obj)
+    else:
+        return obj
+
+
+class VTypeRegistry(object):
+    """
+    A registry of VTypes, interning them by definition. Use `registry.vtype(...)` instead of `vtype(...)` to create
+    VTypes through the registry. A registry is thread-safe.
+
+    The definition used as key is made of the base types, validators, help message, error type and async validators.
+    Validation callables are compared by identity, except for declarative validators (`vtypes.validators`) that are
+    compared by value. The name, module, docstring, cache, lazy, adaptive and codegen flags of a VType are not part of
+    the definition: they are the ones of the first created VType. VTypes whose definition is not hashable are not
+    interned.
+    """
+    __slots__ = '_by_definition', '_by_name', '_lock'
+
+    def __init__(self):
+        self._by_definition = dict()  # type: Dict[Hashable, Type[VType]]
+        self._by_name = dict()        # type: Dict[Tuple[str, str], Type[VType]]
+        self._lock = RLock()
+
+    def __len__(self):
+        """ Returns the number of interned definitions in the registry """
+        return len(self._by_definition)
+
+    def vtype(self,
+              name,                  # type: str
+              base=(),               # type: Union[Type, Tuple[Type]]
+              validators=(),         # type: ValidationFuncs
+              help_msg=None,         # type: str
+              error_type=None,       # type: Type[ValidationError]
+              doc=None,              # type: str
+              cache=None,            # type: LRU
+              module=None,           # type: str
+              lazy=False,            # type: bool
+              async_validators=None,  # type: Any
+              adaptive=False,        # type: bool
+              codegen=False          # type: bool
+              ):
+        # type: (...) -> Type[VType]
+        """
+        Same as `vtype()`, except that if a VType with the same definition was already created through this registry,
+        it is returned instead of creating a new one. In all cases, the returned VType is registered under
+        `(module, name)` so that it can be found with `get`.
+
+        See `vtype()` for the parameters.
+        """
+        if module is None:
+            module = get_caller_module_name()
+
+        bases = base if isinstance(base, tuple) else (base, )
+        key = (bases, _freeze(validators), help_msg, error_type, _freeze(async_validators))
+        try:
+            hash(key)
+        except TypeError:
+            # an element of the definition is not hashable: can not intern
+            key = None
+
+        with self._lock:
+            vt = self._by_definition.get(key, None) if key is not None else None
+            if vt is None:
+                vt = vtype(name, base, validators, help_msg=help_msg, error_type=error_type, doc=doc, cache=cache,
+                           module=module, lazy=lazy, async_validators=async_validators, adaptive=adaptive,
+                           codegen=codegen)
+                if key is not None:
+                    self._by_definition[key] = vt
+            self._by_name[(module, name)] = vt
+
+        return vt
+
+    def get(self,
+            name,        # type: str
+            module=None  # type: str
+            ):
+        # type: (...) -> Type[VType]
+        """
+        Returns the VType registered with `name` in `module`.
+
+        :param name: the name used when the VType was created
+        :param module: the module name used when the VType was created. By default the caller's module is used.
+        :return:
+        :raises KeyError: if no VType is registered with this name in this module
+        """
+        if module is None:
+            module = get_caller_module_name()
+        return self._by_name[(module, name)]
+
+    def clear(self):
+        """ Removes all VTypes from the registry. Already created VTypes are not modified. """
+        with self._lock:
+            self._by_definition.clear()
+            self._by_name.clear()
+
+
+# a global registry, for applications that do not need separate registries
+default_registry = VTypeRegistry()
@@ -0,0 +1,11 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import sys
+
+# async validation tests use the async/await syntax
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 7) else []
+
+# argument validation tests use annotations
+if sys.version_info < (3, 0):
+    collect_ignore.append('test_decorators.py')
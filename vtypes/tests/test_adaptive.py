@@ -0,0 +1,63 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import time
+
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype, reorderable, VType
+from vtypes import adaptive
+from vtypes.validators import length_between
+
+
+def test_adaptive_reordering(monkeypatch):
+    """Tests that reorderable validators are reordered by cost and selectivity after the learning phase"""
+
+    monkeypatch.setattr(adaptive, 'LEARNING_CALLS', 20)
+    calls = []
+
+    @reorderable
+    def is_not_reserved(x):
+        """ an expensive validator that never rejects the values of this test """
+        calls.append(x)
+        time.sleep(0.0001)
+        return x not in ('admin', 'root')
+
+    def no_side_effects_not_guaranteed(x):
+        return True
+
+    Username = vtype('Username', str, [no_side_effects_not_guaranteed, is_not_reserved, length_between(3, 5)],
+                     adaptive=True)
+
+    values = ['ab', 'abcd', 'abcdefgh'] * 7
+    assert [isinstance(v, Username) for v in values] == [len(v) == 4 for v in values]
+
+    # learning is over: the cheap and selective length check is now first, the non-reorderable function did not move
+    funcs, ordered = Username._adaptive_order
+    assert ordered == (funcs[0], funcs[2], funcs[1])
+    del calls[:]
+    assert [isinstance(v, Username) for v in values] == [len(v) == 4 for v in values]
+    assert calls == ['abcd'] * 7
+
+    # validate still reports the errors in declaration order
+    with pytest.raises(ValidationError) as exc_info:
+        Username.validate('name', 'root')
+    assert 'is_not_reserved' in str(exc_info.value)
+    with pytest.raises(ValidationError) as exc_info:
+        Username.validate('name', 'a')
+    assert 'length_between' in str(exc_info.value)
+
+    # subclasses are adaptive too
+    class Short(Username):
+        __validators__ = lambda x: len(x) < 5
+    assert Short.__adaptive__
+    assert isinstance('abcd', Short)
+
+
+def test_not_adaptive():
+    """Tests that VTypes are not adaptive by default"""
+    assert not VType.__adaptive__
+    V = vtype('V', str, [length_between(3, 5), lambda x: x != 'foo'])
+    assert '_adaptive_order' not in V.__dict__
@@ -0,0 +1,78 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import asyncio
+
+import pytest
+from valid8 import ValidationError
+
+from vtypes import vtype, VType
+
+
+KNOWN_IDS = {1, 2, 3, 4}
+
+
+async def id_exists(x):
+    await asyncio.sleep(0)
+    return x in KNOWN_IDS
+
+
+def test_avalidate():
+    """Tests that async validators are run by avalidate only, after the synchronous checks"""
+
+    PositiveInt = vtype('PositiveInt', int, lambda x: x >= 0)
+
+    class KnownId(PositiveInt):
+        __async_validators__ = {'should be a known id': id_exists}
+
+    assert KnownId._flat_async_validators == ((id_exists, 'should be a known id'),)
+
+    # the synchronous fast path ignores async validators
+    assert isinstance(5, KnownId)
+    KnownId.validate('x', 5)
+
+    asyncio.run(KnownId.avalidate('x', 1))
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(KnownId.avalidate('x', 5))
+    assert 'should be a known id' in str(exc_info.value)
+    assert 'id_exists' in str(exc_info.value)
+    with pytest.raises(ValidationError):
+        asyncio.run(KnownId.avalidate('x', -1))
+
+    # async validators are inherited, and exceptions are failures
+    async def fails(x):
+        raise ValueError("oops")
+
+    Strict = vtype('Strict', KnownId, async_validators=fails)
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(Strict.avalidate('x', 1))
+    assert isinstance(exc_info.value.__cause__.__cause__, ValueError)
+    assert issubclass(Strict, VType)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_avalidate_many(concurrency):
+    """Tests that the first invalid element in input order is reported, with a bounded concurrency"""
+
+    running = []
+    max_running = []
+
+    async def known_id(x):
+        running.append(x)
+        max_running.append(len(running))
+        await asyncio.sleep(0.001 * (5 - x))
+        running.remove(x)
+        return x in KNOWN_IDS
+
+    KnownId = vtype('KnownId', int, async_validators=known_id)
+
+    asyncio.run(KnownId.avalidate_many('x', [1, 2, 3, 4, 1, 2], concurrency=concurrency))
+    assert max(max_running) == concurrency
+
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(KnownId.avalidate_many('x', iter([1, 2, 0, 5, 'a']), concurrency=concurrency))
+    assert exc_info.value.var_name == 'x[2]'
+
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(KnownId.avalidate_many('x', [1, 'a', 0], concurrency=concurrency))
+    assert exc_info.value.var_name == 'x[1]'
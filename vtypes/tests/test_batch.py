@@ -0,0 +1,123 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+from valid8 import ValidationError
+
+from vtypes import vtype, vectorizable
+
+
+def test_is_valid_many_iterable():
+    """Tests `is_valid_many` and `validate_many` on plain iterables"""
+
+    PositiveInt = vtype('PositiveInt', int, {'should be positive': lambda x: x >= 0})
+
+    assert PositiveInt.is_valid_many([1, -1, '1', 0]) == [True, False, False, True]
+    assert PositiveInt.is_valid_many(iter([])) == []
+
+    PositiveInt.validate_many('x', (i for i in range(5)))
+    with pytest.raises(ValidationError) as exc_info:
+        PositiveInt.validate_many('x', [1, 2, -1, -2])
+    assert exc_info.value.var_name == 'x[2]'
+
+
+@pytest.mark.parametrize("vectorized", [False, True], ids="vectorized={}".format)
+def test_is_valid_many_numpy(vectorized):
+    """Tests `is_valid_many` and `validate_many` on numpy arrays, with and without vectorizable validators"""
+
+    np = pytest.importorskip("numpy")
+
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x >= 0
+
+    validators = [vectorizable(is_positive) if vectorized else is_positive, np.isfinite]
+    PositiveFloat = vtype('PositiveFloat', float, validators)
+
+    arr = np.array([[1., -1.], [np.inf, 0.]])
+    mask = PositiveFloat.is_valid_many(arr)
+    assert mask.dtype == bool
+    assert mask.tolist() == [[True, False], [False, True]]
+
+    if vectorized:
+        # a single call on the whole array
+        assert len(calls) == 1
+    else:
+        # np.isfinite was evaluated first on the array, only the finite elements are checked with python
+        assert calls == [1., -1., 0.]
+
+    with pytest.raises(ValidationError) as exc_info:
+        PositiveFloat.validate_many('x', arr)
+    assert exc_info.value.var_name == 'x[1]'
+
+    # dtype not compliant with the base type: per-element check on python scalars
+    assert PositiveFloat.is_valid_many(np.array([1, 2])).tolist() == [False, False]
+
+    # object dtype
+    assert PositiveFloat.is_valid_many(np.array([1., 'a', -2.], dtype=object)).tolist() == [True, False, False]
+
+    # inherited validators are taken into account
+    SmallPositiveFloat = vtype('SmallPositiveFloat', PositiveFloat, vectorizable(lambda x: x < 10))
+    assert SmallPositiveFloat.is_valid_many(np.array([1., 11., -1.])).tolist() == [True, False, False]
+
+
+def test_validate_many_numpy_inconsistent():
+    """Tests that `validate_many` reports all the elements rejected by the vectorized checks, or an explicit error"""
+
+    np = pytest.importorskip("numpy")
+
+    # the vectorized version also rejects 1, that the scalar version accepts
+    PositiveInt = vtype('PositiveInt', int, vectorizable(lambda x: x >= 0, check_array=lambda a: a >= 2))
+    with pytest.raises(ValidationError) as exc_info:
+        PositiveInt.validate_many('x', np.array([2, 1, -1]))
+    assert exc_info.value.var_name == 'x[2]'
+
+    with pytest.raises(ValueError) as exc_info:
+        PositiveInt.validate_many('x', np.array([2, 1, 0]))
+    assert not isinstance(exc_info.value, ValidationError)
+    assert "[1, 2]" in str(exc_info.value)
+
+
+def test_streaming():
+    """Tests `filter` and `iter_validated` on generators"""
+
+    from collections import deque
+    from vtypes.batch import InvalidItem
+
+    def is_positive(x):
+        return x >= 0
+
+    PositiveInt = vtype('PositiveInt', int, is_positive)
+
+    def stream():
+        for v in (1, -1, 'a' * 200, 2):
+            yield v
+
+    assert list(PositiveInt.filter(stream())) == [1, 2]
+    assert list(PositiveInt.iter_validated(stream(), on_error='skip')) == [1, 2]
+
+    errors = []
+    assert list(PositiveInt.iter_validated(stream(), on_error='collect', errors=errors)) == [1, 2]
+    assert errors[0] == InvalidItem(1, '-1', 'is_positive')
+    assert errors[1].index == 2
+    assert errors[1].validator == 'isinstance(x, int)'
+    assert len(errors[1].value_repr) == 100
+
+    # bounded error collection
+    errors = deque(maxlen=1)
+    assert list(PositiveInt.iter_validated(stream(), on_error='collect', errors=errors)) == [1, 2]
+    assert [e.index for e in errors] == [2]
+
+    # lazily raise on the first invalid element
+    it = PositiveInt.iter_validated(stream(), name='x')
+    assert next(it) == 1
+    with pytest.raises(ValidationError) as exc_info:
+        next(it)
+    assert exc_info.value.var_name == 'x[1]'
+
+    with pytest.raises(ValueError):
+        PositiveInt.iter_validated([], on_error='collect')
+    with pytest.raises(ValueError):
+        PositiveInt.iter_validated([], on_error='foo')
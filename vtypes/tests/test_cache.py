@@ -0,0 +1,77 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+from valid8 import ValidationError
+
+from vtypes import vtype, VType, LRU
+
+
+@pytest.mark.parametrize("maxsize", [2, None], ids="maxsize={}".format)
+def test_lru_cache(maxsize):
+    """Tests the memoization of checks with `LRU`"""
+
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x >= 0
+
+    cache = LRU(maxsize=maxsize)
+    PositiveInt = vtype('PositiveInt', int, is_positive, cache=cache)
+    assert PositiveInt.__cache__ is cache
+
+    assert isinstance(1, PositiveInt)
+    assert isinstance(1, PositiveInt)
+    assert PositiveInt.is_valid(1)
+    PositiveInt.validate('x', 1)
+    assert calls == [1]
+    assert cache.cache_info() == (3, 1, maxsize, 1)
+
+    # has_valid_value has its own entries
+    assert not PositiveInt.has_valid_value(-1)
+    assert not PositiveInt.has_valid_value(-1)
+    assert calls == [1, -1]
+
+    # the type is part of the key
+    assert not isinstance(True, PositiveInt) or calls == [1, -1, True]
+
+    # eviction
+    assert not isinstance(-2, PositiveInt)
+    if maxsize is not None:
+        assert len(cache) == 2
+        assert isinstance(1, PositiveInt)
+        assert calls[-1] == 1
+    else:
+        assert len(cache) == 4
+
+    # unhashable values are not cached
+    assert not isinstance([], PositiveInt)
+    with pytest.raises(ValidationError):
+        PositiveInt.validate('x', -2)
+
+
+def test_lru_cache_invalidation():
+    """Tests that the cache is cleared and not reused when `init_vtype` is called, and that it is not inherited"""
+
+    class PositiveInt(VType):
+        __type__ = int
+        __validators__ = lambda x: x >= 0
+        __cache__ = LRU()
+
+    assert isinstance(0, PositiveInt)
+    assert PositiveInt.__cache__.cache_info().currsize == 1
+
+    PositiveInt.__validators__ = lambda x: x > 0
+    PositiveInt.init_vtype()
+    assert PositiveInt.__cache__.cache_info() == (0, 0, 128, 0)
+    assert not isinstance(0, PositiveInt)
+
+    class SmallPositiveInt(PositiveInt):
+        __validators__ = lambda x: x < 10
+
+    assert SmallPositiveInt._instance_checker is not PositiveInt._instance_checker
+    assert isinstance(1, SmallPositiveInt)
+    assert not isinstance(11, SmallPositiveInt)
+    # the checks on SmallPositiveInt are flat: they do not go through the cache of PositiveInt
+    assert PositiveInt.__cache__.cache_info().currsize == 1
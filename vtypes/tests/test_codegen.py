@@ -0,0 +1,56 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import inspect
+from numbers import Integral
+
+import pytest
+
+from vtypes import vtype
+from vtypes import codegen
+from vtypes.validators import gt, gts, lt, between, is_in, match_regex, length_between, is_finite
+
+
+def _is_even(x):
+    return x % 2 == 0
+
+
+@pytest.mark.parametrize("base, validators, values", [
+    (int, [gt(0), lt(100), _is_even], [-1, 0, 2, 3, 100, 102, 'a', 2.]),
+    ((Integral, int), [gts(0.5), between(0, 10, open_right=True)], [0, 1, 10, 11, None, 1.]),
+    (float, [is_finite(), lambda x: x != 2.], [1., float('inf'), float('nan'), 2., 1]),
+    (str, [is_in({'a', 'bb', 'ccc'}), length_between(2), match_regex('b+$')], ['a', 'bb', 'ccc', 'd', 1]),
+    (str, length_between(1, 2), ['', 'a', 'abc']),
+    ((), [lambda x: None, lambda x: 1 / x], [0, 1, 'a']),
+])
+def test_codegen_equivalence(base, validators, values):
+    """Tests that generated checkers behave exactly as the closures"""
+
+    Ref = vtype('Ref', base, validators)
+    Gen = vtype('Gen', base, validators, codegen=True)
+    for v in values:
+        assert isinstance(v, Gen) is isinstance(v, Ref)
+        assert Gen.has_valid_value(v) is Ref.has_valid_value(v)
+
+
+def test_codegen_source(monkeypatch):
+    """Tests that the source can be inspected, and that code objects are cached in memory"""
+
+    monkeypatch.setattr(codegen, '_code_cache', dict())
+
+    PositiveInt = vtype('PositiveInt', int, [gt(0), _is_even], codegen=True)
+    source = codegen.get_source(PositiveInt)
+    assert 'def check_PositiveInt(obj):' in source
+    assert '_r = obj >= 0' in source
+    assert 'isinstance(obj, _t1)' in source
+    assert inspect.getsource(PositiveInt._instance_checker) in source
+    assert codegen.get_source(vtype('Int', int, gt(0))) is None
+
+    # one code object per generated checker: instance checker and value checker
+    assert len(codegen._code_cache) == 2
+
+    # the same definition is not compiled again
+    monkeypatch.setattr(codegen, 'compile', lambda *args: pytest.fail("compile should not be called"), raising=False)
+    PositiveInt2 = vtype('PositiveInt', int, [gt(0), _is_even], codegen=True)
+    assert isinstance(2, PositiveInt2)
+    assert not isinstance(1, PositiveInt2)
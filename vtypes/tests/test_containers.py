@@ -0,0 +1,109 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype, ListOf, DictOf, TupleOf
+
+
+PositiveInt = vtype('PositiveInt', int, {'should be positive': lambda x: x >= 0})
+
+
+def test_list_of():
+    """Tests ListOf, with VType and plain type items, and nesting"""
+
+    PositiveInts = ListOf(PositiveInt)
+    assert PositiveInts.__name__ == 'ListOf[PositiveInt]'
+    assert isinstance([], PositiveInts)
+    assert isinstance([1, 2], PositiveInts)
+    assert not isinstance([1, -2], PositiveInts)
+    assert not isinstance((1, 2), PositiveInts)
+    assert PositiveInts.is_valid_many([[1], [-1], 1]) == [True, False, False]
+    with pytest.raises(ValidationError) as exc_info:
+        PositiveInts.validate('x', [1, -2])
+    assert 'all_items_are_PositiveInt' in str(exc_info.value)
+
+    assert isinstance(['a'], ListOf(str))
+    assert not isinstance(['a', 1], ListOf(str))
+    assert isinstance([[1], []], ListOf(PositiveInts))
+    assert not isinstance([[1], [-1]], ListOf(PositiveInts))
+
+    # containers can be composed with other validators
+    NonEmptyPositiveInts = vtype('NonEmptyPositiveInts', PositiveInts, lambda x: len(x) > 0)
+    assert isinstance([1], NonEmptyPositiveInts)
+    assert not isinstance([], NonEmptyPositiveInts)
+    assert not isinstance([-1], NonEmptyPositiveInts)
+
+
+def test_dict_of():
+    """Tests DictOf"""
+
+    Scores = DictOf(str, PositiveInt)
+    assert Scores.__name__ == 'DictOf[str, PositiveInt]'
+    assert isinstance({'a': 1}, Scores)
+    assert not isinstance({'a': -1}, Scores)
+    assert not isinstance({1: 1}, Scores)
+    assert isinstance({'a': 'b'}, DictOf(str, object))
+
+
+def test_tuple_of():
+    """Tests TupleOf, fixed and variable-length"""
+
+    Pair = TupleOf(str, PositiveInt)
+    assert Pair.__name__ == 'TupleOf[str, PositiveInt]'
+    assert isinstance(('a', 1), Pair)
+    assert not isinstance(('a', -1), Pair)
+    assert not isinstance(('a', 1, 1), Pair)
+    assert not isinstance(['a', 1], Pair)
+
+    PositiveInts = TupleOf(PositiveInt, Ellipsis)
+    assert isinstance((), PositiveInts)
+    assert isinstance((1, 2, 3), PositiveInts)
+    assert not isinstance((1, -2, 3), PositiveInts)
+
+    with pytest.raises(TypeError):
+        TupleOf(int, Ellipsis, str)
+    with pytest.raises(ValueError):
+        TupleOf(int, str, sample=1)
+
+
+def test_sampling():
+    """Tests that with `sample` only a limited number of evenly spread items are checked"""
+
+    checked = []
+
+    def track(x):
+        checked.append(x)
+        return x >= 0
+
+    Tracked = vtype('Tracked', int, track)
+    values = list(range(100))
+
+    assert isinstance(values, ListOf(Tracked, sample=10))
+    assert len(checked) == 10
+    assert checked[0] == 0 and checked[-1] >= 90
+
+    # invalid items that are not sampled are not detected
+    assert isinstance([1, -1, 1], ListOf(PositiveInt, sample=2))
+    assert not isinstance([1, 1, -1], ListOf(PositiveInt, sample=2))
+
+    del checked[:]
+    assert isinstance(dict(zip(values, values)), DictOf(int, Tracked, sample=5))
+    assert checked == [0, 1, 2, 3, 4]
+
+    with pytest.raises(ValueError):
+        ListOf(int, sample=0)
+
+
+def test_container_validator_abstract():
+    """Tests that a container validator without `args` can not be instantiated"""
+
+    from vtypes.containers import ContainerValidator
+
+    class NoArgs(ContainerValidator):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        NoArgs()
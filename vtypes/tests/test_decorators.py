@@ -0,0 +1,83 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype, validate_arguments
+from vtypes import decorators
+from vtypes.validators import gt, length_between
+
+PositiveInt = vtype('PositiveInt', int, gt(0, strict=True))
+NonEmptyStr = vtype('NonEmptyStr', str, length_between(1))
+
+
+def test_validate_arguments():
+    """Tests that VType arguments are validated, whatever the way they are passed"""
+
+    @validate_arguments
+    def f(a: PositiveInt, b, c: 'NonEmptyStr' = '', *args: PositiveInt, d: PositiveInt = 1, **kwargs: NonEmptyStr):
+        return a, b, c, args, d, kwargs
+
+    assert f.__name__ == 'f'
+    assert f(1, -1) == (1, -1, '', (), 1, {})
+    assert f(1, None, 'a', 2, 3, d=2, e='a') == (1, None, 'a', (2, 3), 2, {'e': 'a'})
+    assert f(b=0, a=1, c='a') == (1, 0, 'a', (), 1, {})
+
+    for args, kwargs, name in [((0, 1), {}, 'a'),
+                               ((), dict(a=0, b=1), 'a'),
+                               ((1, 1, ''), {}, 'c'),
+                               ((1, 1), dict(c=''), 'c'),
+                               ((1, 1, 'a', 2, -1), {}, 'args[1]'),
+                               ((1, 1), dict(d=0), 'd'),
+                               ((1, 1), dict(e=''), "kwargs['e']")]:
+        with pytest.raises(ValidationError) as exc_info:
+            f(*args, **kwargs)
+        assert exc_info.value.var_name == name
+
+
+def test_validate_arguments_unchanged(monkeypatch):
+    """Tests that functions without VType parameters, or decorated when checks are disabled, are unchanged"""
+
+    def g(a: int, b: 'int'):
+        return a
+
+    assert validate_arguments(g) is g
+
+    def h(a: PositiveInt):
+        return a
+
+    monkeypatch.setattr(decorators, '_enabled', True)
+    decorators.enable_argument_checks(False)
+    assert validate_arguments(h) is h
+    decorators.enable_argument_checks()
+    assert validate_arguments(h) is not h
+
+
+def test_validate_arguments_string_annotations():
+    """Tests that local VTypes and forward references are resolved, and that unresolved annotations emit a warning"""
+
+    LocalPositiveInt = vtype('LocalPositiveInt', int, gt(0))
+
+    @validate_arguments
+    def f(a: 'LocalPositiveInt'):
+        return a
+
+    assert f(1) == 1
+    with pytest.raises(ValidationError):
+        f(-5)
+
+    @validate_arguments
+    def g(a: 'LaterPositiveInt', b: 'Unknown' = None):
+        return a
+
+    global LaterPositiveInt
+    LaterPositiveInt = vtype('LaterPositiveInt', int, gt(0))
+    try:
+        with pytest.warns(UserWarning, match="'Unknown'"):
+            assert g(1) == 1
+        with pytest.raises(ValidationError):
+            g(-5)
+    finally:
+        del LaterPositiveInt
@@ -0,0 +1,40 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import subprocess
+import sys
+from os.path import dirname
+
+import pytest
+
+ROOT_DIR = dirname(dirname(dirname(__file__)))
+
+HEAVY_MODULES = ('valid8', 'numpy', 'typing', 'inspect', 'six')
+
+
+def _get_new_modules(code):
+    """Returns the modules that are newly imported by `code`, in a fresh python interpreter"""
+    script = "import sys; before = set(sys.modules); %s; print(','.join(set(sys.modules) - before))" % code
+    out = subprocess.check_output([sys.executable, '-c', script], cwd=ROOT_DIR)
+    return set(out.decode('utf-8').strip().split(','))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 0), reason="typing does not exist in python 2")
+def test_lazy_imports():
+    """Tests that `import vtypes` does not import the heavy dependencies"""
+
+    new_modules = _get_new_modules("import vtypes")
+    assert 'vtypes.core' in new_modules
+    assert not new_modules.intersection(HEAVY_MODULES)
+    if sys.version_info >= (3, 7):
+        # the other submodules are imported on first access
+        assert set(m for m in new_modules if m.startswith('vtypes')) == {'vtypes', 'vtypes.core'}
+        assert 'vtypes.containers' in _get_new_modules("import vtypes; vtypes.ListOf")
+
+    # VTypes without validators do not need valid8
+    new_modules = _get_new_modules("from vtypes import vtype; vtype('Int', int); from vtypes.validators import gt")
+    assert not new_modules.intersection(HEAVY_MODULES)
+
+    # the first validator loads valid8
+    new_modules = _get_new_modules("from vtypes import vtype; vtype('PositiveInt', int, lambda x: x >= 0)")
+    assert 'valid8' in new_modules
@@ -0,0 +1,73 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype
+from vtypes.instrumentation import instrument, uninstrument, get_stats, snapshot
+from vtypes.validators import gt
+
+
+def test_instrumentation():
+    """Tests the counters, failure counts, callback and snapshot of instrumented VTypes, and that they can be removed"""
+
+    def is_even(x):
+        return x % 2 == 0
+
+    EvenPositive = vtype('EvenPositive', int, [gt(0), is_even])
+    original_checker = EvenPositive.__dict__['_instance_checker']
+    assert get_stats(EvenPositive) is None
+
+    events = []
+    stats = instrument(EvenPositive, callback=lambda vt, kind, duration, ok: events.append((vt, kind, ok)))
+    assert get_stats(EvenPositive) is stats
+
+    assert isinstance(2, EvenPositive)
+    assert not isinstance(3, EvenPositive)
+    assert not isinstance(-2, EvenPositive)
+    assert not isinstance('a', EvenPositive)
+    assert EvenPositive.is_valid(4)
+    EvenPositive.validate('x', 2)
+    with pytest.raises(ValidationError):
+        EvenPositive.validate('x', 1)
+    assert not EvenPositive.has_valid_type(1.)
+    assert EvenPositive.has_valid_value(8)
+
+    snap = stats.snapshot()
+    assert snap['calls'] == {'isinstance': 5, 'validate': 2, 'has_valid_type': 1, 'has_valid_value': 1}
+    assert snap['time']['isinstance'] > 0
+    assert snap['failures'] == {'is_even': 2, 'greater_than_0': 1, 'isinstance(x, int)': 2}
+    assert events[0] == (EvenPositive, 'isinstance', True)
+    assert len(events) == 9
+    assert snapshot()['%s.EvenPositive' % __name__] == snap
+
+    # the instrumentation survives init_vtype
+    stats.reset()
+    EvenPositive.init_vtype()
+    assert isinstance(2, EvenPositive)
+    assert stats.calls['isinstance'] == 1
+
+    # subclasses are not instrumented
+    class Small(EvenPositive):
+        __validators__ = lambda x: x < 10
+    assert isinstance(2, Small)
+    assert stats.calls['isinstance'] == 1
+
+    uninstrument(EvenPositive)
+    assert get_stats(EvenPositive) is None
+    assert isinstance(2, EvenPositive)
+    assert stats.calls['isinstance'] == 1
+    assert '%s.EvenPositive' % __name__ not in snapshot()
+
+
+def test_instrumentation_lazy():
+    """Tests that lazy VTypes are built when instrumented"""
+
+    LazyInt = vtype('LazyInt', int, gt(0), lazy=True)
+    stats = instrument(LazyInt)
+    assert not isinstance(-1, LazyInt)
+    assert stats.calls['isinstance'] == 1
+    assert stats.failures == {'greater_than_0': 1}
+    uninstrument(LazyInt)
@@ -0,0 +1,113 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype
+from vtypes.instrumentation import instrument, uninstrument
+from vtypes.modes import set_check_mode, get_check_mode, check_mode, reset_check_modes, skipped_checks, \
+    reset_skipped_checks, CheckMode
+from vtypes.validators import gt
+
+
+@pytest.fixture
+def full_mode():
+    """Makes sure that all VTypes are back to full mode after the test"""
+    yield
+    reset_check_modes()
+    reset_skipped_checks()
+
+
+def test_check_modes(full_mode):
+    """Tests the off, sampled and full modes, globally and per VType, and the skipped checks counters"""
+
+    PositiveInt = vtype('PositiveInt', int, gt(0))
+    Small = vtype('Small', PositiveInt, lambda x: x < 10)
+    Other = vtype('Other', int, gt(0))
+    full_checker = Small._instance_checker
+
+    set_check_mode('off', PositiveInt)
+    assert get_check_mode(Small) == CheckMode('off')
+    assert get_check_mode() == CheckMode('full')
+    assert isinstance(-1, PositiveInt) and isinstance(100, Small)
+    assert not isinstance('a', Small)
+    PositiveInt.validate('x', -1)
+    with pytest.raises(ValidationError):
+        PositiveInt.validate('x', 'a')
+    assert not isinstance(-1, Other)
+    assert skipped_checks(PositiveInt) == 2
+    assert skipped_checks(Small) == 1
+    assert skipped_checks(Other) == 0
+
+    set_check_mode('sampled', every=3)
+    set_check_mode('full', Small)
+    assert [isinstance(-1, Other) for _ in range(6)] == [True, True, False] * 2
+    assert skipped_checks()[Other] == 4
+    assert isinstance(-1, PositiveInt)  # the mode set on PositiveInt is kept
+    assert Small._instance_checker is full_checker
+
+    # scoped override, and VTypes created later use the global mode
+    with check_mode('off', [Other, Small]):
+        assert isinstance(-1, Small)
+        assert isinstance(-1, Other)
+        Late = vtype('Late', int, gt(0), lazy=True)
+        assert isinstance(-1, Late)
+    assert not isinstance(-1, Small)
+    assert get_check_mode(Other) == CheckMode('sampled', every=3)
+
+    reset_check_modes()
+    assert not isinstance(-1, Late)
+    assert not isinstance(-1, Other)
+    with pytest.raises(ValueError):
+        set_check_mode('partial')
+
+
+def test_check_modes_instrumentation(full_mode):
+    """Tests that modes and instrumentation can be combined in any order"""
+
+    PositiveInt = vtype('PositiveInt', int, gt(0))
+    stats = instrument(PositiveInt)
+    set_check_mode('off', PositiveInt)
+    assert isinstance(-1, PositiveInt)
+    uninstrument(PositiveInt)
+    assert isinstance(-1, PositiveInt)
+    set_check_mode('full', PositiveInt)
+    assert not isinstance(-1, PositiveInt)
+    assert stats.calls['isinstance'] == 0
+
+
+def test_sampled_mode_interleaved(full_mode):
+    """Tests that isinstance and validate each have their own sampling counter"""
+
+    P = vtype('P', int, gt(0))
+    set_check_mode('sampled', P, every=2)
+
+    results = []
+    for _ in range(2):
+        results.append(isinstance(-1, P))
+        try:
+            P.validate('v', -1)
+        except ValidationError:
+            results.append('v-raise')
+        else:
+            results.append('v-ok')
+    assert results == [True, 'v-ok', False, 'v-raise']
+
+
+def test_check_modes_batch(full_mode):
+    """Tests that check modes apply to batch checks, including on NumPy arrays"""
+
+    np = pytest.importorskip('numpy')
+    P = vtype('P', int, gt(0))
+
+    with check_mode('off', P):
+        assert P.is_valid_many([-1, 1]) == [True, True]
+        assert P.is_valid_many(np.array([-1, 1])).tolist() == [True, True]
+        P.validate_many('p', np.array([-1, 1]))
+        assert not P.is_valid_many(np.array([1.5])).any()
+
+    assert P.is_valid_many(np.array([-1, 1])).tolist() == [False, True]
+    with pytest.raises(ValidationError):
+        P.validate_many('p', np.array([-1, 1]))
@@ -0,0 +1,87 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from vtypes import vtype
+from vtypes.parallel import BulkResult
+
+
+def is_positive(x):
+    return x >= 0
+
+
+# module-level so that it can be sent to worker processes
+PositiveInt = vtype('PositiveInt', int, is_positive)
+
+
+@pytest.mark.parametrize("executor", ['thread', 'process'])
+def test_is_valid_parallel(executor):
+    """Tests that results are merged in input order, for sequences and generators"""
+
+    values = [1, -1, 'a', 2, 3, -4, 5]
+    res = PositiveInt.is_valid_parallel(values, executor=executor, max_workers=2, chunksize=2)
+    assert res == BulkResult([True, False, False, True, True, False, True], [1, 2, 5])
+
+    res = PositiveInt.is_valid_parallel(iter(values), executor=executor, max_workers=2, chunksize=3)
+    assert res.invalid_indices == [1, 2, 5]
+
+    assert PositiveInt.is_valid_parallel([], executor=executor) == BulkResult([], [])
+
+
+def test_is_valid_parallel_not_sliceable():
+    """Tests that sized iterables that can not be sliced, such as dicts and dict views, are consumed lazily"""
+
+    d = {0: 1, 1: -1, 2: 2}
+    assert PositiveInt.is_valid_parallel(d.values(), executor='thread', chunksize=2).invalid_indices == [1]
+    assert PositiveInt.is_valid_parallel(d, executor='thread', chunksize=2).invalid_indices == []
+    assert PositiveInt.is_valid_parallel({-1: 'a'}, executor='thread').invalid_indices == [0]
+
+
+def test_is_valid_parallel_executor():
+    """Tests that an existing executor can be reused, and that non-picklable VTypes are refused by process pools"""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # sent by definition
+    LocalPositiveInt = vtype('LocalPositiveInt', int, is_positive)
+    assert LocalPositiveInt.is_valid_parallel([1, -1], max_workers=2).invalid_indices == [1]
+
+    LambdaPositiveInt = vtype('LambdaPositiveInt', int, lambda x: x >= 0)
+    with pytest.raises(ValueError):
+        LambdaPositiveInt.is_valid_parallel([1])
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for _ in range(2):
+            assert LocalPositiveInt.is_valid_parallel(range(-5, 5), executor=pool).invalid_indices == [0, 1, 2, 3, 4]
+        res = LocalPositiveInt.is_valid_parallel(range(-5, 5), executor=pool, max_workers=3)
+        assert res.invalid_indices == [0, 1, 2, 3, 4]
+
+
+def test_is_valid_parallel_numpy():
+    """Tests that numpy arrays are sliced, and that a mask with the same shape is returned"""
+
+    np = pytest.importorskip("numpy")
+
+    arr = np.array([[1, -1], [2, -3]])
+    res = PositiveInt.is_valid_parallel(arr, executor='thread', chunksize=3)
+    assert res.mask.tolist() == [[True, False], [True, False]]
+    assert res.invalid_indices.tolist() == [1, 3]
+
+
+def test_is_valid_parallel_containers():
+    """Tests that container VTypes can be sent to worker processes"""
+
+    from vtypes import ListOf, DictOf, TupleOf
+
+    PositiveInts = ListOf(PositiveInt)
+    res = PositiveInts.is_valid_parallel([[1, 2], [1, -1], 'a', []], executor='process', max_workers=2, chunksize=1)
+    assert res.invalid_indices == [1, 2]
+
+    Scores = DictOf(str, PositiveInt, sample=10)
+    res = Scores.is_valid_parallel([{'a': 1}, {'a': -1}, {1: 1}], executor='process', max_workers=2, chunksize=1)
+    assert res.invalid_indices == [1, 2]
+
+    Pair = TupleOf(str, PositiveInts)
+    res = Pair.is_valid_parallel([('a', [1]), ('a', [-1]), ('a',)], executor='process', max_workers=2, chunksize=1)
+    assert res.invalid_indices == [1, 2]
@@ -0,0 +1,92 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from vtypes import vtype, VType, LRU
+from vtypes.records import record
+from vtypes.validators import gt, lt, is_in
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+PositiveInt = vtype('PositiveInt', int, gt(0))
+
+
+def run_in_subprocess(code,  # type: str
+                      blob   # type: bytes
+                      ):
+    """ Runs `code` in a new interpreter, with `blob` as its binary standard input (`stdin`) """
+    code = "import sys\nstdin = getattr(sys.stdin, 'buffer', sys.stdin)\n" + code
+    proc = subprocess.Popen([sys.executable, '-c', code], stdin=subprocess.PIPE)
+    proc.communicate(blob)
+    assert proc.returncode == 0
+
+
+def test_pickle_by_reference():
+    """Tests that module-level VTypes are pickled by reference"""
+
+    assert pickle.loads(pickle.dumps(PositiveInt)) is PositiveInt
+    assert pickle.loads(pickle.dumps(VType)) is VType
+
+
+def test_pickle_by_definition():
+    """Tests that dynamically created VTypes are pickled by definition, and only rebuilt once"""
+
+    EvenPositiveInt = vtype('EvenPositiveInt', PositiveInt, {'should be even': is_even}, help_msg='hey',
+                            cache=LRU(maxsize=3))
+    Color = vtype('Color', str, is_in(('red', 'blue')))
+
+    class SmallEvenPositiveInt(EvenPositiveInt):
+        """a docstring"""
+        __validators__ = lt(10), 'should be small'
+
+    Person = record('Person', {'age': SmallEvenPositiveInt, 'color': Color})
+
+    # same process: the class itself is returned
+    assert pickle.loads(pickle.dumps(SmallEvenPositiveInt)) is SmallEvenPositiveInt
+
+    # another process: the VTypes are rebuilt from their definition
+    blob = pickle.dumps([SmallEvenPositiveInt, Person, SmallEvenPositiveInt], protocol=pickle.HIGHEST_PROTOCOL)
+    code = """
+import pickle
+from vtypes import is_vtype
+S, P, S2 = pickle.loads(stdin.read())
+assert S is S2 and is_vtype(S)
+assert S.__name__ == 'SmallEvenPositiveInt' and S.__doc__ == 'a docstring'
+assert isinstance(4, S) and not isinstance(12, S) and not isinstance(3, S) and not isinstance(-2, S)
+E = S.__bases__[0]
+assert E.__help_msg__ == 'hey' and E.__cache__.maxsize == 3 and len(E.__cache__) == 0
+assert isinstance({'age': 2, 'color': 'red'}, P) and not isinstance({'age': 2, 'color': 'green'}, P)
+assert P.__dict__['__validators__'][0].fields['age'] is S
+"""
+    run_in_subprocess(code, blob)
+
+    # lazy VTypes, before they are built
+    LazyPositive = vtype('LazyPositive', int, gt(0), lazy=True)
+    LazyColor = vtype('LazyColor', str, {'should be a color': is_in(('red', 'blue'))}, lazy=True)
+    blob = pickle.dumps([LazyPositive, LazyColor], protocol=pickle.HIGHEST_PROTOCOL)
+    code = """
+import pickle
+from valid8 import ValidationError
+L, C = pickle.loads(stdin.read())
+assert L.__lazy__ and isinstance(1, L) and not isinstance(-1, L)
+assert isinstance('red', C) and not isinstance('green', C)
+try:
+    C.validate('c', 'green')
+except ValidationError as e:
+    assert 'should be a color' in str(e)
+else:
+    raise AssertionError()
+"""
+    run_in_subprocess(code, blob)
+
+    # lambdas can not be pickled
+    with pytest.raises(Exception):
+        pickle.dumps(vtype('Foo', int, lambda x: x >= 0))
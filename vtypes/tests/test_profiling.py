@@ -0,0 +1,95 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from vtypes import vtype, VType
+from vtypes.profiling import profile_validators
+from vtypes.validators import gt
+
+
+def test_profile_validators():
+    """Tests that each validator is profiled, including from subclasses, and that profiling is removed afterwards"""
+
+    def is_even(x):
+        return x % 2 == 0
+
+    def fails(x):
+        raise ValueError()
+
+    EvenPositive = vtype('EvenPositive', int, {'should be positive': gt(0), 'should be even': is_even})
+
+    class Small(EvenPositive):
+        __validators__ = lambda x: x < 10
+
+    Other = vtype('Other', int, fails)
+
+    with profile_validators(EvenPositive, Small) as profiler:
+        assert isinstance(2, EvenPositive)
+        assert not isinstance(3, EvenPositive)
+        assert not isinstance(-2, EvenPositive)
+        assert isinstance(4, Small)
+        assert not isinstance(12, Small)
+        assert EvenPositive.is_valid_many([2, 3]) == [True, False]
+        assert not isinstance(1, Other)
+
+    # note: the validators of Small are checked before the inherited ones, so 12 is only seen by the lambda
+    results = {(p.vtype.__name__, p.name): p for p in profiler.results()}
+    assert sorted(results) == [('EvenPositive', 'greater_than_0'), ('EvenPositive', 'is_even'), ('Small', '<lambda>')]
+
+    gt0 = results[('EvenPositive', 'greater_than_0')]
+    assert (gt0.calls, gt0.rejections) == (6, 1)
+    even = results[('EvenPositive', 'is_even')]
+    assert (even.calls, even.rejections) == (5, 2)
+    assert even.rejection_rate == pytest.approx(0.4)
+    assert even.total_time > 0 and even.mean_time > 0
+    small = results[('Small', '<lambda>')]
+    assert (small.calls, small.rejections) == (2, 1)
+
+    report = profiler.report(sort='name')
+    assert report.splitlines()[2].startswith('EvenPositive.greater_than_0')
+    assert '40.0%' in report
+    with pytest.raises(ValueError):
+        profiler.report(sort='foo')
+
+    # the profiling is removed
+    assert isinstance(2, Small)
+    assert gt0.calls == 6
+
+
+def test_profile_all_validators():
+    """Tests that all VTypes are profiled by default"""
+
+    PositiveInt = vtype('PositiveInt', int, gt(0), lazy=True)
+
+    with profile_validators() as profiler:
+        assert not isinstance(-1, PositiveInt)
+
+    names = [p.vtype for p in profiler.results()]
+    assert PositiveInt in names
+    assert VType not in names
+
+    with pytest.raises(TypeError):
+        profile_validators(int)
+
+
+def test_profile_shared_validator():
+    """Tests that VTypes sharing the same validator are profiled separately, and restored correctly"""
+
+    A = vtype('A', int, gt(0))
+    B = vtype('B', int, gt(0))
+    assert A._validator is B._validator
+
+    with profile_validators(A, B) as profiler:
+        assert isinstance(1, A)
+        assert not isinstance(-1, B)
+        assert isinstance(2, B)
+
+    results = {p.vtype.__name__: p for p in profiler.results()}
+    assert (results['A'].calls, results['A'].rejections) == (1, 0)
+    assert (results['B'].calls, results['B'].rejections) == (2, 1)
+
+    # the profiling is removed
+    assert A._validator is B._validator
+    assert isinstance(1, A) and isinstance(1, B)
+    assert results['A'].calls == 1 and results['B'].calls == 2
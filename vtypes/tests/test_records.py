@@ -0,0 +1,55 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from valid8 import ValidationError
+
+from vtypes import vtype
+from vtypes.records import record, InvalidFields, FieldsValidator
+
+
+PositiveInt = vtype('PositiveInt', int, {'should be positive': lambda x: x >= 0})
+NonEmptyStr = vtype('NonEmptyStr', str, {'should be non empty': lambda x: len(x) > 0})
+
+
+@pytest.mark.parametrize("allow_extra", [True, False], ids="allow_extra={}".format)
+def test_record(allow_extra):
+    """Tests the boolean checks of record VTypes"""
+
+    Person = record('Person', {'name': NonEmptyStr, 'age': PositiveInt, 'email': str}, optional=('email',),
+                    allow_extra=allow_extra)
+    assert Person.__module__ == __name__
+
+    assert isinstance({'name': 'alice', 'age': 12}, Person)
+    assert isinstance({'name': 'alice', 'age': 12, 'email': 'a@b.c'}, Person)
+    assert not isinstance({'name': 'alice', 'age': 12, 'email': 1}, Person)
+    assert not isinstance({'name': 'alice', 'age': -1}, Person)
+    assert not isinstance({'name': 'alice'}, Person)
+    assert not isinstance([('name', 'alice'), ('age', 12)], Person)
+    assert isinstance({'name': 'alice', 'age': 12, 'foo': 0}, Person) is allow_extra
+
+    with pytest.raises(ValueError):
+        record('Person', {'name': str}, optional=('age',))
+
+
+def test_record_error(monkeypatch):
+    """Tests that a single error lists all failing fields, and that no error is created by boolean checks"""
+
+    Person = record('Person', {'name': NonEmptyStr, 'age': PositiveInt, 'id': int}, allow_extra=False)
+
+    with pytest.raises(ValidationError) as exc_info:
+        Person.validate('person', {'name': '', 'age': -1, 'foo': 0})
+    failure = exc_info.value.__cause__
+    assert isinstance(failure, InvalidFields)
+    assert sorted(failure.errors) == ['age', 'foo', 'id', 'name']
+    assert failure.errors['id'] == "missing required field"
+    assert failure.errors['foo'] == "unexpected field"
+    assert 'should be positive' in failure.errors['age']
+    assert 'should be non empty' in str(exc_info.value)
+
+    # boolean checks do not call the error-raising validator
+    monkeypatch.setattr(FieldsValidator, '__call__', None)
+    assert not Person.is_valid({'name': '', 'age': -1})
+    assert not Person.has_valid_value({'name': '', 'age': -1})
+    assert Person.is_valid({'name': 'alice', 'age': 1, 'id': 0})
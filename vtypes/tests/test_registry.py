@@ -0,0 +1,51 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+
+from vtypes import VTypeRegistry
+from vtypes.registry import default_registry
+from vtypes.validators import gt, is_in
+
+
+def test_registry_interning():
+    """Tests that identical definitions return the same VType, and that lookup by name works"""
+
+    registry = VTypeRegistry()
+
+    Age = registry.vtype('Age', int, {'should be positive': gt(0)})
+    assert registry.vtype('Age', int, {'should be positive': gt(0)}) is Age
+    assert registry.vtype('Age2', (int,), {'should be positive': gt(0)}) is Age
+    assert registry.vtype('Age', int, {'should be positive': gt(1)}) is not Age
+    assert registry.vtype('Age', int, {'should be strictly positive': gt(0)}) is not Age
+    assert registry.vtype('Age', int, gt(0), help_msg='hey') is not Age
+
+    Color = registry.vtype('Color', str, is_in({'red', 'blue'}))
+    assert registry.vtype('Color', str, is_in({'blue', 'red'})) is Color
+    assert isinstance('red', Color)
+
+    # not hashable: not interned
+    assert registry.vtype('Foo', str, is_in([['a']])) is not registry.vtype('Foo', str, is_in([['a']]))
+
+    # the last registered VType with a given name is returned
+    assert registry.get('Age2') is Age
+    assert registry.get('Age') is not Age
+    assert registry.get('Color', module=__name__) is Color
+    with pytest.raises(KeyError):
+        registry.get('Color', module='foo')
+
+    assert len(registry) == 5
+    registry.clear()
+    assert len(registry) == 0
+    assert registry.vtype('Color', str, is_in({'red', 'blue'})) is not Color
+
+
+def test_default_registry():
+    """Tests the global registry"""
+
+    try:
+        T = default_registry.vtype('T', int, gt(0))
+        assert default_registry.get('T') is T
+        assert default_registry.vtype('T', int, gt(0)) is T
+    finally:
+        default_registry.clear()
@@ -0,0 +1,88 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+import pytest
+from valid8 import ValidationError
+
+from vtypes import vtype, VType
+from vtypes.validators import gt, gts, lt, lts, between, is_in, match_regex, length_between, is_finite
+
+
+@pytest.mark.parametrize("validator, base, values, expected", [
+    (gt(0), int, [-1, 0, 1], [False, True, True]),
+    (gts(0), int, [-1, 0, 1], [False, False, True]),
+    (lt(0), int, [-1, 0, 1], [True, True, False]),
+    (lts(0), int, [-1, 0, 1], [True, False, False]),
+    (between(0, 1), float, [-1., 0., .5, 1.], [False, True, True, True]),
+    (between(0, 1, open_left=True, open_right=True), float, [-1., 0., .5, 1.], [False, False, True, False]),
+    (is_finite(), float, [1., float('inf'), float('nan')], [True, False, False]),
+    (is_in({'FR', 'DE'}), str, ['FR', 'US', 'DE'], [True, False, True]),
+    (match_regex('[A-Z]{2}$'), str, ['FR', 'fr', 'FRA'], [True, False, False]),
+    (length_between(1, 2), str, ['', 'a', 'abc'], [False, True, False]),
+    (length_between(2), str, ['', 'a', 'abc'], [False, False, True]),
+])
+def test_declarative_validators(validator, base, values, expected):
+    """Tests that declarative validators behave the same in scalar and in batch checks"""
+
+    T = vtype('T', base, {'should be valid': validator})
+
+    assert [isinstance(v, T) for v in values] == expected
+    assert T.is_valid_many(values) == expected
+    for v, ok in zip(values, expected):
+        if ok:
+            T.validate('x', v)
+        else:
+            with pytest.raises(ValidationError) as exc_info:
+                T.validate('x', v)
+            assert validator.__name__ in str(exc_info.value)
+
+    np = pytest.importorskip("numpy")
+    arr = np.array(values)
+    assert validator.check_array(arr).tolist() == expected
+    assert T.is_valid_many(arr).tolist() == expected
+
+
+def test_declarative_validators_class_style():
+    """Tests declarative validators in class-style VTypes, and their equality"""
+
+    class CountryCode(VType):
+        __type__ = str
+        __validators__ = [(length_between(2, 2), 'should have 2 letters'), is_in(('FR', 'DE'))]
+
+    assert isinstance('FR', CountryCode)
+    assert not isinstance('FRA', CountryCode)
+    assert not isinstance(1, CountryCode)
+
+    assert gt(0) == gt(0)
+    assert gt(0) != gts(0)
+    assert hash(match_regex('a')) == hash(match_regex('a'))
+    assert repr(between(0, 1)) == 'Between(0, 1, False, False)'
+
+
+def test_declarative_validator_abstract():
+    """Tests that a declarative validator missing `__call__` or `check_array` can not be instantiated"""
+
+    from vtypes.validators import DeclarativeValidator
+
+    class IsTrue(DeclarativeValidator):
+        __slots__ = ()
+
+        def __call__(self, x):
+            return x is True
+
+    with pytest.raises(TypeError):
+        IsTrue()
+
+    class IsTrue2(IsTrue):
+        __slots__ = ()
+
+        def check_array(self, arr):
+            return arr == True  # noqa: E712
+
+        @property
+        def __name__(self):
+            return 'is_true'
+
+    assert IsTrue2()(True) and IsTrue2() == IsTrue2()
+    TrueInt = vtype('TrueInt', int, IsTrue2())
+    assert TrueInt.is_valid(True) and not TrueInt.is_valid(1)
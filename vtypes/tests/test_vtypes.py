@@ -9,6 +9,7 @@ from valid8 import ValidationError
 
 from vtypes.core import VTypeMeta
 from vtypes import vtype, is_vtype, VType
+from vtypes.validators import gt, is_in
 
 
 @pytest.mark.parametrize('val_to_test,valid_type, valid_value',
@@ -157,3 +158,282 @@ def test_vtypes_inheritance(vtype_style, val_to_test, valid_type, valid_value):
         assert '__type__' in cls.__dict__
         assert '__validators__' in cls.__dict__
         assert '_validator' in cls.__dict__
+
+
+def test_compiled_checker_semantics():
+    """Tests that the compiled boolean checkers follow the valid8 conventions for success and failure"""
+    from numbers import Integral
+    from valid8.validation_lib import gt
+
+    def returns_none(x):
+        if x < 0:
+            raise ValueError()
+
+    def returns_one(x):
+        return 1
+
+    # True or None is a success, anything else (including truthy values and exceptions) is a failure
+    for validators, ok_value, nok_value in ((lambda x: x >= 0, 1, -1),
+                                            (returns_none, 1, -1),
+                                            (gt(0), 1, -1),
+                                            ([gt(0), lambda x: x < 10], 1, 11)):
+        for base in ((), int, (int, Integral)):
+            T = vtype('T', base, validators)
+            assert isinstance(ok_value, T)
+            assert T.has_valid_value(ok_value)
+            T.validate('x', ok_value)
+
+            assert not isinstance(nok_value, T)
+            assert not T.has_valid_value(nok_value)
+            with pytest.raises(ValidationError):
+                T.validate('x', nok_value)
+
+    T = vtype('T', int, returns_one)
+    assert not isinstance(1, T)
+    assert not T.has_valid_value(1)
+    with pytest.raises(ValidationError):
+        T.validate('x', 1)
+
+    # no validators at all
+    T = vtype('T', (int, Integral))
+    assert isinstance(1, T)
+    assert not isinstance('1', T)
+    assert isinstance('1', VType)
+
+    # a dynamic update of the validators is taken into account once `init_vtype` is called
+    T.__validators__ = lambda x: x > 0
+    T.init_vtype()
+    assert not isinstance(0, T)
+
+
+def test_is_valid_no_error_created():
+    """Tests the boolean validation path on `VTypeMeta` and `VTypeValidator`"""
+
+    PositiveInt = vtype('PositiveInt', int, {'should be positive': lambda x: x >= 0}, help_msg='hey')
+
+    assert PositiveInt.is_valid(1)
+    assert not PositiveInt.is_valid(-1)
+    assert not PositiveInt.is_valid('1')
+    assert PositiveInt._validator.is_valid(1)
+    assert not PositiveInt._validator.is_valid(-1)
+
+    # the boolean path never relies on the valid8 main function, that builds the failures
+    def main_function(x, **ctx):
+        raise AssertionError("should not be called")
+
+    _main_function = PositiveInt._validator.main_function
+    PositiveInt._validator.main_function = main_function
+    assert not PositiveInt.is_valid(-1)
+    assert not PositiveInt.has_valid_value(-1)
+    assert not isinstance(-1, PositiveInt)
+    PositiveInt.validate('x', 1)
+    PositiveInt._validator.main_function = _main_function
+
+    # inherited validators are taken into account
+    NonNegativeStrictInt = vtype('NonNegativeStrictInt', PositiveInt, lambda x: x != 0)
+    assert NonNegativeStrictInt.is_valid(1)
+    assert not NonNegativeStrictInt.is_valid(0)
+    assert not NonNegativeStrictInt.is_valid(-1)
+
+    # the rich error is only created in validate
+    with pytest.raises(ValidationError) as exc_info:
+        PositiveInt.validate('x', -1)
+    assert 'hey' in str(exc_info.value)
+
+
+def test_flat_diamond_inheritance():
+    """Tests that the checks are flattened and deduplicated in diamond-shaped hierarchies"""
+
+    calls = []
+
+    def non_empty(x):
+        calls.append(x)
+        return len(x) > 0
+
+    NonEmpty = vtype('NonEmpty', (), non_empty)
+    NonEmptyStr = vtype('NonEmptyStr', (NonEmpty, str))
+    ShortNonEmpty = vtype('ShortNonEmpty', NonEmpty, lambda x: len(x) < 5)
+    ShortNonEmptyStr = vtype('ShortNonEmptyStr', (NonEmptyStr, ShortNonEmpty))
+
+    assert ShortNonEmptyStr._flat_types == (str,)
+    assert len(ShortNonEmptyStr._flat_funcs) == 2
+
+    assert isinstance('a', ShortNonEmptyStr)
+    assert ShortNonEmptyStr.has_valid_value('a')
+    assert ShortNonEmptyStr.has_valid_value('a', inherited_validators=False)
+    assert calls == ['a', 'a']
+    assert not isinstance('', ShortNonEmptyStr)
+    assert not isinstance('abcdef', ShortNonEmptyStr)
+    assert not isinstance([1], ShortNonEmptyStr)
+    assert ShortNonEmptyStr.has_valid_type('')
+    assert not ShortNonEmptyStr.has_valid_type([1])
+
+    # updating an ancestor updates the flat checks of its descendants
+    NonEmpty.__validators__ = lambda x: len(x) > 1
+    NonEmpty.init_vtype()
+    assert not isinstance('a', ShortNonEmptyStr)
+    assert isinstance('ab', ShortNonEmptyStr)
+
+
+def test_vtype_module():
+    """Tests that the `__module__` of VTypes created with `vtype()` is correct"""
+
+    assert vtype('T').__module__ == __name__
+    assert vtype('T', module='foo').__module__ == 'foo'
+    assert vtype('T', doc='hello').__doc__ == 'hello'
+
+    g = dict(vtype=vtype, __name__='bar')
+    exec("T = vtype('T')", g)
+    assert g['T'].__module__ == 'bar'
+
+
+def test_lazy_vtype():
+    """Tests that lazy VTypes only build their validator on first use, and only once even with several threads"""
+
+    from threading import Thread
+
+    Positive = vtype('Positive', (), lambda x: x >= 0, lazy=True)
+    PositiveInt = vtype('PositiveInt', (Positive, int), lazy=True)
+
+    class NonZeroPositiveInt(PositiveInt):
+        __validators__ = lambda x: x != 0
+
+    assert NonZeroPositiveInt.__lazy__
+    assert '_validator' not in Positive.__dict__
+    assert '_validator' not in NonZeroPositiveInt.__dict__
+    assert NonZeroPositiveInt.has_valid_type(1)
+
+    results = []
+    threads = [Thread(target=lambda: results.append(isinstance(1, NonZeroPositiveInt))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [True] * 8
+
+    # the whole hierarchy has been built
+    assert Positive._validator is not None
+    assert len(NonZeroPositiveInt._flat_funcs) == 2
+    assert not isinstance(0, NonZeroPositiveInt)
+    assert not isinstance(-1, PositiveInt)
+    assert NonZeroPositiveInt.has_valid_value(1, inherited_validators=False)
+
+    # the error path works too
+    with pytest.raises(ValidationError):
+        vtype('LazyPositive', int, lambda x: x >= 0, lazy=True).validate('x', -1)
+
+
+def test_subclasscheck_abc_caches():
+    """Tests that issubclass does not fill the ABC caches, and that register still works"""
+
+    PositiveInt = vtype('PositiveInt', int, lambda x: x >= 0)
+    SmallPositiveInt = vtype('SmallPositiveInt', PositiveInt, lambda x: x < 10)
+
+    class Foo(object):
+        pass
+
+    assert issubclass(SmallPositiveInt, PositiveInt)
+    assert issubclass(SmallPositiveInt, int)
+    assert issubclass(PositiveInt, VType)
+    assert not issubclass(PositiveInt, SmallPositiveInt)
+    assert not issubclass(Foo, PositiveInt)
+    assert not issubclass(int, VType)
+    with pytest.raises(TypeError):
+        issubclass(1, PositiveInt)
+
+    # the ABC registry and caches are not even created
+    from vtypes.core import _ABC_ATTRS
+    for vt in (VType, PositiveInt, SmallPositiveInt):
+        assert _ABC_ATTRS[0] not in vt.__dict__
+
+    # register: the VType and its ancestors use the ABC machinery
+    SmallPositiveInt.register(Foo)
+    assert issubclass(Foo, SmallPositiveInt)
+    assert issubclass(Foo, PositiveInt)
+    Other = vtype('Other', int)
+    assert not issubclass(Foo, Other)
+    assert not issubclass(Foo, VType)
+    assert _ABC_ATTRS[0] in SmallPositiveInt.__dict__ and _ABC_ATTRS[0] in PositiveInt.__dict__
+
+    # unrelated VTypes, subclasses and VType itself stay on the fast path
+    Smaller = vtype('Smaller', SmallPositiveInt, lambda x: x < 5)
+    assert issubclass(Smaller, SmallPositiveInt) and not issubclass(Foo, Smaller)
+    for vt in (VType, Other, Smaller):
+        assert vt._abc_subclasscheck is not vt
+        assert _ABC_ATTRS[0] not in vt.__dict__
+
+
+def test_compact_vtypes():
+    """Tests that identical definitions share their validator, and that its valid8 part is built on first error"""
+
+    def is_even(x):
+        return x % 2 == 0
+
+    A = vtype('A', int, [gt(0), is_even])
+    B = vtype('B', int, [gt(0), is_even], doc="another one")
+    C = vtype('C', int, [gt(0), is_even], help_msg="hey")
+    D = vtype('D', int, [gt(1), is_even])
+    assert A._validator is B._validator and A.__validators__ is B.__validators__
+    assert C._validator is not A._validator and D._validator is not A._validator
+
+    # unhashable definitions are not shared
+    E = vtype('E', str, is_in([['a']]))
+    assert vtype('E', str, is_in([['a']]))._validator is not E._validator
+
+    # default attributes are inherited instead of being set on each class
+    assert '__lazy__' not in A.__dict__ and '__cache__' not in A.__dict__ and '__help_msg__' not in A.__dict__
+    Lazy = vtype('Lazy', int, lazy=True)
+    assert vtype('NotLazy', Lazy, lazy=False).__lazy__ is False
+
+    assert A._validator._valid8_kwargs is not None
+    assert isinstance(2, A) and not isinstance(3, B)
+    with pytest.raises(ValidationError) as exc_info:
+        B.validate('b', 3)
+    assert "is_even" in str(exc_info.value)
+    assert A._validator._valid8_kwargs is None
+    with pytest.raises(ValidationError) as exc_info:
+        C.validate('c', -2)
+    assert "hey" in str(exc_info.value)
+
+
+def test_vtype_validator_signature():
+    """Tests that the former `VTypeValidator(vtype, validators, **kwargs)` signature still works, but is deprecated"""
+
+    from vtypes.core import VTypeValidator
+
+    PositiveInt = vtype('PositiveInt', int, gt(0))
+    assert PositiveInt._validator.vtype is None
+
+    validator = VTypeValidator((gt(0),), help_msg='hey')
+    assert validator.vtype is None
+    assert validator.is_valid(1) and not validator.is_valid(-1)
+
+    with pytest.deprecated_call():
+        validator = VTypeValidator(PositiveInt, (gt(0),), help_msg='hey')
+    assert validator.vtype is PositiveInt
+    assert validator.is_valid(1) and not validator.is_valid(-1)
+    assert validator.help_msg == 'hey'
+
+    with pytest.deprecated_call():
+        validator = VTypeValidator(vtype=PositiveInt, validators=(gt(0),))
+    assert validator.vtype is PositiveInt
+
+    with pytest.raises(TypeError):
+        VTypeValidator()
+
+
+def test_is_valid_attribute_ignored():
+    """Tests that an unrelated `is_valid` attribute on a validation callable is not used by the compiled checkers"""
+
+    class Positive(object):
+        is_valid = False
+
+        def __call__(self, x):
+            return x > 0
+
+    T = vtype('T', int, Positive())
+    assert isinstance(1, T) and T.is_valid(1)
+    T.validate('x', 1)
+    assert not isinstance(-1, T)
+    with pytest.raises(ValidationError):
+        T.validate('x', -1)
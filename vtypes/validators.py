@@ -0,0 +1,379 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+A small vocabulary of declarative validators. They can be used anywhere a validation function is expected in
+`vtype(...)` or in `__validators__` (alone, in a tuple with an error message, in a list or in a dict), and they can be
+lowered to NumPy operations so that `is_valid_many` and `validate_many` evaluate them on whole arrays at once.
+
+>>> from vtypes.validators import gt, length_between
+>>> gt(0)(1)
+True
+>>> gt(0, strict=True)(0)
+False
+>>> length_between(1, 3)('hello')
+False
+"""
+import re
+from abc import ABCMeta, abstractmethod, abstractproperty
+from math import isinf, isnan
+
+from vtypes.core import _with_metaclass
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Container, Optional
+
+
+class DeclarativeValidator(_with_metaclass(ABCMeta, object)):
+    """
+    Base class for declarative validators. Subclasses should implement `__call__` (scalar check returning a boolean,
+    never raising a `ValidationFailure`) and `check_array` (the equivalent check on a NumPy array, returning a boolean
+    array of the same shape).
+
+    A declarative validator is entirely defined by its type and its `args`, so two declarative validators with the
+    same definition are equal. Declarative validators have no side effects: they can be reordered in adaptive VTypes
+    (see `vtypes.adaptive`).
+    """
+    __slots__ = ()
+
+    reorderable = True
+
+    @property
+    def args(self):
+        """ The arguments defining this validator """
+        return tuple(getattr(self, a) for a in self.__slots__)
+
+    @abstractproperty
+    def __name__(self):
+        """ The name used by valid8 in error messages """
+        # note: ABCMeta can not detect a missing override, since `cls.__name__` is the class name
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __call__(self, x):
+        pass
+
+    @abstractmethod
+    def check_array(self, arr):
+        pass
+
+    def _source(self,
+                x,     # type: str
+                const  # type: Callable[[Any], str]
+                ):
+        # type: (...) -> Optional[str]
+        """
+        Returns a python expression equivalent to `self(x)`, inlined by the code generation backend (see
+        `vtypes.codegen`), or `None` if this validator should be called instead.
+
+        :param x: the name of the variable to validate
+        :param const: a function returning the source to use for a constant (a literal or a variable name)
+        :return:
+        """
+        return None
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.args == other.args
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((type(self), self.args))
+
+    def __repr__(self):
+        return '%s%r' % (type(self).__name__, self.args)
+
+
+class GreaterThan(DeclarativeValidator):
+    """ Checks that x >= min_value, or x > min_value if strict. See `gt` and `gts`. """
+    __slots__ = 'min_value', 'strict'
+
+    def __init__(self, min_value, strict=False):
+        self.min_value = min_value
+        self.strict = strict
+
+    @property
+    def __name__(self):
+        return '%sgreater_than_%s' % ('strictly_' if self.strict else '', self.min_value)
+
+    def __call__(self, x):
+        return x > self.min_value if self.strict else x >= self.min_value
+
+    def _source(self, x, const):
+        return '%s %s %s' % (x, '>' if self.strict else '>=', const(self.min_value))
+
+    def check_array(self, arr):
+        return arr > self.min_value if self.strict else arr >= self.min_value
+
+
+class LesserThan(DeclarativeValidator):
+    """ Checks that x <= max_value, or x < max_value if strict. See `lt` and `lts`. """
+    __slots__ = 'max_value', 'strict'
+
+    def __init__(self, max_value, strict=False):
+        self.max_value = max_value
+        self.strict = strict
+
+    @property
+    def __name__(self):
+        return '%slesser_than_%s' % ('strictly_' if self.strict else '', self.max_value)
+
+    def __call__(self, x):
+        return x < self.max_value if self.strict else x <= self.max_value
+
+    def _source(self, x, const):
+        return '%s %s %s' % (x, '<' if self.strict else '<=', const(self.max_value))
+
+    def check_array(self, arr):
+        return arr < self.max_value if self.strict else arr <= self.max_value
+
+
+class Between(DeclarativeValidator):
+    """ Checks that min_value <= x <= max_value. Each side can be made strict with open_left / open_right. """
+    __slots__ = 'min_value', 'max_value', 'open_left', 'open_right'
+
+    def __init__(self, min_value, max_value, open_left=False, open_right=False):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.open_left = open_left
+        self.open_right = open_right
+
+    @property
+    def __name__(self):
+        return 'between_%s_and_%s' % (self.min_value, self.max_value)
+
+    def __call__(self, x):
+        ok_left = self.min_value < x if self.open_left else self.min_value <= x
+        return ok_left and (x < self.max_value if self.open_right else x <= self.max_value)
+
+    def _source(self, x, const):
+        return '(%s %s %s) and (%s %s %s)' % (const(self.min_value), '<' if self.open_left else '<=', x,
+                                              x, '<' if self.open_right else '<=', const(self.max_value))
+
+    def check_array(self, arr):
+        ok_left = self.min_value < arr if self.open_left else self.min_value <= arr
+        return ok_left & (arr < self.max_value if self.open_right else arr <= self.max_value)
+
+
+class IsIn(DeclarativeValidator):
+    """ Checks that x is in the provided collection of allowed values. See `is_in`. """
+    __slots__ = 'allowed_values',
+
+    def __init__(self, allowed_values):
+        self.allowed_values = allowed_values
+
+    @property
+    def __name__(self):
+        return 'is_in_%s' % (self.allowed_values,)
+
+    def __call__(self, x):
+        return x in self.allowed_values
+
+    def _source(self, x, const):
+        return '%s in %s' % (x, const(self.allowed_values))
+
+    def __hash__(self):
+        # allowed values are often provided as a set, that is not hashable
+        try:
+            allowed_values = frozenset(self.allowed_values)
+        except TypeError:
+            allowed_values = tuple(self.allowed_values)
+        return hash((type(self), allowed_values))
+
+    def check_array(self, arr):
+        import numpy as np
+        return np.isin(arr, list(self.allowed_values))
+
+
+class MatchRegex(DeclarativeValidator):
+    """ Checks that string x matches the provided regular expression (using `re.match`). See `match_regex`. """
+    __slots__ = 'pattern', '_match'
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self._match = re.compile(pattern).match
+
+    @property
+    def args(self):
+        return self.pattern,
+
+    @property
+    def __name__(self):
+        return 'match_regex_%s' % (self.pattern,)
+
+    def __call__(self, x):
+        return self._match(x) is not None
+
+    def _source(self, x, const):
+        return '%s(%s) is not None' % (const(self._match), x)
+
+    def check_array(self, arr):
+        if arr.dtype.kind != 'U':
+            raise TypeError("match_regex can only be evaluated on unicode string arrays")
+        import numpy as np
+        match = self._match
+        return np.fromiter((match(s) is not None for s in arr.ravel().tolist()),
+                           dtype=bool, count=arr.size).reshape(arr.shape)
+
+
+class LengthBetween(DeclarativeValidator):
+    """ Checks that min_len <= len(x) <= max_len. `max_len` can be None. See `length_between`. """
+    __slots__ = 'min_len', 'max_len'
+
+    def __init__(self, min_len, max_len=None):
+        self.min_len = min_len
+        self.max_len = max_len
+
+    @property
+    def __name__(self):
+        return 'length_between_%s_and_%s' % (self.min_len, self.max_len)
+
+    def __call__(self, x):
+        n = len(x)
+        return self.min_len <= n and (self.max_len is None or n <= self.max_len)
+
+    def _source(self, x, const):
+        if self.max_len is None:
+            return '%s <= len(%s)' % (const(self.min_len), x)
+        return '%s <= len(%s) <= %s' % (const(self.min_len), x, const(self.max_len))
+
+    def check_array(self, arr):
+        if arr.dtype.kind not in 'US':
+            raise TypeError("length_between can only be evaluated on string arrays")
+        import numpy as np
+        lengths = np.char.str_len(arr)
+        res = lengths >= self.min_len
+        if self.max_len is not None:
+            res &= lengths <= self.max_len
+        return res
+
+
+class IsFinite(DeclarativeValidator):
+    """ Checks that x is a finite number (neither infinite nor nan). See `is_finite`. """
+    __slots__ = ()
+
+    @property
+    def __name__(self):
+        return 'is_finite'
+
+    def __call__(self, x):
+        return not (isinf(x) or isnan(x))
+
+    def _source(self, x, const):
+        return 'not (%s(%s) or %s(%s))' % (const(isinf), x, const(isnan), x)
+
+    def check_array(self, arr):
+        import numpy as np
+        return np.isfinite(arr)
+
+
+def gt(min_value,    # type: Any
+       strict=False  # type: bool
+       ):
+    # type: (...) -> GreaterThan
+    """
+    'Greater than' declarative validator: x >= min_value (strict=False, default) or x > min_value (strict=True)
+
+    :param min_value: minimum value for x
+    :param strict: Boolean flag to switch between x >= min_value (strict=False) and x > min_value (strict=True)
+    :return:
+    """
+    return GreaterThan(min_value, strict)
+
+
+def gts(min_value_strict  # type: Any
+        ):
+    # type: (...) -> GreaterThan
+    """ Alias for 'greater than' declarative validator in strict mode """
+    return GreaterThan(min_value_strict, True)
+
+
+def lt(max_value,    # type: Any
+       strict=False  # type: bool
+       ):
+    # type: (...) -> LesserThan
+    """
+    'Lesser than' declarative validator: x <= max_value (strict=False, default) or x < max_value (strict=True)
+
+    :param max_value: maximum value for x
+    :param strict: Boolean flag to switch between x <= max_value (strict=False) and x < max_value (strict=True)
+    :return:
+    """
+    return LesserThan(max_value, strict)
+
+
+def lts(max_value_strict  # type: Any
+        ):
+    # type: (...) -> LesserThan
+    """ Alias for 'lesser than' declarative validator in strict mode """
+    return LesserThan(max_value_strict, True)
+
+
+def between(min_value,        # type: Any
+            max_value,        # type: Any
+            open_left=False,  # type: bool
+            open_right=False  # type: bool
+            ):
+    # type: (...) -> Between
+    """
+    'Is between' declarative validator: min_value <= x <= max_value (default). open_right and open_left flags allow
+    to transform each side into strict mode.
+
+    :param min_value: minimum value for x
+    :param max_value: maximum value for x
+    :param open_left: Boolean flag to turn the left inequality to strict mode
+    :param open_right: Boolean flag to turn the right inequality to strict mode
+    :return:
+    """
+    return Between(min_value, max_value, open_left, open_right)
+
+
+def is_in(allowed_values  # type: Container
+          ):
+    # type: (...) -> IsIn
+    """
+    'Values in' declarative validator: x should be in the provided collection of allowed values
+
+    :param allowed_values: a collection of allowed values. A set is recommended.
+    :return:
+    """
+    return IsIn(allowed_values)
+
+
+def match_regex(pattern  # type: str
+                ):
+    # type: (...) -> MatchRegex
+    """
+    'Matches regex' declarative validator: the string x should match the regular expression `pattern` (`re.match`
+    semantics: the pattern should match at the beginning of the string).
+
+    :param pattern: a regular expression pattern
+    :return:
+    """
+    return MatchRegex(pattern)
+
+
+def length_between(min_len,       # type: int
+                   max_len=None   # type: Optional[int]
+                   ):
+    # type: (...) -> LengthBetween
+    """
+    'Is length between' declarative validator: min_len <= len(x) <= max_len.
+
+    :param min_len: minimum length for x
+    :param max_len: maximum length for x. `None` (default) means no maximum.
+    :return:
+    """
+    return LengthBetween(min_len, max_len)
+
+
+def is_finite():
+    # type: (...) -> IsFinite
+    """
+    'Is finite' declarative validator: x should be a finite number (neither infinite nor nan).
+
+    :return:
+    """
+    return IsFinite()
@@ -0,0 +1,278 @@
+#  Authors: Sylvain Marie <sylvain.marie@se.com>
+#
+#  Copyright (c) Schneider Electric Industries, 2020. All right reserved.
+"""
+The valid8 `Validator` used by VTypes, and the compilation of boolean checkers from raw validation functions.
+Importing this module imports valid8: it is therefore only imported by `vtypes.core` when the first VType with
+validators is initialized.
+"""
+import warnings
+from weakref import WeakValueDictionary
+
+from valid8.base import NP_TRUE, is_mini_lambda
+from valid8.common_syntax import make_validation_func_callables
+from valid8.entry_points import Validator
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Type, Tuple, Optional, Any, Callable
+    from valid8 import ValidationError
+    from valid8.base import ValidationCallableOrLambda, ValidationFailure
+    from valid8.common_syntax import ValidationFuncs, ValidationFuncDefinition
+
+
+def _raw_callable_creator(validation_callable,  # type: ValidationCallableOrLambda
+                          help_msg=None,        # type: str
+                          failure_type=None     # type: Type[ValidationFailure]
+                          ):
+    """
+    A `callable_creator` for `make_validation_func_callables` that does not wrap the validation callable in a
+    `failure_raiser`: the raw function is returned (mini_lambda expressions are still converted to functions).
+    The help message and failure type are ignored since they are only needed to build errors.
+
+    Validation callables that raise a detailed failure may provide a `__vtypes_raw_check__` attribute, a function
+    returning a boolean without creating any failure (see `vtypes.records`): in that case it is used instead.
+    Note: a private name is used so that unrelated attributes such as an `is_valid` flag are never picked.
+
+    :param validation_callable:
+    :param help_msg:
+    :param failure_type:
+    :return:
+    """
+    if is_mini_lambda(validation_callable):
+        return validation_callable.as_function()
+    return getattr(validation_callable, '__vtypes_raw_check__', validation_callable)
+
+
+def get_raw_validation_funcs(validators  # type: Tuple[ValidationFuncDefinition, ...]
+                              ):
+    # type: (...) -> Tuple[Callable, ...]
+    """
+    Returns the tuple of raw validation callables contained in `validators` (the output of `_process_validators`).
+
+    :param validators:
+    :return:
+    """
+    if len(validators) == 0:
+        return ()
+    return make_validation_func_callables(*validators, callable_creator=_raw_callable_creator)
+
+
+def make_value_checker(funcs  # type: Tuple[Callable, ...]
+                        ):
+    # type: (...) -> Optional[Callable[[Any], bool]]
+    """
+    Compiles a boolean value checker from a tuple of raw validation callables. Following the valid8 convention, a
+    callable succeeds if it returns `True` or `None`. Any other result or any exception is a failure. No
+    `ValidationError` is ever created.
+
+    :param funcs:
+    :return: `None` if `funcs` is empty, a function `f(obj) -> bool` otherwise
+    """
+    if len(funcs) == 0:
+        return None
+
+    elif len(funcs) == 1:
+        f = funcs[0]
+
+        def check_value(obj):
+            try:
+                res = f(obj)
+            except Exception:
+                return False
+            return (res is None) or (res is True) or (res is NP_TRUE)
+    else:
+        def check_value(obj):
+            try:
+                for f in funcs:
+                    res = f(obj)
+                    if not ((res is None) or (res is True) or (res is NP_TRUE)):
+                        return False
+            except Exception:
+                return False
+            return True
+
+    return check_value
+
+
+def make_instance_checker(types,        # type: Tuple[Type, ...]
+                           funcs         # type: Tuple[Callable, ...]
+                           ):
+    # type: (...) -> Callable[[Any], bool]
+    """
+    Compiles the boolean function used by `VTypeMeta.__instancecheck__`: `obj` should be an instance of all `types`
+    and should be valid according to all raw validation callables in `funcs`.
+
+    The most frequent cases (zero or one type, zero or one validation function) are specialized so that no loop and
+    no intermediate function call is needed.
+
+    :param types:
+    :param funcs:
+    :return:
+    """
+    if len(types) > 1:
+        value_checker = make_value_checker(funcs)
+        if value_checker is None:
+            def check_instance(obj):
+                for t in types:
+                    if not isinstance(obj, t):
+                        return False
+                return True
+        else:
+            def check_instance(obj):
+                for t in types:
+                    if not isinstance(obj, t):
+                        return False
+                return value_checker(obj)
+
+    elif len(types) == 1:
+        typ = types[0]
+        if len(funcs) == 0:
+            def check_instance(obj):
+                return isinstance(obj, typ)
+
+        elif len(funcs) == 1:
+            f = funcs[0]
+
+            def check_instance(obj):
+                if not isinstance(obj, typ):
+                    return False
+                try:
+                    res = f(obj)
+                except Exception:
+                    return False
+                return (res is None) or (res is True) or (res is NP_TRUE)
+        else:
+            def check_instance(obj):
+                if not isinstance(obj, typ):
+                    return False
+                try:
+                    for f in funcs:
+                        res = f(obj)
+                        if not ((res is None) or (res is True) or (res is NP_TRUE)):
+                            return False
+                except Exception:
+                    return False
+                return True
+    else:
+        value_checker = make_value_checker(funcs)
+        if value_checker is None:
+            def check_instance(obj):
+                return True
+        else:
+            check_instance = value_checker
+
+    return check_instance
+
+
+class VTypeValidator(Validator):
+    """
+    Represents a `Validator` responsible to validate the values of one or several VTypes. It is usually created
+    without reference to a VType, since VTypes with the same definition share the same validator (see
+    `get_shared_validator`): its deprecated `vtype` attribute is then `None`.
+
+    In addition to the valid8 `main_function` (used by `assert_valid` to build rich errors), it holds the raw
+    validation functions and a boolean `value_checker` compiled from them, so that `is_valid` never creates any
+    `ValidationFailure` or `ValidationError`.
+
+    The valid8 part (`main_function`, `help_msg`, `error_type`...) is only built when it is first accessed, typically
+    when a first `ValidationError` is raised: most VTypes never raise any.
+    """
+    __slots__ = '__weakref__', 'vtype', 'validators', 'raw_functions', 'value_checker', '_valid8_kwargs'
+
+    def __init__(self,
+                 *args,   # type: Any
+                 **kwargs
+                 ):
+        """
+        Creates a validator with signature `VTypeValidator(validators, **kwargs)`, where `kwargs` are the options of
+        the valid8 `Validator` (`help_msg`, `error_type`...). The former signature `VTypeValidator(vtype, validators,
+        **kwargs)` is still supported but deprecated: the `vtype` is only stored in the `vtype` attribute, it is not
+        the owner of validators shared between VTypes.
+
+        :param args: the validators, optionally preceded by a (deprecated) VType
+        :param kwargs: the options of the valid8 `Validator`. `vtype` and `validators` may also be provided by name.
+        """
+        vtype = kwargs.pop('vtype', None)
+        if len(args) == 2 and vtype is None:
+            vtype, validators = args
+        elif len(args) == 1:
+            validators, = args
+        elif len(args) == 0 and 'validators' in kwargs:
+            validators = kwargs.pop('validators')
+        else:
+            raise TypeError("VTypeValidator(validators, **kwargs) received %s positional arguments" % len(args))
+
+        if vtype is not None:
+            warnings.warn("The `vtype` argument of `VTypeValidator` is deprecated: a validator may be shared by "
+                          "several VTypes.", DeprecationWarning, stacklevel=2)
+        self.vtype = vtype
+        self.validators = validators
+
+        # the arguments of the valid8 `Validator`, see `__getattr__`
+        self._valid8_kwargs = kwargs
+
+        # the boolean path: raw functions, short-circuiting on the first failure
+        self.raw_functions = get_raw_validation_funcs(validators)
+        self.value_checker = make_value_checker(self.raw_functions)
+
+    def __getattr__(self, name):
+        """ Builds the valid8 part of this validator when one of its attributes is first accessed """
+        if name not in Validator.__slots__:
+            raise AttributeError(name)
+
+        kwargs = self._valid8_kwargs
+        if kwargs is not None:
+            # note: if several threads get here concurrently they build equivalent attributes, that is harmless
+            super(VTypeValidator, self).__init__(*self.validators, **kwargs)
+            self._valid8_kwargs = None
+        return object.__getattribute__(self, name)
+
+    def is_valid(self,
+                 value  # type: Any
+                 ):
+        # type: (...) -> bool
+        """
+        Validates the provided value and returns a boolean indicating success or failure. As opposed to
+        `Validator.is_valid`, the raw validation functions are called directly, so no failure object is created when
+        validation fails. Any exception happening in the validation process is silently caught.
+
+        :param value: the value to validate
+        :return: a boolean flag indicating success or failure
+        """
+        return self.value_checker(value)
+
+
+# the validators shared between VTypes with the same definition, see `get_shared_validator`
+_shared_validators = WeakValueDictionary()
+
+
+def get_shared_validator(validators,       # type: Tuple[ValidationFuncDefinition, ...]
+                         help_msg=None,    # type: str
+                         error_type=None   # type: Type[ValidationError]
+                         ):
+    # type: (...) -> VTypeValidator
+    """
+    Returns a `VTypeValidator` for `validators` (the output of `_process_validators`). It is shared with all VTypes
+    with the same validators, help message and error type, so that VTypes generated in large numbers from a few
+    distinct definitions do not each hold their own validator. As in `VTypeRegistry`, validation callables are compared
+    by identity, except for declarative validators (`vtypes.validators`) that are compared by value. A new validator is
+    returned if the definition is not hashable.
+
+    :param validators:
+    :param help_msg:
+    :param error_type:
+    :return:
+    """
+    from vtypes.registry import _freeze
+    key = (_freeze(validators), help_msg, error_type)
+    try:
+        validator = _shared_validators.get(key, None)
+    except TypeError:
+        # not hashable
+        return VTypeValidator(validators, help_msg=help_msg, error_type=error_type)
+
+    if validator is None:
+        validator = _shared_validators.setdefault(key, VTypeValidator(validators, help_msg=help_msg,
+                                                                      error_type=error_type))
+    return validator